@@ -1,20 +1,49 @@
 from __future__ import annotations
 
+import io
 import os
 from datetime import date, datetime, timedelta
 from typing import List
 
 import pandas as pd
+import pyarrow as pa
 import streamlit as st
 import yaml
 
 from src.ai_services import get_ai_service
-from src.services.agent_service import RecallResponseAgent
+from src.services.agent_service import (
+    BULK_SCAN_WORKERS,
+    RecallResponseAgent,
+    bulk_scan_job,
+    mission_job,
+    product_codes_job,
+    screening_job,
+)
+from src.search.query_ast import HAZARD_KEYWORDS
+from src.services.query_planner import QueryPlan
+from src.services.job_runner import ACTIVE as JOB_ACTIVE, COMPLETE as JOB_COMPLETE, FAILED as JOB_FAILED, JobResult, get_job_runner
+from src.services.keyword_cache import KeywordCache
+from src.services.product_codes import get_product_code_index, refresh_due
+from src.services.recall_corpus import AUTO, CORPUS, PER_SKU
 from src.services.regulatory_service import RegulatoryService
+from src.services.result_schema import failed_sources, format_date
+from src.services.scan_store import COMPLETE as SCAN_COMPLETE, ScanStore
+from src.services.result_store import (
+    list_saved_searches,
+    load_search,
+    save_search,
+    to_arrow,
+    to_feather_bytes,
+    to_frame,
+    to_parquet_bytes,
+)
 from src.tabs.ai_chat import display_chat_interface
+from src.tabs.signals import display_signal_dashboard
 from src.tabs.web_search import display_web_search
 
-DEFAULT_RECALL_KEYWORDS = "recall alert safety bulletin problem issue hazard warning defect"
+SCAN_MODE_LABELS = {AUTO: "Auto", PER_SKU: "Per-SKU search", CORPUS: "Corpus-first"}
+# Seconds between background job status polls.
+JOB_POLL_S = 2
 
 
 st.set_page_config(
@@ -262,9 +291,14 @@ def init_session() -> None:
             st.session_state.api_key = st.session_state.openai_api_key
         get_ai_service()
 
-    st.session_state.setdefault("recall_hits", pd.DataFrame())
+    st.session_state.setdefault("recall_table", None)
+    st.session_state.setdefault("query_plan", None)
     st.session_state.setdefault("recall_log", {})
-    st.session_state.setdefault("recall_agent", RecallResponseAgent())
+    # Not setdefault: its argument would build an agent and its stores on every rerun.
+    if "recall_agent" not in st.session_state:
+        st.session_state.recall_agent = RecallResponseAgent()
+    # Job kind -> id of the background job this session is following.
+    st.session_state.setdefault("jobs", {})
 
 
 def sidebar_controls() -> tuple[date, date, List[str], str, int]:
@@ -331,6 +365,9 @@ def sidebar_controls() -> tuple[date, date, List[str], str, int]:
     st.sidebar.header("Result Cap")
     result_limit = st.sidebar.slider("Max results per search", min_value=100, max_value=800, value=300, step=50)
 
+    st.sidebar.header("FDA Product Codes")
+    render_product_codes_status()
+
     st.sidebar.header("Key Status")
     if st.session_state.provider in {"openai", "both"} and not st.session_state.openai_api_key:
         st.sidebar.warning("OpenAI API key not found in Streamlit secrets.")
@@ -344,6 +381,32 @@ def sidebar_controls() -> tuple[date, date, List[str], str, int]:
     return start_date, end_date, regions, search_mode, result_limit
 
 
+def render_product_codes_status() -> None:
+    """
+    The classification file behind product-code search is downloaded only when
+    the user asks, by a background job, never during a search.
+    """
+    runner = get_job_runner()
+    job_id = st.session_state.jobs.get("product_codes")
+    job = runner.status(job_id) if job_id else None
+    refreshing = job is not None and job["status"] in JOB_ACTIVE
+    if not refreshing and st.sidebar.button("🔄 Refresh Product Codes"):
+        job_id = st.session_state.jobs["product_codes"] = runner.submit("product_codes", "FDA classification", product_codes_job)
+        job, refreshing = runner.status(job_id), True
+
+    codes = len(get_product_code_index())
+    if refreshing:
+        st.sidebar.caption("Downloading the FDA device classification in the background...")
+    elif job is not None and job["status"] == JOB_FAILED:
+        st.sidebar.warning(f"Product code download failed: {job['message']}")
+    if codes:
+        st.sidebar.caption(f"{codes} product codes loaded for code-based openFDA queries.")
+    elif refresh_due():
+        st.sidebar.info("Refresh due: no FDA classification file is stored, so openFDA is searched by text only.")
+    elif not refreshing:
+        st.sidebar.caption("No classification file yet; openFDA is searched by text only.")
+
+
 def render_operational_snapshot(
     regions: List[str],
     search_mode: str,
@@ -448,25 +511,33 @@ def render_search_summary(
         st.markdown("**Expanded Terms Used**")
         st.code("\n".join(terms) if terms else "No terms available", language="text")
 
+        product_codes = df.attrs.get("product_codes")
+        if product_codes:
+            st.markdown("**FDA Product Codes** (openFDA and MAUDE queried by exact code)")
+            st.write(", ".join(product_codes))
+
         if logs:
             st.markdown("**Source Yield**")
             for source, count in logs.items():
                 st.write(f"- {source}: {count}")
 
+        date_failures = df.attrs.get("date_parse_failures")
+        if date_failures:
+            st.warning(
+                "Unparseable dates (kept, shown as N/A): "
+                + ", ".join(f"{source}: {count}" for source, count in date_failures.items())
+            )
+
 
 def render_smart_view(df: pd.DataFrame) -> None:
-    risk_order = {"High": 0, "Medium": 1, "Low": 2, "TBD": 3}
-    df = df.copy()
-    df["Risk_Level"] = df.get("Risk_Level", "TBD").fillna("TBD")
-    df["sort_key"] = df["Risk_Level"].map(risk_order).fillna(3)
-    df.sort_values(["sort_key", "Date"], ascending=[True, False], inplace=True)
+    df = df.sort_values(["Risk_Level", "Date"], ascending=[True, False], na_position="last")
 
     for _, row in df.iterrows():
         risk = row.get("Risk_Level", "TBD")
         risk_color = "🔴" if risk == "High" else "🟠" if risk == "Medium" else "🟢" if risk == "Low" else "⚪"
         title = str(row.get("Product", "Unknown"))[:80]
         source = row.get("Source", "Unknown")
-        date_str = row.get("Date", "N/A")
+        date_str = format_date(row.get("Date"))
         matched_term = row.get("Matched_Term", "")
         label = f"{risk_color} {risk} | {date_str} | {source} | {title}"
 
@@ -487,18 +558,50 @@ def render_smart_view(df: pd.DataFrame) -> None:
                     st.markdown(f"[🔗 Open Source Record]({link})")
 
 
-def render_table_view(df: pd.DataFrame) -> None:
+def render_table_view(table: pa.Table, df: pd.DataFrame) -> None:
+    # Streamlit serializes Arrow tables directly, skipping the pandas conversion.
     st.dataframe(
-        df,
+        table,
         column_config={"Link": st.column_config.LinkColumn("Source Link")},
         use_container_width=True,
         hide_index=True,
     )
+    col_csv, col_parquet, col_feather = st.columns(3)
     csv = df.to_csv(index=False).encode("utf-8")
-    st.download_button("💾 Download CSV", csv, "regulatory_results.csv", "text/csv")
+    col_csv.download_button("💾 Download CSV", csv, "regulatory_results.csv", "text/csv")
+    col_parquet.download_button(
+        "🧱 Download Parquet", to_parquet_bytes(table), "regulatory_results.parquet", "application/octet-stream"
+    )
+    col_feather.download_button(
+        "🪶 Download Feather", to_feather_bytes(table), "regulatory_results.feather", "application/octet-stream"
+    )
+
+
+def store_results(table: pa.Table, logs: dict) -> None:
+    st.session_state.recall_table = table
+    st.session_state.recall_log = logs
 
 
-def run_regulatory_search(
+def render_saved_searches() -> None:
+    with st.expander("🗂️ Saved Searches", expanded=False):
+        save_col, load_col = st.columns(2)
+        with save_col:
+            save_name = st.text_input("Save current results as", placeholder="e.g. infusion pumps Q3")
+            can_save = st.session_state.recall_table is not None and bool(save_name)
+            if st.button("💾 Save Search", disabled=not can_save):
+                path = save_search(st.session_state.recall_table, save_name)
+                st.success(f"Saved to {path}")
+        with load_col:
+            saved = list_saved_searches()
+            choice = st.selectbox("Reopen a saved search", saved if saved else ["—"])
+            if st.button("📂 Open", disabled=not saved):
+                table = load_search(choice)
+                counts = table.column("Source").to_pandas().astype(str).value_counts()
+                store_results(table, {str(k): int(v) for k, v in counts.items()})
+                st.rerun()
+
+
+def build_search_kwargs(
     query: str,
     manufacturer: str,
     vendor_only: bool,
@@ -509,34 +612,62 @@ def run_regulatory_search(
     end_date: date,
     search_mode: str,
     result_limit: int,
-) -> None:
-    augmented_query = query
-    if use_default_keywords and query:
-        augmented_query = f"{query} {DEFAULT_RECALL_KEYWORDS}"
-    focus_label = "vendor enforcement" if vendor_only else "recalls, alerts, and enforcement"
-    with st.status(f"Running {search_mode} surveillance for {focus_label}...", expanded=True) as status:
+) -> dict:
+    # Keywords travel separately; appending them to the product turned every phrase query into a miss.
+    return {
+        "query_term": query,
+        "hazard_keywords": list(HAZARD_KEYWORDS) if use_default_keywords else [],
+        "manufacturer": manufacturer,
+        "vendor_only": vendor_only,
+        "include_sanctions": include_sanctions,
+        "regions": regions,
+        "start_date": start_date,
+        "end_date": end_date,
+        "limit": result_limit,
+        "mode": search_mode,
+    }
+
+
+def preview_query_plan(**search_inputs) -> None:
+    kwargs = build_search_kwargs(**search_inputs)
+    with st.spinner("Estimating yield per term and source..."):
+        plan = RegulatoryService.plan_search(**kwargs)
+    st.session_state.query_plan = (repr(kwargs), plan)
+
+
+def render_query_plan(plan: QueryPlan) -> None:
+    with st.expander("🧭 Query Plan (dry run)", expanded=True):
+        col_run, col_skip, col_count, col_latency = st.columns(4)
+        col_run.metric("Requests to run", plan.estimated_requests)
+        col_skip.metric("Requests skipped", plan.skipped_requests)
+        col_count.metric("Count requests spent", plan.planning_requests)
+        col_latency.metric("Est. latency", f"{plan.estimated_latency_s:.0f}s")
+        if plan.product_codes:
+            st.caption(f"FDA product codes: {', '.join(plan.product_codes)}")
+        st.dataframe(plan.to_frame(), use_container_width=True, hide_index=True)
+
+
+def run_regulatory_search(**search_inputs) -> None:
+    kwargs = build_search_kwargs(**search_inputs)
+    # Reuse the previewed plan when the inputs have not changed since the dry run.
+    previewed = st.session_state.get("query_plan")
+    plan = previewed[1] if previewed and previewed[0] == repr(kwargs) else None
+    focus_label = "vendor enforcement" if kwargs["vendor_only"] else "recalls, alerts, and enforcement"
+    with st.status(f"Running {kwargs['mode']} surveillance for {focus_label}...", expanded=True) as status:
         st.write("📡 Connecting to regulatory databases, sanctions lists, and trusted media sources...")
-        df, logs = RegulatoryService.search_all_sources(
-            query_term=augmented_query,
-            manufacturer=manufacturer,
-            vendor_only=vendor_only,
-            include_sanctions=include_sanctions,
-            regions=regions,
-            start_date=start_date,
-            end_date=end_date,
-            limit=result_limit,
-            mode=search_mode,
-        )
+        df, logs = RegulatoryService.search_all_sources(**kwargs, query_plan=plan)
 
-        st.session_state.recall_hits = df
-        st.session_state.recall_log = logs
+        store_results(to_arrow(df), logs)
         st.session_state.search_context = {
-            "query": query,
-            "manufacturer": manufacturer,
-            "use_default_keywords": use_default_keywords,
+            "query": search_inputs["query"],
+            "manufacturer": search_inputs["manufacturer"],
+            "use_default_keywords": search_inputs["use_default_keywords"],
         }
 
         status.write(f"✅ Search Complete. Found {len(df)} records.")
+        failed = failed_sources(df)
+        if failed:
+            status.write(f"⚠️ No answer from {', '.join(failed)}; their records are missing. Run the search again to retry.")
         status.update(label="Mission Complete", state="complete", expanded=False)
 
 
@@ -550,37 +681,221 @@ def render_batch_scan() -> None:
 
     scan_file = st.file_uploader("Upload CSV or Excel (SKU, Product Name)", type=["csv", "xlsx"])
     fuzzy_threshold = st.slider("Match Threshold", min_value=0.4, max_value=0.9, value=0.7, step=0.05)
+    scan_workers = st.slider("Parallel SKUs", min_value=1, max_value=32, value=BULK_SCAN_WORKERS, help="SKUs scanned at once. Each source also has its own request cap.")
+    scan_mode = st.radio(
+        "Scan Mode",
+        options=list(SCAN_MODE_LABELS),
+        format_func=SCAN_MODE_LABELS.get,
+        horizontal=True,
+        help="Corpus-first pulls the window's FDA recall, enforcement and CPSC records once and matches every SKU locally.",
+    )
+    resume_scan = st.checkbox(
+        "Resume from checkpoint",
+        value=True,
+        help="Re-uploading the same file with the same settings continues an interrupted scan, or reloads a finished one.",
+    )
+    delta_scan = st.checkbox(
+        "Delta (only new/changed since last scan)",
+        value=False,
+        help="Searches each SKU only from where its last delta scan ended and reports only matches not reported for it before, or changed since.",
+    )
+    render_previous_scans(st.session_state.recall_agent.scan_store)
+    render_watermarks(st.session_state.recall_agent.scan_store)
+    render_keyword_cache(st.session_state.recall_agent.keyword_cache)
 
     if st.button("🚀 Run Batch Scan", type="primary", width="stretch"):
         if not scan_file:
             st.error("Please upload a CSV or Excel file.")
             return
 
-        progress = st.progress(0.0, text="Preparing scan...")
-        agent: RecallResponseAgent = st.session_state.recall_agent
+        # The job keeps its own copy of the upload; the widget's buffer goes away on rerun.
+        upload = io.BytesIO(scan_file.getvalue())
+        upload.name = scan_file.name
+        st.session_state.jobs["bulk_scan"] = get_job_runner().submit(
+            "bulk_scan",
+            scan_file.name,
+            bulk_scan_job,
+            st.session_state.recall_agent,
+            upload,
+            start_date=start_date,
+            end_date=end_date,
+            fuzzy_threshold=fuzzy_threshold,
+            max_workers=scan_workers,
+            scan_mode=scan_mode,
+            resume=resume_scan,
+            delta=delta_scan,
+        )
 
-        def progress_callback(pct: float, message: str) -> None:
-            progress.progress(pct, text=message)
+    render_job("bulk_scan")
+    render_job_history()
 
-        with st.spinner("Scanning product list..."):
-            results, log_messages = agent.run_bulk_scan(
-                scan_file,
-                start_date=start_date,
-                end_date=end_date,
-                fuzzy_threshold=fuzzy_threshold,
-                progress_callback=progress_callback,
-            )
-        progress.empty()
 
-        if results.empty:
+def render_bulk_scan_result(result: JobResult) -> None:
+    results, log_messages = result.frame, result.log
+    delta = any(message.startswith("Delta:") for message in log_messages)
+    if results.empty:
+        if delta:
+            st.info("No new or changed matches since the last delta scan.")
+        else:
             st.warning("No matches found. Consider lowering the match threshold or extending the date range.")
-            st.caption(", ".join(log_messages))
-            return
+        st.caption(", ".join(log_messages))
+        return
 
-        st.success(f"✅ Scan complete. Found {len(results)} potential matches.")
-        st.dataframe(results, use_container_width=True, hide_index=True)
-        csv = results.to_csv(index=False).encode("utf-8")
-        st.download_button("💾 Download Batch Results", csv, "batch_scan_results.csv", "text/csv")
+    st.success(f"✅ Scan complete. Found {len(results)} {'new or changed' if delta else 'potential'} matches.")
+    st.caption(", ".join(log_messages[1:]))
+    st.dataframe(results, use_container_width=True, hide_index=True)
+    csv = results.to_csv(index=False).encode("utf-8")
+    st.download_button("💾 Download Batch Results", csv, "batch_scan_results.csv", "text/csv", key="bulk_scan_download")
+
+
+def render_screening_result(result: JobResult) -> None:
+    screened = result.frame
+    st.success(f"✅ {', '.join(result.log)}.")
+    if screened.empty:
+        return
+    risk_order = {"High": 0, "Medium": 1, "Low": 2, "TBD": 3}
+    screened = screened.sort_values("AI_Risk_Level", key=lambda s: s.map(risk_order).fillna(3))
+    st.dataframe(screened, use_container_width=True, hide_index=True)
+    csv = screened.to_csv(index=False).encode("utf-8")
+    st.download_button("💾 Download Screening", csv, "ai_screening.csv", "text/csv", key="screening_download")
+
+
+def render_mission_result(result: JobResult) -> None:
+    packages = result.payload or []
+    st.success(f"✅ Mission complete. {len(packages)} response packages drafted.")
+    st.code("\n".join(result.log), language=None)
+    for package in packages:
+        record = package.get("source_record", {})
+        with st.expander(f"🚨 {package.get('source_type', 'Record')} | {str(record.get('Product', ''))[:60]}"):
+            st.markdown(f"**Risk analysis:** {package.get('risk_analysis', '')}")
+            for key, label in (("capa_draft", "CAPA Draft"), ("email_draft", "Vendor Email"), ("pr_draft", "PR Statement")):
+                if package.get(key):
+                    st.markdown(f"**{label}**")
+                    st.write(package[key])
+
+
+JOB_RESULT_RENDERERS = {
+    "bulk_scan": render_bulk_scan_result,
+    "screening": render_screening_result,
+    "mission": render_mission_result,
+}
+
+
+@st.fragment(run_every=JOB_POLL_S)
+def render_job(kind: str) -> None:
+    """Polls the session's latest job of this kind; only this fragment reruns while it works."""
+    job_id = st.session_state.jobs.get(kind)
+    if not job_id:
+        return
+    runner = get_job_runner()
+    job = runner.status(job_id)
+    if job is None:
+        return
+    if job["status"] in JOB_ACTIVE:
+        st.progress(job["progress"] or 0.0, text=f"{job['label']}: {job['message']}")
+        st.caption("Running in the background. You can keep working or close the tab; reopen it under Background Jobs.")
+        if job["has_partial"]:
+            st.dataframe(runner.store.load_partial(job_id), use_container_width=True, hide_index=True)
+    elif job["status"] == JOB_COMPLETE:
+        JOB_RESULT_RENDERERS[kind](runner.result(job_id))
+    else:
+        st.error(f"{job['label']}: {job['status']}. {job['message']}")
+
+
+def render_job_history() -> None:
+    jobs = get_job_runner().store.list_jobs()
+    if jobs.empty:
+        return
+    with st.expander(f"🧵 Background Jobs ({len(jobs)})"):
+        st.dataframe(jobs, use_container_width=True, hide_index=True)
+        labels = {row.job_id: f"{row.kind} | {row.label} | {row.status} | {row.created_at}" for row in jobs.itertuples()}
+        job_id = st.selectbox("Open job", options=list(labels), format_func=labels.get)
+        if st.button("Show Job", key="open_job"):
+            st.session_state.jobs[jobs.loc[jobs["job_id"] == job_id, "kind"].iloc[0]] = job_id
+            st.rerun()
+
+
+def render_ai_review(df: pd.DataFrame, search_query: str, manufacturer: str) -> None:
+    """AI screening and the autonomous mission, both run as background jobs."""
+    with st.expander("🤖 AI Review (background)"):
+        my_model = st.text_input("My model number / ID", placeholder="e.g. Model X-500")
+        col1, col2 = st.columns(2)
+        agent: RecallResponseAgent = st.session_state.recall_agent
+        if col1.button("AI Screen Top Results", width="stretch"):
+            if not agent.ai:
+                st.error("AI Service not available (Check API Key).")
+            else:
+                st.session_state.jobs["screening"] = get_job_runner().submit(
+                    "screening",
+                    search_query or "search results",
+                    screening_job,
+                    agent,
+                    df.copy(),
+                    manufacturer,
+                    my_model,
+                    search_query,
+                )
+        if col2.button("Run Agent Mission", width="stretch"):
+            if not agent.ai or not search_query:
+                st.error("The mission needs a search query and an AI service.")
+            else:
+                st.session_state.jobs["mission"] = get_job_runner().submit(
+                    "mission", search_query, mission_job, agent, search_query, manufacturer, my_model
+                )
+        render_job("screening")
+        render_job("mission")
+
+
+def render_keyword_cache(cache: KeywordCache) -> None:
+    stats = cache.stats()
+    if stats.empty:
+        return
+    with st.expander(f"🔑 Keyword Cache ({int(stats['entries'].sum())} product names)"):
+        st.caption("Search keywords generated for earlier scans are reused for the same product name, model and prompt version.")
+        st.dataframe(stats, use_container_width=True, hide_index=True)
+        names = st.text_area("Product names to regenerate (one per line; leave empty to clear everything)")
+        if st.button("🗑️ Invalidate Keywords", key="invalidate_keywords"):
+            selected = [line.strip() for line in names.splitlines() if line.strip()]
+            removed = cache.invalidate(names=selected or None)
+            st.success(f"Removed {removed} cached keyword entries.")
+
+
+def render_watermarks(store: ScanStore) -> None:
+    watermarks = store.list_watermarks()
+    if watermarks.empty:
+        return
+    with st.expander(f"🌊 Delta Watermarks ({len(watermarks)} SKUs)"):
+        st.caption("Delta scans search each SKU from its watermark and skip records already reported for it.")
+        st.dataframe(watermarks, use_container_width=True, hide_index=True)
+        skus = st.text_area("SKUs to rescan in full (one per line; leave empty to reset every SKU)")
+        if st.button("🗑️ Reset Watermarks", key="reset_watermarks"):
+            selected = [line.strip() for line in skus.splitlines() if line.strip()]
+            cleared = store.clear_watermarks(selected or None)
+            st.success(f"Reset delta state for {cleared} SKUs.")
+
+
+def render_previous_scans(store: ScanStore) -> None:
+    scans = store.list_scans()
+    if scans.empty:
+        return
+    with st.expander(f"🗂️ Previous Scans ({len(scans)})"):
+        st.dataframe(scans, use_container_width=True, hide_index=True)
+        complete = scans[scans["status"] == SCAN_COMPLETE]
+        if complete.empty:
+            return
+        labels = {row.scan_id: f"{row.name} ({row.updated_at})" for row in complete.itertuples()}
+        scan_id = st.selectbox("Download results of", list(labels), format_func=labels.get, key="previous_scan")
+        # Only the picked scan is loaded and encoded, once per pick rather than on every rerun.
+        version = (scan_id, labels[scan_id])
+        cached = st.session_state.get("previous_scan_csv")
+        if not cached or cached[0] != version:
+            stored = store.load_results(scan_id)
+            csv = stored[0].to_csv(index=False).encode("utf-8") if stored is not None and not stored[0].empty else None
+            cached = st.session_state.previous_scan_csv = (version, csv)
+        if cached[1] is None:
+            st.caption("This scan found no matches.")
+            return
+        st.download_button("💾 Download Scan CSV", cached[1], f"batch_scan_{scan_id}.csv", "text/csv", key="scan_download")
 
 
 init_session()
@@ -603,8 +918,8 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-tab_labels = ["🔎 Regulatory Search", "📂 Batch Fleet Scan", "💬 AI Assistant", "🌐 Web Search"]
-tab_search, tab_batch, tab_chat, tab_web = st.tabs(tab_labels)
+tab_labels = ["🔎 Regulatory Search", "📂 Batch Fleet Scan", "📈 Signal Dashboard", "💬 AI Assistant", "🌐 Web Search"]
+tab_search, tab_batch, tab_signals, tab_chat, tab_web = st.tabs(tab_labels)
 
 with tab_search:
     st.header("🔎 Regulatory Search")
@@ -622,31 +937,42 @@ with tab_search:
                 st.subheader("Filters")
                 vendor_only = st.checkbox("Vendor enforcement or sanctions only", value=False)
                 include_sanctions = st.checkbox("Include sanctions/watchlists", value=True)
-                use_default_keywords = st.checkbox("Append default recall keywords", value=True)
+                use_default_keywords = st.checkbox("Add hazard keywords to web & news queries", value=True)
             with form_col3:
                 st.subheader("Run")
                 st.caption("Use accuracy-first for global signal coverage.")
                 run_btn = st.form_submit_button("🚀 Run Surveillance", width="stretch", type="primary")
+                plan_btn = st.form_submit_button("🧭 Preview Query Plan", width="stretch")
 
     render_operational_snapshot(regions, search_mode, start_date, end_date, result_limit)
 
+    search_inputs = {
+        "query": search_query.strip(),
+        "manufacturer": manufacturer.strip(),
+        "vendor_only": vendor_only,
+        "include_sanctions": include_sanctions,
+        "use_default_keywords": use_default_keywords,
+        "regions": regions,
+        "start_date": start_date,
+        "end_date": end_date,
+        "search_mode": search_mode,
+        "result_limit": result_limit,
+    }
+    if plan_btn:
+        preview_query_plan(**search_inputs)
+    if st.session_state.get("query_plan"):
+        render_query_plan(st.session_state.query_plan[1])
     if run_btn:
-        run_regulatory_search(
-            query=search_query.strip(),
-            manufacturer=manufacturer.strip(),
-            vendor_only=vendor_only,
-            include_sanctions=include_sanctions,
-            use_default_keywords=use_default_keywords,
-            regions=regions,
-            start_date=start_date,
-            end_date=end_date,
-            search_mode=search_mode,
-            result_limit=result_limit,
-        )
+        run_regulatory_search(**search_inputs)
 
-    if not st.session_state.recall_hits.empty:
+    render_saved_searches()
+
+    results = st.session_state.recall_table
+    if results is not None and results.num_rows:
+        # Session state keeps only the Arrow table; pandas is built here for the views that need it.
+        hits = to_frame(results)
         render_search_summary(
-            st.session_state.recall_hits,
+            hits,
             st.session_state.recall_log,
             search_query,
             manufacturer,
@@ -658,13 +984,17 @@ with tab_search:
 
         tab_results, tab_table = st.tabs(["🧠 Smart View", "📊 Table"])
         with tab_results:
-            render_smart_view(st.session_state.recall_hits)
+            render_smart_view(hits)
         with tab_table:
-            render_table_view(st.session_state.recall_hits)
+            render_table_view(results, hits)
+        render_ai_review(hits, search_query, manufacturer)
 
 with tab_batch:
     render_batch_scan()
 
+with tab_signals:
+    display_signal_dashboard()
+
 with tab_chat:
     display_chat_interface()
 
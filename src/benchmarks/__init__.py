@@ -0,0 +1 @@
+"""Benchmarks for matching accuracy and throughput."""
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+"""
+Accuracy and throughput benchmark for the product <-> recall-record matchers.
+
+Scores the labeled pairs in fixtures/matching_pairs.csv with each matcher and
+reports precision / recall / F1 per threshold, pairs per second and peak
+traced memory. With --check (the default) the run fails when F1 or throughput
+regresses beyond tolerance against baseline_matching.json.
+
+    python -m src.benchmarks.matching               # report and check
+    python -m src.benchmarks.matching --update      # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.match_and_classify import product_matcher
+from src.services.candidate_blocking import blocking_recall
+from src.services.match_engine import score_pairs
+from src.services.model_index import ModelNumberIndex
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_PATH = os.path.join(HERE, "fixtures", "matching_pairs.csv")
+BASELINE_PATH = os.path.join(HERE, "baseline_matching.json")
+
+THRESHOLDS = (0.6, 0.7, 0.8, 0.9)
+F1_TOLERANCE = 0.02
+# Throughput is machine-dependent; only a large drop counts as a regression.
+SPEED_TOLERANCE = 0.35
+MIN_TIMING_S = 0.5
+
+
+def load_fixture(path: str = FIXTURE_PATH) -> pd.DataFrame:
+    frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+    frame["label"] = frame["label"].astype(int)
+    return frame
+
+
+def score_fuzzy(pairs: pd.DataFrame) -> np.ndarray:
+    """match_and_classify.fuzzy_score, batched per product as the orchestrator runs it."""
+    product_matcher.cache_clear()
+    scores = np.zeros(len(pairs))
+    for (product, manufacturer), group in pairs.groupby(["product", "manufacturer"], sort=False):
+        matcher = product_matcher(product, manufacturer or None)
+        scores[group.index.to_numpy()] = matcher.score_batch(group["title"].tolist(), group["snippet"].tolist())
+    return scores
+
+
+def score_bulk_scan(pairs: pd.DataFrame) -> np.ndarray:
+    """The bulk scan's cross-match score: lowercased product name against the hit's product text."""
+    return score_pairs(pairs["product"].str.lower().tolist(), pairs["title"].str.lower().tolist())
+
+
+def score_model_index(pairs: pd.DataFrame) -> np.ndarray:
+    """Model-number collision score from ModelNumberIndex, 0 where the pair shares no model number."""
+    scores = np.zeros(len(pairs))
+    index = ModelNumberIndex.from_hits(pairs.rename(columns={"title": "Product", "snippet": "Description"}))
+    products, codes = np.unique(pairs["product"].to_numpy(), return_inverse=True)
+    found = index.candidates(products.tolist())
+    if found.empty:
+        return scores
+    own = codes[found["hit_index"].to_numpy()] == found["query_index"].to_numpy()
+    scores[found["hit_index"].to_numpy()[own]] = found["score"].to_numpy()[own]
+    return scores
+
+
+MATCHERS: Dict[str, Callable[[pd.DataFrame], np.ndarray]] = {
+    "fuzzy_score": score_fuzzy,
+    "bulk_scan": score_bulk_scan,
+    "model_index": score_model_index,
+}
+
+
+def accuracy(labels: np.ndarray, scores: np.ndarray, thresholds=THRESHOLDS) -> List[dict]:
+    rows = []
+    for threshold in thresholds:
+        predicted = scores >= threshold
+        tp = int((predicted & (labels == 1)).sum())
+        fp = int((predicted & (labels == 0)).sum())
+        fn = int((~predicted & (labels == 1)).sum())
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        rows.append({"threshold": threshold, "precision": round(precision, 4), "recall": round(recall, 4), "f1": round(f1, 4)})
+    return rows
+
+
+def throughput(matcher: Callable, pairs: pd.DataFrame, min_seconds: float = MIN_TIMING_S) -> float:
+    """Pairs scored per second, repeating the fixture until at least min_seconds have passed."""
+    runs, start = 0, time.perf_counter()
+    while True:
+        matcher(pairs)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return runs * len(pairs) / elapsed
+
+
+def peak_memory_kb(matcher: Callable, pairs: pd.DataFrame) -> float:
+    """Peak memory traced by tracemalloc for one run (Python and NumPy allocations; not rapidfuzz internals)."""
+    tracemalloc.start()
+    try:
+        matcher(pairs)
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def run(pairs: pd.DataFrame) -> dict:
+    labels = pairs["label"].to_numpy()
+    report = {}
+    for name, matcher in MATCHERS.items():
+        scores = matcher(pairs)
+        by_kind = {
+            kind: round(float((scores[group.index] >= 0.7).mean()), 4)
+            for kind, group in pairs.groupby("kind")
+        }
+        report[name] = {
+            "accuracy": accuracy(labels, scores),
+            "matched_share_at_0.7": by_kind,
+            "pairs_per_s": round(throughput(matcher, pairs), 1),
+            "peak_kb": round(peak_memory_kb(matcher, pairs), 1),
+        }
+    positives = pairs[pairs["label"] == 1]
+    report["tfidf_blocking"] = blocking_recall(
+        positives["product"].str.lower().unique().tolist(), pairs["title"].str.lower().unique().tolist(), threshold=0.6, k=5
+    )
+    return report
+
+
+def regressions(report: dict, baseline: dict, f1_tolerance: float = F1_TOLERANCE, speed_tolerance: float = SPEED_TOLERANCE) -> List[str]:
+    problems = []
+    for name, base in baseline.items():
+        current = report.get(name)
+        if current is None:
+            problems.append(f"{name}: missing from this run")
+            continue
+        if "accuracy" in base:
+            for was, now in zip(base["accuracy"], current["accuracy"]):
+                if now["f1"] < was["f1"] - f1_tolerance:
+                    problems.append(f"{name}: F1 at {now['threshold']} fell from {was['f1']} to {now['f1']}")
+            if current["pairs_per_s"] < base["pairs_per_s"] * (1 - speed_tolerance):
+                problems.append(f"{name}: throughput fell from {base['pairs_per_s']} to {current['pairs_per_s']} pairs/s")
+        if "recall" in base and current["recall"] < base["recall"] - f1_tolerance:
+            problems.append(f"{name}: recall fell from {base['recall']} to {current['recall']}")
+    return problems
+
+
+def _print_report(report: dict) -> None:
+    for name, result in report.items():
+        if "accuracy" not in result:
+            print(f"\n{name}: {result}")
+            continue
+        print(f"\n{name}: {result['pairs_per_s']:,.0f} pairs/s, peak {result['peak_kb']:,.0f} KB")
+        print(pd.DataFrame(result["accuracy"]).to_string(index=False))
+        print("matched share at 0.7 by kind:", result["matched_share_at_0.7"])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Matching accuracy and throughput benchmark")
+    parser.add_argument("--fixture", default=FIXTURE_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--f1-tolerance", type=float, default=F1_TOLERANCE)
+    parser.add_argument("--speed-tolerance", type=float, default=SPEED_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = run(load_fixture(args.fixture))
+    _print_report(report)
+
+    if args.update:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline yet; run with --update to record one.")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    problems = regressions(report, baseline, args.f1_tolerance, args.speed_tolerance)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    if not problems:
+        print("\nNo regressions against baseline.")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
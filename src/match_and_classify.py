@@ -2,21 +2,14 @@
 from __future__ import annotations
 from dataclasses import dataclass
 import re
-from typing import Any, Dict, List, Optional
-from rapidfuzz import fuzz
-
-CATEGORY_SYNONYMS = {
-    "bpm": ["blood pressure monitor", "bp monitor", "sphygmomanometer"],
-    "scooter": ["mobility scooter", "powered scooter", "electric scooter"],
-    "insulin pump": ["insulin infusion pump", "diabetes pump"],
-    "infusion pump": ["iv pump", "intravenous pump", "syringe pump"],
-    "pacemaker": ["cardiac pacemaker", "implantable pacemaker"],
-    "defibrillator": ["aed", "automated external defibrillator", "icd", "implantable cardioverter defibrillator"],
-    "ventilator": ["respirator", "mechanical ventilator"],
-    "catheter": ["vascular catheter", "central line", "cvc", "urinary catheter"],
-    "stent": ["vascular stent", "coronary stent"],
-    "hip implant": ["hip prosthesis", "hip replacement", "acetabular cup"],
-}
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+
+from src.services.synonyms import expand_synonyms
 
 
 @dataclass
@@ -31,13 +24,11 @@ class ScoredHit:
 
 
 def _expand_synonyms(term: str) -> List[str]:
-    expanded = {term}
-    lowered = term.lower()
-    for key, vals in CATEGORY_SYNONYMS.items():
-        if key in lowered or lowered in vals:
-            expanded.update(vals)
-            expanded.add(key)
-    return list(expanded)
+    return [term, *expand_synonyms(term)]
+
+
+# The lookbehind skips starts inside a letter run; those can only fail where the run's start did.
+_MODEL_TOKEN_RE = re.compile(r"(?<![A-Za-z])[A-Za-z]*\d[A-Za-z0-9\-]{2,}")
 
 
 def _extract_model_tokens(text: str) -> List[str]:
@@ -46,52 +37,127 @@ def _extract_model_tokens(text: str) -> List[str]:
     """
     if not text:
         return []
-    return re.findall(r"[A-Za-z]*\d[A-Za-z0-9\-]{2,}", text)
+    return _MODEL_TOKEN_RE.findall(text)
 
 
-def fuzzy_score(product_name: str, title: str, snippet: str, manufacturer: Optional[str] = None) -> float:
+HIT_KEYWORDS = ["recall", "safety", "alert", "warning", "class i", "class ii", "enforcement", "field safety"]
+MODEL_MATCH_FLOOR = 0.85
+_KEYWORD_RE = re.compile("|".join(re.escape(k) for k in HIT_KEYWORDS))
+
+
+class ProductMatcher:
     """
-    Stronger matching that blends synonym search, typo tolerance, and model-number sensitivity.
-    Returns score in 0.0 - 1.0.
+    Matching state for one product, computed once: synonyms, model tokens and
+    lowercased manufacturer. `score` matches fuzzy_score exactly; `score_batch`
+    scores many hits with rapidfuzz cdist instead of per-hit loops.
     """
-    title = title or ""
-    snippet = snippet or ""
-    product_name = product_name or ""
-
-    base_a = fuzz.token_set_ratio(product_name, title)
-    base_b = fuzz.token_set_ratio(product_name, snippet)
-    base_score = max(base_a, base_b) / 100.0
-
-    # Synonym expansion (catch BPMs, scooters, etc.)
-    synonyms = _expand_synonyms(product_name)
-    syn_scores = []
-    for syn in synonyms:
-        syn_scores.append(fuzz.token_set_ratio(syn, title))
-        syn_scores.append(fuzz.token_set_ratio(syn, snippet))
-    synonym_score = (max(syn_scores) / 100.0) if syn_scores else 0.0
-
-    # Model numbers: near-exact matching gets a boost
-    model_tokens = _extract_model_tokens(product_name)
-    target_tokens = _extract_model_tokens(f"{title} {snippet}")
-    model_match = 0.0
-    for mt in model_tokens:
-        for tt in target_tokens:
-            model_match = max(model_match, fuzz.ratio(mt, tt) / 100.0)
-    if model_match >= 0.85:
-        base_score = max(base_score, model_match)
-
-    # Manufacturer cue: small bump if name appears
-    manufacturer_score = 0.0
-    if manufacturer:
-        manufacturer_score = max(
-            fuzz.partial_ratio(manufacturer.lower(), title.lower()),
-            fuzz.partial_ratio(manufacturer.lower(), snippet.lower()),
+
+    def __init__(self, product_name: str, manufacturer: Optional[str] = None):
+        self.product_name = product_name or ""
+        # The product name itself is the first synonym, so row 0 is the base score.
+        self.synonyms = _expand_synonyms(self.product_name)
+        self.model_tokens = _extract_model_tokens(self.product_name)
+        self.manufacturer = (manufacturer or "").lower()
+
+    def score(self, title: str, snippet: str) -> float:
+        title = title or ""
+        snippet = snippet or ""
+
+        base_score = max(fuzz.token_set_ratio(self.product_name, title), fuzz.token_set_ratio(self.product_name, snippet)) / 100.0
+        synonym_score = max(
+            max(fuzz.token_set_ratio(syn, title), fuzz.token_set_ratio(syn, snippet)) for syn in self.synonyms
         ) / 100.0
 
-    combined = max(base_score, synonym_score, manufacturer_score)
+        # Model numbers: near-exact matching gets a boost
+        model_match = 0.0
+        target_tokens = _extract_model_tokens(f"{title} {snippet}") if self.model_tokens else []
+        for mt in self.model_tokens:
+            best = process.extractOne(mt, target_tokens, scorer=fuzz.ratio)
+            if best:
+                model_match = max(model_match, best[1] / 100.0)
+        if model_match >= MODEL_MATCH_FLOOR:
+            base_score = max(base_score, model_match)
+
+        # Manufacturer cue: small bump if name appears
+        manufacturer_score = 0.0
+        if self.manufacturer:
+            manufacturer_score = max(
+                fuzz.partial_ratio(self.manufacturer, title.lower()),
+                fuzz.partial_ratio(self.manufacturer, snippet.lower()),
+            ) / 100.0
+
+        combined = max(base_score, synonym_score, manufacturer_score)
+
+        # Soft bonus for recall/alert keywords in the snippet/title
+        keyword_bonus = 0.05 if _KEYWORD_RE.search(f"{title.lower()} {snippet.lower()}") else 0.0
+        return min(1.0, combined + keyword_bonus)
+
+    def score_batch(self, titles: Sequence[str], snippets: Sequence[str]) -> np.ndarray:
+        """
+        Scores hits (titles[i], snippets[i]) in one pass; equal to score() per hit.
+        Repeated titles and snippets (common across recall product lines) are scored once.
+        """
+        if not len(titles):
+            return np.empty(0)
+        title_codes, title_uniques = pd.factorize(pd.Series(titles, dtype=object).fillna("").astype(str))
+        snippet_codes, snippet_uniques = pd.factorize(pd.Series(snippets, dtype=object).fillna("").astype(str))
+        title_uniques, snippet_uniques = list(title_uniques), list(snippet_uniques)
+
+        syn_title = process.cdist(self.synonyms, title_uniques, scorer=fuzz.token_set_ratio, dtype=np.float64, workers=-1)[:, title_codes]
+        syn_snippet = process.cdist(self.synonyms, snippet_uniques, scorer=fuzz.token_set_ratio, dtype=np.float64, workers=-1)[:, snippet_codes]
+        base_score = np.maximum(syn_title[0], syn_snippet[0]) / 100.0
+        synonym_score = np.maximum(syn_title.max(axis=0), syn_snippet.max(axis=0)) / 100.0
+
+        if self.model_tokens:
+            base_score = self._apply_model_match(base_score, title_uniques, title_codes, snippet_uniques, snippet_codes)
+
+        manufacturer_score = np.zeros(len(title_codes))
+        if self.manufacturer:
+            manufacturer_score = np.maximum(
+                self._manufacturer_scores(title_uniques)[title_codes],
+                self._manufacturer_scores(snippet_uniques)[snippet_codes],
+            )
+
+        combined = np.maximum.reduce([base_score, synonym_score, manufacturer_score])
+        # Keywords may straddle the title/snippet join ("class" + "ii"), so check each distinct pair as joined text.
+        pair_codes, pairs = pd.factorize(pd.Series(list(zip(title_codes, snippet_codes))))
+        has_keyword = np.fromiter(
+            (bool(_KEYWORD_RE.search(f"{title_uniques[t].lower()} {snippet_uniques[n].lower()}")) for t, n in pairs),
+            dtype=bool,
+            count=len(pairs),
+        )[pair_codes]
+        return np.minimum(1.0, combined + np.where(has_keyword, 0.05, 0.0))
+
+    def _apply_model_match(self, base_score, title_uniques, title_codes, snippet_uniques, snippet_codes) -> np.ndarray:
+        # Best ratio per distinct model token, then the best token per title and per snippet.
+        # Tokens never span the title/snippet boundary, so scoring the two sides separately is exact.
+        best = np.zeros(len(title_codes))
+        for uniques, codes in ((title_uniques, title_codes), (snippet_uniques, snippet_codes)):
+            per_text = [_extract_model_tokens(text) for text in uniques]
+            flat = [tok for toks in per_text for tok in toks]
+            if not flat:
+                continue
+            token_best = process.cdist(self.model_tokens, flat, scorer=fuzz.ratio, dtype=np.float64, workers=-1).max(axis=0)
+            lengths = np.fromiter((len(toks) for toks in per_text), dtype=np.int64, count=len(per_text))
+            text_best = np.zeros(len(per_text))
+            has = lengths > 0
+            text_best[has] = np.maximum.reduceat(token_best, np.concatenate(([0], np.cumsum(lengths)[:-1]))[has])
+            best = np.maximum(best, text_best[codes] / 100.0)
+        return np.where(best >= MODEL_MATCH_FLOOR, np.maximum(base_score, best), base_score)
+
+    def _manufacturer_scores(self, texts: List[str]) -> np.ndarray:
+        lowered = [t.lower() for t in texts]
+        return process.cdist([self.manufacturer], lowered, scorer=fuzz.partial_ratio, dtype=np.float64, workers=-1)[0] / 100.0
+
+
+@lru_cache(maxsize=1024)
+def product_matcher(product_name: str, manufacturer: Optional[str] = None) -> ProductMatcher:
+    return ProductMatcher(product_name, manufacturer)
 
-    # Soft bonus for recall/alert keywords in the snippet/title
-    keywords = ["recall", "safety", "alert", "warning", "class i", "class ii", "enforcement", "field safety"]
-    keyword_bonus = 0.05 if any(k in f"{title.lower()} {snippet.lower()}" for k in keywords) else 0.0
 
-    return min(1.0, combined + keyword_bonus)
+def fuzzy_score(product_name: str, title: str, snippet: str, manufacturer: Optional[str] = None) -> float:
+    """
+    Stronger matching that blends synonym search, typo tolerance, and model-number sensitivity.
+    Returns score in 0.0 - 1.0. Score many hits for one product with ProductMatcher.score_batch.
+    """
+    return product_matcher(product_name or "", manufacturer).score(title, snippet)
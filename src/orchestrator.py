@@ -7,7 +7,7 @@ from typing import Any, Dict, List, Optional
 from .search.google_cse import google_search
 from .search.openfda import search_device_recall, search_device_enforcement
 from .search.cpsc import cpsc_search
-from .match_and_classify import ScoredHit, fuzzy_score
+from .match_and_classify import ScoredHit, product_matcher
 from .llm_classifier import classify_hit
 
 @dataclass
@@ -21,43 +21,36 @@ class RunOptions:
     use_llm: bool = False
 
 def search_one(sku: str, product_name: str, start: date, end: date, opts: RunOptions) -> List[Dict[str, Any]]:
-    hits: List[ScoredHit] = []
+    # (source, title, url, snippet, date, raw); scored together once every source has answered.
+    found: List[tuple] = []
 
     if opts.use_google:
         items = google_search(f'"{product_name}" recall OR warning OR lawsuit OR injury', days=opts.google_days, num=10)
         for it in items:
-            title = it.get("title","")
-            snippet = it.get("snippet","")
-            url = it.get("link","")
-            score = fuzzy_score(product_name, title, snippet)
-            hits.append(ScoredHit("google", title, url, snippet, None, score, it))
+            found.append(("google", it.get("title",""), it.get("link",""), it.get("snippet",""), None, it))
 
     if opts.use_openfda_recall:
         res = search_device_recall(product_name, start, end, limit=50)
         for r in res:
-            title = r.get("product_description","")[:140]
-            snippet = r.get("reason_for_recall","")
-            url = r.get("recall_number","")
-            score = fuzzy_score(product_name, title, snippet)
-            hits.append(ScoredHit("openfda_device_recall", title, url, snippet, r.get("report_date"), score, r))
+            found.append(("openfda_device_recall", r.get("product_description","")[:140], r.get("recall_number",""),
+                          r.get("reason_for_recall",""), r.get("report_date"), r))
 
     if opts.use_openfda_enforcement:
         res = search_device_enforcement(product_name, start, end, limit=50)
         for r in res:
-            title = r.get("product_description","")[:140]
-            snippet = r.get("reason_for_recall","")
-            url = r.get("recall_number","")
-            score = fuzzy_score(product_name, title, snippet)
-            hits.append(ScoredHit("openfda_device_enforcement", title, url, snippet, r.get("report_date"), score, r))
+            found.append(("openfda_device_enforcement", r.get("product_description","")[:140], r.get("recall_number",""),
+                          r.get("reason_for_recall",""), r.get("report_date"), r))
 
     if opts.use_cpsc:
         res = cpsc_search(product_name, start, end, limit=100)
         for r in res:
-            title = r.get("Title","")
-            snippet = r.get("Description","")
-            url = r.get("URL","")
-            score = fuzzy_score(product_name, title, snippet)
-            hits.append(ScoredHit("cpsc", title, url, snippet, r.get("RecallDate"), score, r))
+            found.append(("cpsc", r.get("Title",""), r.get("URL",""), r.get("Description",""), r.get("RecallDate"), r))
+
+    scores = product_matcher(product_name).score_batch([f[1] for f in found], [f[3] for f in found])
+    hits: List[ScoredHit] = [
+        ScoredHit(source, title, url, snippet, hit_date, float(score), raw)
+        for (source, title, url, snippet, hit_date, raw), score in zip(found, scores)
+    ]
 
     # keep high-ish matches + always keep openFDA/CPSC if any (they're already “recall-shaped”)
     filtered = [h for h in hits if (h.source != "google") or (h.score >= opts.fuzzy_threshold)]
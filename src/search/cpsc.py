@@ -4,22 +4,37 @@ import requests
 from datetime import date
 from typing import Any, Dict, List
 
+from src.search.query_ast import SearchQuery, to_cpsc
+
 CPSC_ENDPOINT = "https://www.saferproducts.gov/RestWebServices/Recall"
 
-def cpsc_search(product_name: str, start: date, end: date, limit: int = 200) -> List[Dict[str, Any]]:
-    params = {
-        "format": "json",
-        "ProductName": product_name,
-        "RecallDateStart": start.isoformat(),  # YYYY-MM-DD
-        "RecallDateEnd": end.isoformat(),
-    }
-    try:
-        r = requests.get(CPSC_ENDPOINT, params=params, timeout=30)
-        r.raise_for_status()
-        data = r.json()
-    except requests.RequestException:
-        return []
+def cpsc_search(
+    product_name: str, start: date, end: date, limit: int = 200, manufacturer: str = "", raise_errors: bool = False
+) -> List[Dict[str, Any]]:
+    """raise_errors: a failed request raises instead of counting as no recalls."""
+    results: List[Dict[str, Any]] = []
+    fetch = _cpsc_fetch if raise_errors else _cpsc_request
+    for params in to_cpsc(SearchQuery.build([product_name], manufacturer, start=start, end=end)):
+        results.extend(fetch(params))
+        if len(results) >= limit:
+            break
+    return results[:limit]
+
+def cpsc_window(start: date, end: date) -> List[Dict[str, Any]]:
+    """Every CPSC recall dated within the window, in one request. Raises on failure: an empty window is not an error."""
+    return _cpsc_fetch({"format": "json", "RecallDateStart": start.isoformat(), "RecallDateEnd": end.isoformat()})
+
+def _cpsc_fetch(params: Dict[str, str]) -> List[Dict[str, Any]]:
+    r = requests.get(CPSC_ENDPOINT, params=params, timeout=30)
+    r.raise_for_status()
+    data = r.json()
     # API returns a list of recalls
     if isinstance(data, list):
-        return data[:limit]
+        return data
     return []
+
+def _cpsc_request(params: Dict[str, str]) -> List[Dict[str, Any]]:
+    try:
+        return _cpsc_fetch(params)
+    except requests.RequestException:
+        return []
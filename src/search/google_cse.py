@@ -19,12 +19,14 @@ def google_search(
     api_key: Optional[str] = None,
     cx_id: Optional[str] = None,
     dedupe: bool = True,
+    raise_errors: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     Google Programmable Search with pagination and optional domain scoping.
     - num: number of results per page (max 10 by API)
     - pages: number of pages to fetch (start param increments by 10)
     - domains: list of domains to include via site: filters
+    - raise_errors: an error response raises instead of ending the results early
     """
     key = api_key or ENV_GOOGLE_API_KEY
     cx = cx_id or ENV_GOOGLE_CX_ID
@@ -54,6 +56,8 @@ def google_search(
 
         r = requests.get(GOOGLE_ENDPOINT, params=params, timeout=30)
         if r.status_code != 200:
+            if raise_errors:
+                r.raise_for_status()
             break
         data = r.json()
         items = data.get("items", []) or []
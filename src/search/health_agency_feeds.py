@@ -1,24 +1,25 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
-from email.utils import parsedate_to_datetime
 from typing import Iterable, List, Optional
 from urllib.parse import urlparse, urlunparse
 import xml.etree.ElementTree as ET
 
 import requests
 
+from src.search.query_ast import fold_separators
+
 
 @dataclass(frozen=True)
 class AgencyFeed:
     name: str
     region: str
     url: str
+    date_format: str = "rfc822"  # RSS pubDate; Atom feeds publish ISO-8601
 
 
 FEEDS: List[AgencyFeed] = [
-    AgencyFeed("UK MHRA Alerts", "UK", "https://www.gov.uk/drug-device-alerts.atom"),
+    AgencyFeed("UK MHRA Alerts", "UK", "https://www.gov.uk/drug-device-alerts.atom", date_format="iso8601"),
     AgencyFeed("EU EMA News", "EU", "https://www.ema.europa.eu/en/rss.xml"),
     AgencyFeed("Canada Health Recalls", "CA", "https://recalls-rappels.canada.ca/en/rss.xml"),
     AgencyFeed(
@@ -29,7 +30,8 @@ FEEDS: List[AgencyFeed] = [
 ]
 
 
-def fetch_agency_alerts(terms: Iterable[str], regions: Iterable[str], limit: int = 50) -> List[dict]:
+def fetch_agency_alerts(terms: Iterable[str], regions: Iterable[str], limit: int = 50, raise_errors: bool = False) -> List[dict]:
+    """raise_errors: a feed that cannot be fetched raises instead of counting as no alerts."""
     selected_regions = {r.upper() for r in regions}
     normalized_terms = _normalize_terms(terms)
     if not normalized_terms:
@@ -43,7 +45,7 @@ def fetch_agency_alerts(terms: Iterable[str], regions: Iterable[str], limit: int
         remaining = limit - len(results)
         if remaining <= 0:
             break
-        items = _fetch_feed(feed)
+        items = _fetch_feed(feed, raise_errors)
         for item in items:
             if len(results) >= limit:
                 break
@@ -76,14 +78,14 @@ def fetch_agency_alerts(terms: Iterable[str], regions: Iterable[str], limit: int
 def _normalize_terms(terms: Iterable[str]) -> List[str]:
     normalized = []
     for term in terms:
-        cleaned = (term or "").strip().lower()
+        cleaned = fold_separators(term)
         if cleaned and cleaned not in normalized:
             normalized.append(cleaned)
     return normalized
 
 
 def _matches_terms(item: "FeedItem", terms: List[str]) -> bool:
-    haystack = f"{item.title} {item.summary}".lower()
+    haystack = fold_separators(f"{item.title} {item.summary}")
     for term in terms:
         if term in haystack:
             item.matched_term = term
@@ -97,11 +99,13 @@ def _looks_high_risk(title: str, summary: str) -> bool:
     return any(keyword in text for keyword in keywords)
 
 
-def _fetch_feed(feed: AgencyFeed) -> List["FeedItem"]:
+def _fetch_feed(feed: AgencyFeed, raise_errors: bool = False) -> List["FeedItem"]:
     try:
         response = requests.get(feed.url, timeout=12)
         response.raise_for_status()
     except requests.RequestException:
+        if raise_errors:
+            raise
         return []
 
     content = response.content.strip()
@@ -138,7 +142,7 @@ def _parse_atom_feed(root: ET.Element) -> List[FeedItem]:
         summary = _text(entry.find("{http://www.w3.org/2005/Atom}summary")) or _text(
             entry.find("{http://www.w3.org/2005/Atom}content")
         )
-        date_str = _format_date(_text(entry.find("{http://www.w3.org/2005/Atom}updated")))
+        date_str = _text(entry.find("{http://www.w3.org/2005/Atom}updated"))
         items.append(FeedItem(title, link, summary, date_str))
     return items
 
@@ -149,7 +153,7 @@ def _parse_rss_feed(root: ET.Element) -> List[FeedItem]:
         title = _text(item.find("title"))
         link = _text(item.find("link"))
         summary = _text(item.find("description"))
-        date_str = _format_date(_text(item.find("pubDate")))
+        date_str = _text(item.find("pubDate"))
         items.append(FeedItem(title, link, summary, date_str))
     return items
 
@@ -167,21 +171,6 @@ def _text(element: Optional[ET.Element]) -> str:
     return element.text.strip()
 
 
-def _format_date(value: str) -> str:
-    if not value:
-        return ""
-    try:
-        parsed = parsedate_to_datetime(value)
-        return parsed.strftime("%Y-%m-%d")
-    except (TypeError, ValueError):
-        pass
-    try:
-        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
-        return dt.strftime("%Y-%m-%d")
-    except ValueError:
-        return value
-
-
 def _normalize_link(link: str) -> str:
     if not link:
         return ""
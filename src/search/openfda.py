@@ -1,11 +1,16 @@
 # src/search/openfda.py
 from __future__ import annotations
 import requests
-from datetime import date
+from datetime import date, timedelta
 from typing import Any, Dict, List
 
+from src.search.query_ast import SearchQuery, to_openfda
+
 DEVICE_RECALL_ENDPOINT = "https://api.fda.gov/device/recall.json"
 DEVICE_ENF_ENDPOINT    = "https://api.fda.gov/device/enforcement.json"
+MAX_PAGE = 1000
+# openFDA rejects skip beyond 25000; larger windows are split by date instead.
+MAX_SKIP = 25000
 
 def _yyyymmdd(d: date) -> str:
     return d.strftime("%Y%m%d")
@@ -19,17 +24,70 @@ def _openfda(endpoint: str, search: str, limit: int = 100) -> List[Dict[str, Any
     r.raise_for_status()
     return r.json().get("results", []) or []
 
+def _openfda_total(endpoint: str, search: str) -> int:
+    # limit=1 keeps the payload to a single record; meta.results.total is the full hit count.
+    r = requests.get(endpoint, params={"search": search, "limit": 1}, timeout=30)
+    if r.status_code == 404:
+        return 0
+    r.raise_for_status()
+    return int(r.json().get("meta", {}).get("results", {}).get("total", 0))
+
+def term_search(product_names: List[str], start: date, end: date) -> str:
+    """Product text + date window; several names are OR'd, so the total counts their union."""
+    return to_openfda(SearchQuery.build(product_names, start=start, end=end))
+
 def search_device_recall(product_name: str, start: date, end: date, limit: int = 100):
     # Match product text + date window (report_date is a common choice; fallback to recall_initiation_date if needed)
-    s = (
-        f'(product_description:"{product_name}" OR reason_for_recall:"{product_name}" OR recalling_firm:"{product_name}")'
-        f" AND report_date:[{_yyyymmdd(start)} TO {_yyyymmdd(end)}]"
-    )
-    return _openfda(DEVICE_RECALL_ENDPOINT, s, limit)
+    return _openfda(DEVICE_RECALL_ENDPOINT, term_search([product_name], start, end), limit)
 
 def search_device_enforcement(product_name: str, start: date, end: date, limit: int = 100):
-    s = (
-        f'(product_description:"{product_name}" OR reason_for_recall:"{product_name}" OR recalling_firm:"{product_name}")'
-        f" AND report_date:[{_yyyymmdd(start)} TO {_yyyymmdd(end)}]"
-    )
+    return _openfda(DEVICE_ENF_ENDPOINT, term_search([product_name], start, end), limit)
+
+def count_device_recall(product_names: List[str], start: date, end: date) -> int:
+    return _openfda_total(DEVICE_RECALL_ENDPOINT, term_search(product_names, start, end))
+
+def count_device_enforcement(product_names: List[str], start: date, end: date) -> int:
+    return _openfda_total(DEVICE_ENF_ENDPOINT, term_search(product_names, start, end))
+
+def _any_of(field: str, values: List[str]) -> str:
+    return f"{field}:(" + " OR ".join(f'"{v}"' for v in values) + ")"
+
+def code_search(product_codes: List[str], start: date, end: date) -> str:
+    # One exact clause on the classification product code instead of free-text phrases.
+    return f"{_any_of('product_code', product_codes)} AND report_date:[{_yyyymmdd(start)} TO {_yyyymmdd(end)}]"
+
+def search_device_recall_by_code(product_codes: List[str], start: date, end: date, limit: int = 100):
+    return _openfda(DEVICE_RECALL_ENDPOINT, code_search(product_codes, start, end), limit)
+
+def count_device_recall_by_code(product_codes: List[str], start: date, end: date) -> int:
+    return _openfda_total(DEVICE_RECALL_ENDPOINT, code_search(product_codes, start, end))
+
+def search_device_enforcement_by_recall_number(recall_numbers: List[str], start: date, end: date, limit: int = 100):
+    # Enforcement reports carry no product code; they join to recalls on recall_number == product_res_number.
+    s = f"{_any_of('recall_number', recall_numbers)} AND report_date:[{_yyyymmdd(start)} TO {_yyyymmdd(end)}]"
     return _openfda(DEVICE_ENF_ENDPOINT, s, limit)
+
+def window_search(start: date, end: date) -> str:
+    return to_openfda(SearchQuery.build(start=start, end=end))
+
+def _openfda_page(endpoint: str, search: str, skip: int) -> List[Dict[str, Any]]:
+    r = requests.get(endpoint, params={"search": search, "limit": MAX_PAGE, "skip": skip}, timeout=60)
+    if r.status_code == 404:
+        return []
+    r.raise_for_status()
+    return r.json().get("results", []) or []
+
+def fetch_window(endpoint: str, start: date, end: date) -> List[Dict[str, Any]]:
+    """Every record reported in [start, end], paged 1000 at a time; windows too large to page are halved."""
+    search = window_search(start, end)
+    total = _openfda_total(endpoint, search)
+    if total > MAX_SKIP + MAX_PAGE and start < end:
+        mid = start + timedelta(days=(end - start).days // 2)
+        return fetch_window(endpoint, start, mid) + fetch_window(endpoint, mid + timedelta(days=1), end)
+    results: List[Dict[str, Any]] = []
+    for skip in range(0, min(total, MAX_SKIP + MAX_PAGE), MAX_PAGE):
+        results.extend(_openfda_page(endpoint, search, skip))
+    return results
+
+def count_window(endpoint: str, start: date, end: date) -> int:
+    return _openfda_total(endpoint, window_search(start, end))
@@ -0,0 +1,140 @@
+# src/search/query_ast.py
+from __future__ import annotations
+
+"""
+A small search query AST and its per-backend compilers.
+
+Product terms, manufacturer, hazard keywords and the date window are kept
+apart so that each backend gets only the parts it understands. openFDA and
+CPSC only hold safety records, so hazard keywords are not sent to them. Web
+and news search use the keywords as an OR group, never as part of a phrase.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+HAZARD_KEYWORDS: Tuple[str, ...] = (
+    "recall", "alert", "safety", "bulletin", "problem", "issue", "hazard", "warning", "defect",
+)
+
+OPENFDA = "openfda"
+CPSC = "cpsc"
+CSE = "cse"
+RSS = "rss"
+
+# Backends whose tokenizers split on hyphens, so "x-ray" and "x ray" are the same query there.
+# CPSC matches ProductName as a raw substring and needs both spellings.
+SPLITS_HYPHENS = {OPENFDA: True, CPSC: False, CSE: True, RSS: True}
+
+OPENFDA_TEXT_FIELDS = ("product_description", "reason_for_recall", "recalling_firm")
+OPENFDA_FIRM_FIELD = "recalling_firm"
+OPENFDA_DATE_FIELD = "report_date"
+
+_SEPARATORS = re.compile(r"[\s\-_/]+")
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    product_terms: Tuple[str, ...] = ()
+    manufacturer: str = ""
+    hazard_keywords: Tuple[str, ...] = ()
+    start: Optional[date] = None
+    end: Optional[date] = None
+
+    @classmethod
+    def build(
+        cls,
+        product_terms: Iterable[str] = (),
+        manufacturer: str = "",
+        hazard_keywords: Iterable[str] = (),
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> "SearchQuery":
+        terms = tuple(dict.fromkeys(t.strip() for t in product_terms if t and t.strip()))
+        keywords = tuple(dict.fromkeys(k.strip().lower() for k in hazard_keywords if k and k.strip()))
+        return cls(terms, (manufacturer or "").strip(), keywords, start, end)
+
+
+def fold_separators(text: str) -> str:
+    """Hyphens, underscores, slashes and runs of whitespace all become one space."""
+    return _SEPARATORS.sub(" ", (text or "").lower()).strip()
+
+
+def collapse_variants(terms: Sequence[str], backend: str) -> List[str]:
+    """Keeps one spelling per hyphen/space variant group where the backend cannot tell them apart."""
+    if not SPLITS_HYPHENS.get(backend, False):
+        return list(dict.fromkeys(terms))
+    kept: Dict[str, str] = {}
+    for term in terms:
+        kept.setdefault(fold_separators(term), term)
+    return list(kept.values())
+
+
+def _phrase(text: str) -> str:
+    return '"' + text.replace('"', " ").strip() + '"'
+
+
+def _yyyymmdd(d: date) -> str:
+    return d.strftime("%Y%m%d")
+
+
+def to_openfda(query: SearchQuery, fields: Sequence[str] = OPENFDA_TEXT_FIELDS, date_field: str = OPENFDA_DATE_FIELD) -> str:
+    """
+    Lucene search string. Product terms are OR'd across `fields`, the
+    manufacturer is a phrase on the firm field, and both are ANDed with the
+    date range. Hazard keywords are dropped.
+    """
+    clauses: List[str] = []
+    terms = collapse_variants(query.product_terms, OPENFDA)
+    if terms:
+        clauses.append("(" + " OR ".join(f"{field}:{_phrase(t)}" for t in terms for field in fields) + ")")
+    if query.manufacturer:
+        clauses.append(f"{OPENFDA_FIRM_FIELD}:{_phrase(query.manufacturer)}")
+    if query.start and query.end:
+        clauses.append(f"{date_field}:[{_yyyymmdd(query.start)} TO {_yyyymmdd(query.end)}]")
+    return " AND ".join(clauses)
+
+
+def to_cpsc(query: SearchQuery) -> List[Dict[str, str]]:
+    """One parameter set per product spelling; CPSC has no OR, and hazard keywords are dropped."""
+    base: Dict[str, str] = {"format": "json"}
+    if query.manufacturer:
+        base["Manufacturer"] = query.manufacturer
+    if query.start and query.end:
+        base["RecallDateStart"] = query.start.isoformat()
+        base["RecallDateEnd"] = query.end.isoformat()
+    terms = collapse_variants(query.product_terms, CPSC)
+    if not terms:
+        return [base] if query.manufacturer else []
+    return [{**base, "ProductName": term} for term in terms]
+
+
+def _keyword_group(keywords: Sequence[str]) -> str:
+    if not keywords:
+        return ""
+    if len(keywords) == 1:
+        return keywords[0]
+    return "(" + " OR ".join(keywords) + ")"
+
+
+def to_cse(query: SearchQuery, site: str = "") -> List[str]:
+    """One Google CSE query per product spelling: exact phrase, manufacturer, hazard OR group, site filter."""
+    terms = collapse_variants(query.product_terms, CSE) or [""]
+    out: List[str] = []
+    for term in terms:
+        parts = [_phrase(term) if term else "", _phrase(query.manufacturer) if query.manufacturer else ""]
+        parts.append(_keyword_group(query.hazard_keywords))
+        if site:
+            parts.append(f"site:{site}")
+        compiled = " ".join(p for p in parts if p)
+        if term or query.manufacturer:
+            out.append(compiled)
+    return out
+
+
+def to_rss(query: SearchQuery) -> List[str]:
+    """News RSS search strings (Google News operators); same shape as CSE without a site filter."""
+    return to_cse(query)
+
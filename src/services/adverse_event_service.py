@@ -1,7 +1,27 @@
+import os
 import requests
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime
 
+# Columns kept by bulk pulls; everything else in the event document is dropped on decode.
+BULK_SCHEMA = pa.schema([
+    ("report_number", pa.string()),
+    ("date_received", pa.string()),
+    ("event_type", pa.string()),
+    ("product_problems", pa.string()),
+    ("product_code", pa.string()),
+    ("brand_name", pa.string()),
+    ("generic_name", pa.string()),
+    ("manufacturer_d_name", pa.string()),
+    ("model_number", pa.string()),
+    ("mdr_text", pa.string()),
+])
+# Narratives dominate file size, so they get a stronger codec than the short columns.
+BULK_COMPRESSION = {name: ("zstd" if name == "mdr_text" else "snappy") for name in BULK_SCHEMA.names}
+MAX_SKIP = 25000
+
 class AdverseEventService:
     """
     Service to fetch Adverse Event reports (MAUDE) from openFDA.
@@ -10,8 +30,11 @@ class AdverseEventService:
     
     BASE_URL = "https://api.fda.gov/device/event.json"
 
-    def search_events(self, query_term: str, start_date=None, end_date=None, limit: int = 50) -> list:
-        if not query_term:
+    def search_events(
+        self, query_term: str, start_date=None, end_date=None, limit: int = 50, product_codes=None, raise_errors: bool = False
+    ) -> list:
+        """raise_errors: a failed request raises instead of counting as no events (openFDA's 404 means none)."""
+        if not query_term and not product_codes:
             return []
 
         # Construct date filter
@@ -22,11 +45,15 @@ class AdverseEventService:
             date_query = f'+AND+date_received:[{s_str}+TO+{e_str}]'
 
         # Query syntax: Use broad search for maximum hits
-        sanitized_term = query_term.strip().replace(" ", "+")
+        sanitized_term = (query_term or "").strip().replace(" ", "+")
         
         # Enhanced query: Searches generic name, brand name, OR full text if necessary
         # We use a broad search first to avoid zero results
         search_query = f'(device.generic_name:"{sanitized_term}"+OR+device.brand_name:"{sanitized_term}"+OR+device.generic_name:{sanitized_term}){date_query}'
+        if product_codes:
+            # Exact classification codes beat name matching when the term resolved to any.
+            codes = "+OR+".join(f'"{code}"' for code in product_codes)
+            search_query = f'device.device_report_product_code:({codes}){date_query}'
         
         params = {
             'search': search_query,
@@ -37,6 +64,8 @@ class AdverseEventService:
         out = []
         try:
             res = requests.get(self.BASE_URL, params=params, timeout=10)
+            if raise_errors and res.status_code != 404:
+                res.raise_for_status()
             if res.status_code == 200:
                 data = res.json()
                 if "results" in data:
@@ -68,5 +97,106 @@ class AdverseEventService:
                         })
         except Exception as e:
             print(f"MAUDE Search Error: {e}")
-            
+            if raise_errors:
+                raise
+
         return out
+
+    def count_events(self, count_field: str, search: str = "", start_date=None, end_date=None, limit: int = 1000) -> list:
+        """
+        Runs an openFDA count query (e.g. count=product_problems.exact).
+        Returns a list of {"term": ..., "count": ...} buckets.
+        """
+        clauses = []
+        if search:
+            clauses.append(f"({search})")
+        if start_date and end_date:
+            s_str = start_date.strftime("%Y%m%d") if hasattr(start_date, 'strftime') else str(start_date)
+            e_str = end_date.strftime("%Y%m%d") if hasattr(end_date, 'strftime') else str(end_date)
+            clauses.append(f"date_received:[{s_str} TO {e_str}]")
+
+        params = {'count': count_field, 'limit': min(max(limit, 1), 1000)}
+        if clauses:
+            params['search'] = " AND ".join(clauses)
+
+        try:
+            res = requests.get(self.BASE_URL, params=params, timeout=30)
+            if res.status_code == 200:
+                return res.json().get("results", []) or []
+        except Exception as e:
+            print(f"MAUDE Count Error: {e}")
+        return []
+
+    def bulk_pull(self, search: str, out_path: str, start_date=None, end_date=None, page_size: int = 1000,
+                  max_events: int = 100000, progress_callback=None) -> int:
+        """
+        Streams MAUDE events matching `search` to a Parquet file, one row group per page.
+        Only BULK_SCHEMA fields are kept; full narratives go to the zstd-compressed `mdr_text` column.
+        Returns the number of events written.
+        """
+        clauses = [f"({search})"] if search else []
+        if start_date and end_date:
+            s_str = start_date.strftime("%Y%m%d") if hasattr(start_date, 'strftime') else str(start_date)
+            e_str = end_date.strftime("%Y%m%d") if hasattr(end_date, 'strftime') else str(end_date)
+            clauses.append(f"date_received:[{s_str} TO {e_str}]")
+
+        page_size = min(max(page_size, 1), 1000)
+        base_params = {'search': " AND ".join(clauses), 'limit': page_size, 'sort': 'date_received:desc'}
+        url, params = self.BASE_URL, base_params
+        written = 0
+        skip = 0
+
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+        with pq.ParquetWriter(out_path, BULK_SCHEMA, compression=BULK_COMPRESSION) as writer:
+            while written < max_events:
+                try:
+                    res = requests.get(url, params=params, timeout=60)
+                except Exception as e:
+                    print(f"MAUDE Bulk Pull Error: {e}")
+                    break
+                if res.status_code != 200:
+                    break
+
+                page = res.json().get("results", []) or []
+                if not page:
+                    break
+                rows = [self._project_event(item) for item in page[:max_events - written]]
+                del page
+                writer.write_table(pa.Table.from_pylist(rows, schema=BULK_SCHEMA))
+                written += len(rows)
+                if progress_callback:
+                    progress_callback(written)
+                if len(rows) < page_size:
+                    break
+
+                # Prefer openFDA's search_after cursor (Link header); fall back to skip paging.
+                next_link = res.links.get("next", {}).get("url")
+                if next_link:
+                    url, params = next_link, None
+                elif params is None:
+                    # Following the cursor: no next link means that was the last page.
+                    break
+                else:
+                    skip += page_size
+                    if skip > MAX_SKIP:
+                        break
+                    params = {**base_params, 'skip': skip}
+        return written
+
+    @staticmethod
+    def _project_event(item: dict) -> dict:
+        devices = item.get("device") or [{}]
+        device_info = devices[0]
+        narratives = [t.get("text", "") for t in item.get("mdr_text") or [] if t.get("text")]
+        return {
+            "report_number": item.get("report_number"),
+            "date_received": item.get("date_received"),
+            "event_type": item.get("event_type"),
+            "product_problems": ";".join(item.get("product_problems") or []),
+            "product_code": device_info.get("device_report_product_code"),
+            "brand_name": device_info.get("brand_name"),
+            "generic_name": device_info.get("generic_name"),
+            "manufacturer_d_name": device_info.get("manufacturer_d_name"),
+            "model_number": device_info.get("model_number"),
+            "mdr_text": "\n\n".join(narratives),
+        }
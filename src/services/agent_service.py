@@ -1,11 +1,33 @@
-import re
 import streamlit as st
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-import difflib
+from functools import partial
+import numpy as np
+from src.services.candidate_blocking import candidate_pairs
+from src.services.match_engine import score_pairs
+from src.services.model_index import ModelNumberIndex
+from src.services.product_codes import refresh_product_codes
+from src.services.recall_corpus import AUTO, CORPUS, choose_scan_mode, load_corpus
 from src.services.regulatory_service import RegulatoryService
+from src.services.result_schema import failed_sources
+from src.services.scan_delta import ScanDelta
+from src.services.scan_planner import ScanTermPlan
+from src.services.scan_store import FAILED, ScanStore, scan_key
+from src.services.concurrency import source_slot
+from src.services.ingestion import iter_chunks, upload_digest
+from src.services.job_runner import JobContext, JobResult
+from src.services.keyword_batching import KEYWORD_INSTRUCTIONS, KEYWORD_SYSTEM, batch_prompt, keyword_batches, parse_batch_reply
+from src.services.keyword_cache import KeywordCache, clean_product_name, keyword_key, keyword_version
 from src.ai_services import get_ai_service
 
+BULK_SCAN_WORKERS = 8
+# Share of the progress bar given to keyword generation; the rest tracks searches.
+KEYWORD_PROGRESS_SHARE = 0.2
+MISSION_SEARCH_SHARE = 0.2
+# Records the AI relevance screen reviews per run, newest first.
+SCREEN_LIMIT = 30
+
 class RecallResponseAgent:
     """
     An autonomous agent that monitors regulatory databases, adverse events, and media.
@@ -15,10 +37,13 @@ class RecallResponseAgent:
     def __init__(self):
         self.ai = get_ai_service()
         self.regulatory = RegulatoryService()
+        self.scan_store = ScanStore()
+        self.keyword_cache = KeywordCache()
 
-    def run_mission(self, search_term, my_firm, my_model, lookback_days=365):
+    def run_mission(self, search_term, my_firm, my_model, lookback_days=365, progress_callback=None):
         """
         Executes the full agent workflow: Search -> Analyze -> Draft -> Report.
+        progress_callback(pct, message) is called after the search and after each screened record.
         """
         mission_log = []
         artifacts = []
@@ -38,6 +63,8 @@ class RecallResponseAgent:
         )
         total_hits = len(df)
         self._log(mission_log, f"✅ SCAN COMPLETE. Found {total_hits} records. Stats: {stats}")
+        if progress_callback:
+            progress_callback(MISSION_SEARCH_SHARE, f"Found {total_hits} records")
 
         if df.empty:
             self._log(mission_log, "🏁 MISSION END: No records found.")
@@ -49,7 +76,7 @@ class RecallResponseAgent:
         target_df = df.head(25).copy()
         high_risk_found = False
         
-        for index, row in target_df.iterrows():
+        for screened, (index, row) in enumerate(target_df.iterrows(), start=1):
             source_type = row.get("Source", "Unknown")
             
             # Construct context for the AI
@@ -73,6 +100,9 @@ class RecallResponseAgent:
                     
             except Exception as e:
                 self._log(mission_log, f"⚠️ ERROR analyzing row {index}: {str(e)}")
+            if progress_callback:
+                pct = MISSION_SEARCH_SHARE + (1.0 - MISSION_SEARCH_SHARE) * screened / len(target_df)
+                progress_callback(pct, f"Screened {screened}/{len(target_df)} records, {len(artifacts)} threats")
 
         if not high_risk_found:
             self._log(mission_log, "🛡️ STATUS: No immediate high-risk threats detected in sample.")
@@ -80,126 +110,471 @@ class RecallResponseAgent:
         self._log(mission_log, f"🏁 MISSION COMPLETE. Generated {len(artifacts)} response packages.")
         return mission_log, artifacts
 
-    def run_bulk_scan(self, file_obj, start_date, end_date, fuzzy_threshold=0.6, progress_callback=None):
+    def screen_records(self, df, my_firm, my_model, query_term, limit=SCREEN_LIMIT, progress_callback=None, partial_callback=None):
+        """
+        AI relevance screening of the first `limit` records against my firm/model.
+        Returns them with AI_Analysis and AI_Risk_Level; partial_callback(frame)
+        receives the records screened so far after each one.
+        """
+        target_df = df.head(limit).copy()
+        my_context = f"My Firm: {my_firm}\nMy Model: {my_model}\nSearch Term: {query_term}"
+        analyses, risks = [], []
+        for screened, (_, row) in enumerate(target_df.iterrows(), start=1):
+            record_text = f"Product: {row['Product']}\nFirm: {row['Firm']}\nReason: {row['Reason']}\nModels: {row.get('Model Info', '')}"
+            try:
+                result = self.ai.assess_relevance_json(my_context, record_text)
+                analyses.append(result.get("analysis", "Analysis Failed"))
+                risks.append(result.get("risk", "TBD"))
+            except Exception as e:
+                analyses.append(f"Error: {str(e)}")
+                risks.append("TBD")
+            if progress_callback:
+                progress_callback(screened / len(target_df), f"Screened {screened}/{len(target_df)}: {str(row['Product'])[:40]}")
+            if partial_callback:
+                partial_callback(target_df.head(screened).assign(AI_Analysis=analyses, AI_Risk_Level=risks))
+        target_df["AI_Analysis"] = analyses
+        target_df["AI_Risk_Level"] = risks
+        return target_df
+
+    def run_bulk_scan(
+        self,
+        file_obj,
+        start_date,
+        end_date,
+        fuzzy_threshold=0.6,
+        progress_callback=None,
+        max_workers=BULK_SCAN_WORKERS,
+        scan_mode=AUTO,
+        resume=True,
+        delta=False,
+    ):
         """
         Runs surveillance on a list of products provided in an Excel/CSV file.
         Format: Col A = SKU, Col B = Product Name.
+        max_workers: keyword calls and term searches run at once; output order does not depend on it.
+        scan_mode: 'per_sku' searches each SKU's terms; 'corpus' matches all SKUs against the
+        window's FDA/CPSC recall corpus fetched once; 'auto' picks by catalogue size and window.
+        resume: reuse this upload's checkpoints (finished keywords, searches or results);
+        False discards them and starts over.
+        delta: search each SKU only from its watermark (the end of its last successful delta
+        scan, less an overlap) and report only matches that are new or changed since then.
         """
         try:
-            # Parse File
-            if file_obj.name.endswith('.csv'):
-                df_input = pd.read_csv(file_obj)
-            else:
-                df_input = pd.read_excel(file_obj)
-            
-            # Normalize headers (take first two columns regardless of name)
-            if len(df_input.columns) < 2:
-                return pd.DataFrame(), ["Error: File must have at least 2 columns (SKU, Product Name)."]
-            
-            # Rename for consistency
-            df_input = df_input.iloc[:, :2]
-            df_input.columns = ['SKU', 'Product Name']
-            df_input = df_input.dropna(subset=['Product Name'])
+            # Stream the first two columns (SKU, Product Name) whatever their headers are. Every row is
+            # read before searching starts: the scan mode, checkpoint key and delta state need the full list.
+            rows = []
+            for chunk in iter_chunks(file_obj, columns=[0, 1]):
+                if len(chunk.columns) < 2:
+                    return pd.DataFrame(), ["Error: File must have at least 2 columns (SKU, Product Name)."]
+                chunk = chunk[chunk.iloc[:, 1].notna()]
+                rows.extend(zip(chunk.iloc[:, 0].astype(str), chunk.iloc[:, 1].astype(str)))
+            # The upload's content identifies the scan for checkpoints.
+            digest = upload_digest(file_obj)
         except Exception as e:
             return pd.DataFrame(), [f"Error parsing file: {e}"]
 
-        consolidated_results = []
-        total_items = len(df_input)
-        
-        for idx, row in df_input.iterrows():
-            sku = str(row['SKU'])
-            p_name = str(row['Product Name'])
-            cleaned_name = self._clean_product_name(p_name)
+        total_items = len(rows)
 
-            if progress_callback:
-                progress = (idx + 1) / total_items
-                progress_callback(progress, f"Scanning {idx+1}/{total_items}: {p_name}...")
-
-            search_terms = self._generate_search_terms(cleaned_name)
-            hits_frames = []
-            for term in search_terms:
-                if not term:
-                    continue
-                hits, _ = RegulatoryService.search_all_sources_safe(
-                    query_term=term,
-                    start_date=start_date,
-                    end_date=end_date,
-                    limit=20,
-                )
-                if not hits.empty:
-                    hits = hits.copy()
-                    hits["Search Term"] = term
-                    hits_frames.append(hits)
-
-            if hits_frames:
-                hits = pd.concat(hits_frames, ignore_index=True)
-                hits = RegulatoryService._dedupe(hits)
+        # Checkpoints: the same upload with the same settings resumes where it stopped.
+        store = self.scan_store
+        changes = ScanDelta.load(store, [sku for sku, _ in rows], start_date, end_date) if delta else None
+        scan_id = scan_key(
+            digest,
+            start=start_date,
+            end=end_date,
+            threshold=fuzzy_threshold,
+            mode=scan_mode,
+            # Delta scans only resume while the SKUs' delta state is the one they started from.
+            **({"delta": changes.revision} if changes else {}),
+        )
+        if not resume:
+            store.clear_scan(scan_id)
+        elif (stored := store.load_results(scan_id)) is not None:
+            results_df, log_messages = stored
+            return results_df, [*log_messages, f"Loaded completed scan {scan_id} from checkpoint"]
+        params = {"start": start_date, "end": end_date, "threshold": fuzzy_threshold, "mode": scan_mode, "delta": delta}
+        resumed = store.open_scan(scan_id, getattr(file_obj, "name", "upload"), params, total_items)
+
+        mode, reason = choose_scan_mode(total_items, start_date, end_date, scan_mode)
+        if mode == CORPUS:
+            results_df, log_messages, failed_fetches = self._run_corpus_scan(
+                rows, start_date, end_date, fuzzy_threshold, progress_callback, reason, changes
+            )
+            if failed_fetches:
+                # An incomplete corpus must not advance watermarks or become this scan's stored result.
+                store.set_status(scan_id, FAILED)
+                return results_df, [
+                    *log_messages,
+                    f"Corpus fetch failed for {', '.join(failed_fetches)}; run the scan again to retry",
+                ]
+            if changes:
+                changes.commit(store, [sku for sku, _ in rows])
+            store.save_results(scan_id, results_df, log_messages)
+            return results_df, log_messages
+
+        def report(share_start: float, share: float, label: str, names: list):
+            def on_done(done: int) -> None:
+                if progress_callback:
+                    progress_callback(share_start + share * done / len(names), f"{label} {done}/{len(names)}: {names[done - 1]}")
+            return on_done
+
+        # SKUs and terms run concurrently; per-source caps in RegulatoryService bound the load on each API.
+        # Completed keywords and term searches are checkpointed from this thread as they finish.
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            # 1. KEYWORDS per distinct product name: cached ones first, the rest many names per LLM call
+            done_products = store.load_products(scan_id)
+            products = [done_products.get(pos) for pos in range(total_items)]
+            positions_by_name, names_by_key = {}, {}
+            for pos in range(total_items):
+                if pos not in done_products:
+                    name = self._clean_product_name(rows[pos][1])
+                    positions_by_name.setdefault(name, []).append(pos)
+                    if name:
+                        names_by_key.setdefault(keyword_key(name), []).append(name)
+
+            def assign(keyword_lists: dict) -> None:
+                """
+                Builds and checkpoints the products of every name sharing each key.
+                A key whose keywords failed (None) is left unbuilt, so a resume retries it.
+                """
+                done = {}
+                for key, keywords in keyword_lists.items():
+                    if keywords is None:
+                        continue
+                    for name in dict.fromkeys(names_by_key[key]):
+                        terms = self._keyword_terms(name, keywords)
+                        for pos in positions_by_name[name]:
+                            sku, p_name = rows[pos]
+                            done[pos] = products[pos] = {"sku": sku, "name": p_name, "cleaned": name, "terms": terms}
+                store.save_products(scan_id, done)
+
+            version = self._keyword_version()
+            cached = self.keyword_cache.get_many(names_by_key, version)
+            assign(cached)
+            misses = [key for key in names_by_key if key not in cached]
+            batches = keyword_batches([names_by_key[key][0] for key in misses])
+
+            def save_batch(i: int, keyword_lists: list) -> None:
+                generated_keywords = {keyword_key(name): keywords for name, keywords in zip(batches[i], keyword_lists)}
+                self.keyword_cache.put_many({k: v for k, v in generated_keywords.items() if v is not None}, version)
+                assign(generated_keywords)
+
+            generated = self._run_ordered(
+                pool,
+                [partial(self._batch_keywords, batch) for batch in batches],
+                report(0.0, KEYWORD_PROGRESS_SHARE, "Keyword batches", [f"{len(b)} names from {b[0]}" for b in batches]),
+                on_result=save_batch,
+            )
+            # Names whose keywords failed are searched by their own name this run, but not checkpointed.
+            for pos, product in enumerate(products):
+                if product is None:
+                    sku, p_name = rows[pos]
+                    products[pos] = {"sku": sku, "name": p_name, "cleaned": self._clean_product_name(p_name), "terms": []}
+
+            # 2. SEARCH each distinct term once, scan-wide
+            plan = ScanTermPlan.build([p["terms"] for p in products])
+            hits_by_key = {k: v for k, v in store.load_term_hits(scan_id).items() if k in plan.terms}
+            keys = [key for key in plan.terms if key not in hits_by_key]
+            term_start = dict.fromkeys(keys, start_date)
+            if changes:
+                # A shared term is searched from the earliest watermark among the SKUs that need it.
+                skus_by_key = {}
+                for pos, term_keys in enumerate(plan.keys_by_product):
+                    for key in term_keys:
+                        skus_by_key.setdefault(key, []).append(products[pos]["sku"])
+                term_start = {key: changes.window_start(skus_by_key[key]) for key in keys}
+            searched = self._run_ordered(
+                pool,
+                [partial(self._search_term, plan.terms[key], term_start[key], end_date) for key in keys],
+                report(KEYWORD_PROGRESS_SHARE, 1.0 - KEYWORD_PROGRESS_SHARE, "Searched", [plan.terms[k] for k in keys]),
+                on_result=lambda i, hits: store.save_term_hits(scan_id, keys[i], plan.terms[keys[i]], hits),
+            )
+        hits_by_key.update(zip(keys, searched))
+        log_messages = [
+            f"Per-SKU search ({reason})",
+            (
+                f"Keyword cache: {len(cached)}/{len(names_by_key)} product names cached "
+                f"({len(cached) / len(names_by_key) if names_by_key else 1.0:.0%} hit rate), "
+                f"{len(misses)} generated in {len(batches)} batch LLM calls"
+            ),
+            plan.summary(),
+        ]
+        if resumed:
+            log_messages.append(
+                f"Resumed scan {scan_id}: {len(done_products)} SKUs and {len(plan.terms) - len(keys)} terms from checkpoint"
+            )
+        if changes:
+            narrowed = sum(start != start_date for start in term_start.values())
+            log_messages.append(f"Delta window: {narrowed}/{len(keys)} term searches started from SKU watermarks")
+        # Failed keyword calls and searches are not checkpointed; the scan stays open so a rerun retries them.
+        failed_keywords = sum(
+            len(batch) if keyword_lists is None else sum(keywords is None for keywords in keyword_lists)
+            for batch, keyword_lists in zip(batches, generated)
+        )
+        failed_searches = sum(hits is None for hits in searched)
+        failed = failed_keywords + failed_searches
+        if failed:
+            log_messages.append(
+                f"Keywords failed for {failed_keywords} product names and {failed_searches} searches failed; "
+                "run the scan again to retry them"
+            )
+
+        def finish(results_df: pd.DataFrame, log_messages: list):
+            if failed:
+                store.set_status(scan_id, FAILED)
             else:
-                hits = pd.DataFrame()
-            
-            if not hits.empty:
-                # 2. FUZZY MATCH FILTERING
-                for h_idx, hit in hits.iterrows():
-                    hit_product = str(hit.get('Product', '')).lower()
-                    target_product = cleaned_name.lower()
-                    term_matches = any(term.lower() in hit_product for term in search_terms if term)
-                    
-                    # Calculate similarity ratio
-                    score = self._fuzzy_score(target_product, hit_product)
-                    
-                    # If score is good OR the product name is explicitly in the hit text
-                    if score >= fuzzy_threshold or target_product in hit_product or term_matches:
-                        # Append to results
-                        consolidated_results.append({
-                            "My SKU": sku,
-                            "My Product": p_name,
-                            "Match Score": f"{score:.2f}",
-                            "Source": hit['Source'],
-                            "Date": hit['Date'],
-                            "Found Product": hit['Product'],
-                            "Reason": hit['Reason'],
-                            "Risk Level": "High" if score > 0.8 else "Medium",
-                            "Link": hit['Link']
-                        })
+                # Watermarks advance only with a complete scan, so a failed term is searched again next time.
+                if changes:
+                    changes.commit(store, [p["sku"] for p in products])
+                store.save_results(scan_id, results_df, log_messages)
+            return results_df, log_messages
+
+        # 3. FAN OUT the shared hits to every SKU that asked for the term
+        hit_frames = []
+        for pos in range(total_items):
+            frames = plan.hits_for(pos, hits_by_key)
+            if frames:
+                hits = RegulatoryService._dedupe(pd.concat(frames, ignore_index=True))
+                hits["_product_pos"] = pos
+                hit_frames.append(hits)
+
+        if not hit_frames:
+            return finish(pd.DataFrame(), ["No results found.", *log_messages])
+
+        # 4. FUZZY MATCH FILTERING (all products x all hits, batched)
+        hits = pd.concat(hit_frames, ignore_index=True)
+        matches = self._match_products_to_hits(products, hits, fuzzy_threshold)
+        return finish(*self._consolidate(products, hits, matches, log_messages, changes))
+
+    def _run_corpus_scan(
+        self, rows: list, start_date, end_date, fuzzy_threshold: float, progress_callback, reason: str, changes=None
+    ):
+        """
+        Matches every SKU against the window's whole recall corpus; no keyword generation or per-SKU searches.
+        Returns (results, log, sources whose corpus fetch failed).
+        """
+        if changes:
+            # One corpus serves every SKU, so it starts at the earliest SKU watermark.
+            start_date = changes.window_start([sku for sku, _ in rows])
+        if progress_callback:
+            progress_callback(0.0, "Loading recall corpus for the date window...")
+        corpus = load_corpus(start_date, end_date)
+        failed = failed_sources(corpus)
+        log_messages = [f"Corpus-first scan ({reason}): {len(corpus)} recall records from {start_date}"]
+        if corpus.empty:
+            return pd.DataFrame(), ["No results found.", *log_messages], failed
+        if progress_callback:
+            progress_callback(0.5, f"Matching {len(rows)} SKUs against {len(corpus)} records...")
+        products = [
+            {"sku": sku, "name": p_name, "cleaned": self._clean_product_name(p_name), "terms": []}
+            for sku, p_name in rows
+        ]
+        matches = self._match_products_to_hits(products, corpus, fuzzy_threshold)
+        if progress_callback:
+            progress_callback(1.0, "Matching complete")
+        return (*self._consolidate(products, corpus, matches, log_messages, changes), failed)
+
+    @staticmethod
+    def _consolidate(products: list, hits: pd.DataFrame, matches: pd.DataFrame, log_messages: list, changes=None):
+        consolidated_results = []
+        for pos, hit_row, score in matches.itertuples(index=False):
+            product = products[pos]
+            hit = hits.iloc[hit_row]
+            consolidated_results.append({
+                "My SKU": product["sku"],
+                "My Product": product["name"],
+                "Match Score": f"{score:.2f}",
+                "Source": hit['Source'],
+                "Date": hit['Date'],
+                "Found Product": hit['Product'],
+                "Reason": hit['Reason'],
+                "Risk Level": "High" if score > 0.8 else "Medium",
+                "Link": hit['Link']
+            })
 
         results_df = pd.DataFrame(consolidated_results)
+        if changes:
+            # Only matches whose record is new to the SKU, or has changed since it was reported.
+            results_df = changes.filter(results_df, hits.iloc[matches["hit_row"]])
+            log_messages = [*log_messages, changes.summary()]
         if results_df.empty:
-            return results_df, ["No results found."]
-        return results_df, ["Success"]
+            return results_df, ["No results found.", *log_messages]
+        return results_df, ["Success", *log_messages]
+
+    @staticmethod
+    def _run_ordered(pool: ThreadPoolExecutor, tasks: list, on_done=None, on_result=None) -> list:
+        """
+        Runs the zero-argument tasks on the pool and returns their results in
+        task order (None for a task that raised). Both callbacks run on this
+        thread: on_result(i, result) as each task succeeds, and on_done(n) each
+        time the first n tasks are all finished, so progress is ordered.
+        """
+        futures = {pool.submit(task): i for i, task in enumerate(tasks)}
+        results = [None] * len(tasks)
+        finished = [False] * len(tasks)
+        reported = 0
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+                if on_result:
+                    on_result(i, results[i])
+            except Exception as e:
+                print(f"Bulk Scan Error: {e}")
+            finished[i] = True
+            while reported < len(tasks) and finished[reported]:
+                reported += 1
+                if on_done:
+                    on_done(reported)
+        return results
+
+    @staticmethod
+    def _search_term(term: str, start_date, end_date) -> pd.DataFrame:
+        """Raises when any source failed: partial hits must not be checkpointed as the term's result."""
+        hits, _ = RegulatoryService.search_all_sources_safe(
+            query_term=term,
+            start_date=start_date,
+            end_date=end_date,
+            limit=20,
+        )
+        failed = failed_sources(hits)
+        if failed:
+            raise RuntimeError(f"{', '.join(failed)} failed for '{term}'")
+        if hits.empty:
+            return hits
+        hits = hits.copy()
+        hits["Search Term"] = term
+        return hits
 
-    def _fuzzy_score(self, s1, s2):
-        """Calculates fuzzy similarity ratio between two strings."""
-        if not s1 or not s2: return 0.0
-        return difflib.SequenceMatcher(None, s1, s2).ratio()
+    def _match_products_to_hits(self, products: list, hits: pd.DataFrame, fuzzy_threshold: float) -> pd.DataFrame:
+        """
+        Returns (product position, hit row, score) for every match, in product then hit order.
+        A product keeps its own hits that clear the threshold or contain its name or a search
+        term, plus any hit found for another product that clears the threshold against it.
+        Hits without `_product_pos` (a corpus) belong to no product; there a hit is kept for
+        every product whose name it contains. A near-identical model number shared with a hit
+        raises that match's score to the model score but never makes a match on its own.
+        """
+        targets = [p["cleaned"].lower() for p in products]
+        hit_products = hits["Product"].fillna("").astype(str).str.lower()
+        codes, uniques = pd.factorize(hit_products)
+        if "_product_pos" in hits.columns:
+            own = self._own_matches(products, targets, hits["_product_pos"].to_numpy(), hit_products, fuzzy_threshold)
+        else:
+            own = self._name_matches(targets, codes, uniques)
+
+        # Exhaustive for typical scans; TF-IDF top-k blocking once the catalogue x hits grid gets large.
+        pairs = candidate_pairs(targets, list(uniques), threshold=fuzzy_threshold)
+        cross = pairs.merge(
+            pd.DataFrame({"choice_index": codes, "hit_row": np.arange(len(hits))}), on="choice_index"
+        ).rename(columns={"query_index": "product_pos"})[["product_pos", "hit_row", "score"]]
+
+        matches = pd.concat([own, cross], ignore_index=True).drop_duplicates(["product_pos", "hit_row"])
+        models = ModelNumberIndex.from_hits(hits).candidates([p["name"] for p in products])
+        if not models.empty:
+            models = models.rename(columns={"query_index": "product_pos", "hit_index": "hit_row", "score": "model_score"})
+            matches = matches.merge(models[["product_pos", "hit_row", "model_score"]], on=["product_pos", "hit_row"], how="left")
+            matches["score"] = np.fmax(matches["score"], matches.pop("model_score"))
+        # The same record found under several products' searches is reported once per product.
+        record_key = hits["Source"].astype(str) + "|" + hits["Link"].astype(str) + "|" + hits["Product"].astype(str)
+        matches["_record"] = record_key.to_numpy()[matches["hit_row"].to_numpy()]
+        matches = matches.sort_values(["product_pos", "hit_row"], kind="stable").drop_duplicates(["product_pos", "_record"])
+        return matches.drop(columns="_record").reset_index(drop=True)
+
+    @staticmethod
+    def _own_matches(products: list, targets: list, own_pos: np.ndarray, hit_products: pd.Series, fuzzy_threshold: float) -> pd.DataFrame:
+        own_scores = score_pairs([targets[p] for p in own_pos], hit_products.tolist())
+        text_match = np.fromiter(
+            (
+                targets[p] in text or any(term.lower() in text for term in products[p]["terms"] if term)
+                for p, text in zip(own_pos, hit_products)
+            ),
+            dtype=bool,
+            count=len(hit_products),
+        )
+        keep = (own_scores >= fuzzy_threshold) | text_match
+        return pd.DataFrame({"product_pos": own_pos[keep], "hit_row": np.flatnonzero(keep), "score": own_scores[keep]})
+
+    @staticmethod
+    def _name_matches(targets: list, codes: np.ndarray, uniques: pd.Index) -> pd.DataFrame:
+        """(product, hit row, score) wherever a hit's product text contains the product name."""
+        texts = pd.Series(uniques, dtype=object)
+        pos_parts, unique_parts = [], []
+        for pos, target in enumerate(targets):
+            if not target:
+                continue
+            found = np.flatnonzero(texts.str.contains(target, regex=False).to_numpy())
+            pos_parts.append(np.full(found.size, pos, dtype=np.int64))
+            unique_parts.append(found)
+        if not pos_parts:
+            return pd.DataFrame({"product_pos": [], "hit_row": [], "score": []}).astype({"product_pos": "int64", "hit_row": "int64"})
+        contained = pd.DataFrame({"product_pos": np.concatenate(pos_parts), "choice_index": np.concatenate(unique_parts)})
+        rows = pd.DataFrame({"choice_index": codes, "hit_row": np.arange(len(codes))})
+        contained = contained.merge(rows, on="choice_index")
+        contained["score"] = score_pairs(
+            [targets[p] for p in contained["product_pos"]], [uniques[c] for c in contained["choice_index"]]
+        )
+        return contained[["product_pos", "hit_row", "score"]]
 
     def _clean_product_name(self, product_name: str) -> str:
-        if not product_name:
-            return ""
-        cleaned = re.sub(r"\bvive\b", "", product_name, flags=re.IGNORECASE)
-        cleaned = re.sub(r"\s+", " ", cleaned).strip()
-        return cleaned
+        return clean_product_name(product_name)
 
     def _generate_search_terms(self, product_name: str) -> list:
         base_name = self._clean_product_name(product_name)
         if not base_name:
             return []
 
+        version = self._keyword_version()
+        key = keyword_key(base_name)
+        keywords = self.keyword_cache.get_many([key], version).get(key)
+        if keywords is None:
+            keywords = self._llm_keywords(base_name)
+            if keywords is not None:
+                self.keyword_cache.put_many({key: keywords}, version)
+        return self._keyword_terms(base_name, keywords or [])
+
+    def _keyword_version(self) -> str:
+        """Cache version for the model that generates keywords (the multi-provider service uses its default)."""
+        ai = self.ai._base() if hasattr(self.ai, "_base") else self.ai
+        return keyword_version(getattr(ai, "fast_model", None))
+
+    def _llm_keywords(self, base_name: str):
+        """The LLM's keywords for one cleaned name; None when the call fails or returns none."""
         prompt = (
-            "Extract 3-6 short, generic product keywords for regulatory recall searching. "
-            "Exclude brand names and vendors. Ignore the word 'Vive' entirely. "
+            f"{KEYWORD_INSTRUCTIONS} "
             "Return a comma-separated list only.\n\n"
             f"Product name: {base_name}"
         )
         keywords_text = ""
         try:
-            keywords_text = self.ai._generate_text(prompt)
+            with source_slot("AI Keywords"):
+                keywords_text = self.ai._generate_text(prompt)
         except Exception:
             keywords_text = ""
 
-        keywords = []
         if keywords_text and "Error:" not in keywords_text:
-            keywords = [k.strip() for k in keywords_text.split(",") if k.strip()]
+            return [k.strip() for k in keywords_text.split(",") if k.strip()] or None
+        return None
 
+    def _batch_keywords(self, names: list) -> list:
+        """
+        The LLM's keywords for each cleaned name from one JSON call. Names the
+        reply leaves out or garbles fall back to their own _llm_keywords call;
+        None marks a name whose keywords could not be generated.
+        """
+        if len(names) == 1:
+            return [self._llm_keywords(names[0])]
+        reply = {}
+        try:
+            with source_slot("AI Keywords"):
+                reply = self.ai._generate_json(batch_prompt(names), system_instruction=KEYWORD_SYSTEM)
+        except Exception as e:
+            print(f"Keyword Batch Error: {e}")
+        parsed = parse_batch_reply(reply, len(names))
+        return [parsed[i] if i in parsed else self._llm_keywords(name) for i, name in enumerate(names)]
+
+    def _keyword_terms(self, base_name: str, keywords: list) -> list:
+        """The product's own name first, then its cleaned LLM keywords, case-insensitively deduplicated."""
         keywords = [self._clean_product_name(k) for k in keywords if k]
         keywords = [k for k in keywords if k]
         if base_name not in keywords:
@@ -285,3 +660,30 @@ class RecallResponseAgent:
     def _log(self, log_list, message):
         timestamp = datetime.now().strftime("%H:%M:%S")
         log_list.append(f"[{timestamp}] {message}")
+
+
+# Background job entry points (see job_runner.JobRunner.submit): each runs one
+# workflow and reports progress through the job context.
+
+def bulk_scan_job(context: JobContext, agent: RecallResponseAgent, upload, **scan_kwargs) -> JobResult:
+    results, log_messages = agent.run_bulk_scan(upload, progress_callback=context.progress, **scan_kwargs)
+    return JobResult(results, log_messages)
+
+
+def mission_job(context: JobContext, agent: RecallResponseAgent, search_term, my_firm, my_model, lookback_days=365) -> JobResult:
+    mission_log, artifacts = agent.run_mission(search_term, my_firm, my_model, lookback_days, progress_callback=context.progress)
+    packages = [{**artifact, "source_record": artifact["source_record"].to_dict()} for artifact in artifacts]
+    return JobResult(log=mission_log, payload=packages)
+
+
+def screening_job(context: JobContext, agent: RecallResponseAgent, df: pd.DataFrame, my_firm, my_model, query_term) -> JobResult:
+    screened = agent.screen_records(
+        df, my_firm, my_model, query_term, progress_callback=context.progress, partial_callback=context.partial
+    )
+    return JobResult(screened, [f"Screened {len(screened)} of {len(df)} records"])
+
+
+def product_codes_job(context: JobContext) -> JobResult:
+    context.progress(0.0, "Downloading FDA device classification...")
+    count = refresh_product_codes()
+    return JobResult(log=[f"Stored {count} FDA product codes"])
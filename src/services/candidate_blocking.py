@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+"""Character n-gram TF-IDF blocking: top-k candidate choices per query before fuzzy scoring."""
+
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import utils
+
+from src.services.match_engine import DEFAULT_SCORER, PAIR_COLUMNS, match_pairs, score_pairs
+
+NGRAM = 3
+TOP_K = 25
+# N-grams in more than this share of the choices (and more than MIN_DF_CAP of
+# them) are left out of candidate generation; they still count in the vector
+# norms. They carry little IDF weight but dominate the postings a query touches.
+MAX_DF = 0.02
+MIN_DF_CAP = 500
+# Below this many query x choice pairs exhaustive cdist is cheap enough (~1.5 s on one core) to keep.
+BLOCKING_MIN_PAIRS = 50_000_000
+
+CANDIDATE_COLUMNS = ["query_index", "choice_index", "similarity"]
+
+
+def _prepare(texts: Sequence[str], processor: Optional[Callable]) -> List[str]:
+    texts = ["" if t is None else str(t) for t in texts]
+    return [processor(t) for t in texts] if processor is not None else texts
+
+
+def ngram_keys(texts: Sequence[str], n: int = NGRAM) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (text index, n-gram key) for every character n-gram of every space-padded
+    text, so word starts and ends get their own grams. Each gram is packed into
+    one uint64 from its code points (21 bits each), which keeps vocabulary
+    building and lookup in NumPy instead of per-gram Python objects.
+    """
+    if n > 3:
+        raise ValueError("n-grams longer than 3 characters do not fit a 64-bit key")
+    padded = [f" {t} " if t else "" for t in texts]
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+    grams_per_text = np.maximum(lengths - n + 1, 0)
+    total = int(grams_per_text.sum())
+    if not total:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint64)
+    codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    text_starts = np.cumsum(lengths) - lengths
+    gram_offsets = np.cumsum(grams_per_text) - grams_per_text
+    starts = np.repeat(text_starts - gram_offsets, grams_per_text) + np.arange(total)
+    keys = np.zeros(total, dtype=np.uint64)
+    for i in range(n):
+        keys = (keys << np.uint64(21)) | codes[starts + i]
+    return np.repeat(np.arange(len(padded), dtype=np.int64), grams_per_text), keys
+
+
+def _empty(columns: Sequence[str]) -> pd.DataFrame:
+    return pd.DataFrame({c: pd.Series(dtype=t) for c, t in zip(columns, ("int64", "int64", "float64"))})
+
+
+class TfidfBlocker:
+    """
+    Sparse, L2-normalized TF-IDF vectors of the choices' character n-grams,
+    stored column-major (CSC) as flat NumPy arrays. A query's cosine with
+    the choices is accumulated from the postings of its own n-grams only.
+    """
+
+    def __init__(
+        self,
+        choices: Sequence[str],
+        n: int = NGRAM,
+        processor: Optional[Callable] = utils.default_process,
+        max_df: float = MAX_DF,
+    ):
+        self.n = n
+        self.processor = processor
+        self.size = len(choices)
+        rows, keys = ngram_keys(_prepare(choices, processor), n)
+        self._vocab, cols = np.unique(keys, return_inverse=True)
+        # One entry per (choice, gram) with its term count, ordered by gram then choice.
+        cells, counts = np.unique(cols.astype(np.int64) * max(self.size, 1) + rows, return_counts=True)
+        cols, rows = np.divmod(cells, max(self.size, 1))
+
+        doc_freq = np.bincount(cols, minlength=len(self._vocab))
+        # Smoothed IDF; a gram the choices never use gets the weight of df = 0.
+        self._idf = np.log((1 + self.size) / (1 + doc_freq)) + 1.0
+        self._unseen_idf = float(np.log(1 + self.size) + 1.0)
+        weights = counts * self._idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights ** 2, minlength=self.size))
+        norms[norms == 0] = 1.0
+        self._rows = rows
+        self._weights = weights / norms[rows]
+        self._indptr = np.concatenate([[0], np.cumsum(doc_freq)]).astype(np.int64)
+        self._blocking = doc_freq <= max(MIN_DF_CAP, max_df * self.size)
+
+    def _query_vectors(self, queries: Sequence[str]) -> List[tuple[np.ndarray, np.ndarray]]:
+        """Per query: (vocabulary columns, weights) of its known grams, normalized over all its grams."""
+        rows, keys = ngram_keys(_prepare(queries, self.processor), self.n)
+        cells, counts = np.unique(np.stack([rows, keys.astype(np.int64)]), axis=1, return_counts=True)
+        rows, keys = cells[0], cells[1].astype(np.uint64)
+        cols = np.minimum(np.searchsorted(self._vocab, keys), max(len(self._vocab) - 1, 0))
+        known = self._vocab[cols] == keys if len(self._vocab) else np.zeros(len(keys), dtype=bool)
+        weights = counts * np.where(known, self._idf[cols] if len(self._vocab) else 0.0, self._unseen_idf)
+        norms = np.sqrt(np.bincount(rows, weights ** 2, minlength=len(queries)))
+        norms[norms == 0] = 1.0
+        weights = weights / norms[rows]
+        bounds = np.searchsorted(rows, np.arange(len(queries) + 1))
+        vectors = []
+        for q in range(len(queries)):
+            span = slice(bounds[q], bounds[q + 1])
+            mask = known[span]
+            vectors.append((cols[span][mask], weights[span][mask]))
+        return vectors
+
+    def top_k(self, queries: Sequence[str], k: int = TOP_K, min_similarity: float = 0.0) -> pd.DataFrame:
+        """Up to k choices per query by cosine similarity, as (query_index, choice_index, similarity), best first."""
+        if not self.size or not len(queries) or k <= 0:
+            return _empty(CANDIDATE_COLUMNS)
+        out_q, out_c, out_s = [], [], []
+        for query_index, (cols, weights) in enumerate(self._query_vectors(queries)):
+            rare = self._blocking[cols]
+            cols, weights = cols[rare], weights[rare]
+            if not cols.size:
+                continue
+            starts, ends = self._indptr[cols], self._indptr[cols + 1]
+            postings = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])
+            # Sparse accumulate over the touched rows only, not a dense pass over every choice.
+            found, slot = np.unique(self._rows[postings], return_inverse=True)
+            scores = np.bincount(slot, self._weights[postings] * np.repeat(weights, ends - starts))
+            keep = scores > min_similarity
+            found, scores = found[keep], scores[keep]
+            if found.size > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                found, scores = found[top], scores[top]
+            order = np.lexsort((found, -scores))
+            out_q.append(np.full(found.size, query_index, dtype=np.int64))
+            out_c.append(found[order])
+            out_s.append(scores[order])
+        if not out_q:
+            return _empty(CANDIDATE_COLUMNS)
+        return pd.DataFrame(
+            {"query_index": np.concatenate(out_q), "choice_index": np.concatenate(out_c), "similarity": np.concatenate(out_s)}
+        )
+
+
+def blocked_match_pairs(
+    queries: Sequence[str],
+    choices: Sequence[str],
+    threshold: float = 0.6,
+    k: int = TOP_K,
+    scorer: str | Callable = DEFAULT_SCORER,
+    processor: Optional[Callable] = utils.default_process,
+) -> pd.DataFrame:
+    """Same output as match_pairs, but only each query's top-k TF-IDF candidates are fuzzy-scored."""
+    if not len(queries) or not len(choices):
+        return _empty(PAIR_COLUMNS)
+    candidates = TfidfBlocker(choices, processor=processor).top_k(queries, k=k)
+    if candidates.empty:
+        return _empty(PAIR_COLUMNS)
+    q = candidates["query_index"].to_numpy()
+    c = candidates["choice_index"].to_numpy()
+    scores = score_pairs([queries[i] for i in q], [choices[j] for j in c], scorer=scorer, processor=processor)
+    # Integer percent cutoff, as match_pairs applies it.
+    keep = scores * 100 >= np.ceil(threshold * 100)
+    return (
+        pd.DataFrame({"query_index": q[keep], "choice_index": c[keep], "score": scores[keep]})
+        .sort_values(["query_index", "choice_index"])
+        .reset_index(drop=True)
+    )
+
+
+def candidate_pairs(
+    queries: Sequence[str],
+    choices: Sequence[str],
+    threshold: float = 0.6,
+    k: int = TOP_K,
+    min_pairs: int = BLOCKING_MIN_PAIRS,
+) -> pd.DataFrame:
+    """Exhaustive match_pairs for small inputs, TF-IDF blocking once queries x choices exceeds min_pairs."""
+    if len(queries) * len(choices) <= min_pairs:
+        return match_pairs(queries, choices, threshold=threshold)
+    return blocked_match_pairs(queries, choices, threshold=threshold, k=k)
+
+
+def blocking_recall(queries: Sequence[str], choices: Sequence[str], threshold: float = 0.6, k: int = TOP_K) -> dict:
+    """Share of the exhaustive matches above `threshold` that blocking with top-k keeps."""
+    exhaustive = match_pairs(queries, choices, threshold=threshold)
+    blocked = blocked_match_pairs(queries, choices, threshold=threshold, k=k)
+    kept = exhaustive.merge(blocked[["query_index", "choice_index"]], on=["query_index", "choice_index"])
+    return {
+        "exhaustive_pairs": len(exhaustive),
+        "blocked_pairs": len(blocked),
+        "recall": len(kept) / len(exhaustive) if len(exhaustive) else 1.0,
+    }
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+"""Per-source concurrency caps shared by every thread that queries an external source."""
+
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Concurrent requests allowed per source across the whole process. openFDA
+# allows 240 requests/minute without a key; CSE and news feeds are stricter.
+SOURCE_CONCURRENCY: Dict[str, int] = {
+    "FDA Device Recalls": 4,
+    "FDA Enforcement": 4,
+    "FDA MAUDE": 2,
+    "CPSC Recalls": 2,
+    "Sanctions & Watchlists": 2,
+    "OFAC Sanctions": 1,
+    "Regulatory Web": 2,
+    "Global Health Agencies": 2,
+    "Media Signals": 2,
+    "AI Keywords": 4,
+}
+DEFAULT_CONCURRENCY = 2
+
+_lock = threading.Lock()
+_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+
+def set_source_limit(source: str, limit: int) -> None:
+    """Changes a source's cap; takes effect for slots acquired afterwards."""
+    with _lock:
+        SOURCE_CONCURRENCY[source] = max(1, int(limit))
+        _semaphores.pop(source, None)
+
+
+def _semaphore(source: str) -> threading.BoundedSemaphore:
+    with _lock:
+        if source not in _semaphores:
+            _semaphores[source] = threading.BoundedSemaphore(SOURCE_CONCURRENCY.get(source, DEFAULT_CONCURRENCY))
+        return _semaphores[source]
+
+
+@contextmanager
+def source_slot(source: str) -> Iterator[None]:
+    """Blocks until `source` has a free slot, and holds it for the duration of the block."""
+    semaphore = _semaphore(source)
+    with semaphore:
+        yield
+
+
+def limited(source: str, fn: Callable[..., T]) -> Callable[..., T]:
+    """`fn` wrapped so every call holds a slot of `source`."""
+    def call(*args, **kwargs) -> T:
+        with source_slot(source):
+            return fn(*args, **kwargs)
+    return call
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+"""Column-wise date parsing driven by each source's native date format."""
+
+import logging
+from datetime import date, datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Sequence
+
+import pandas as pd
+
+from src.search.health_agency_feeds import FEEDS
+
+logger = logging.getLogger(__name__)
+
+YYYYMMDD = "yyyymmdd"
+ISO8601 = "iso8601"
+RFC822 = "rfc822"
+MIXED = "mixed"
+
+# Source label prefix -> native date format.
+SOURCE_DATE_FORMATS: Dict[str, str] = {
+    "FDA Device Recall": YYYYMMDD,
+    "FDA Enforcement": YYYYMMDD,
+    "FDA MAUDE": YYYYMMDD,
+    "CPSC": ISO8601,
+    "Media": RFC822,
+    **{feed.name: feed.date_format for feed in FEEDS},
+}
+
+# Sources whose fetchers cannot filter by date; the window is applied after the fetch.
+POST_FETCH_WINDOW_SOURCES = ("Media", *(feed.name for feed in FEEDS))
+
+MISSING_MARKERS = ["", "N/A", "n/a", "NA", "None", "Unknown"]
+
+
+def _parse_format(values: pd.Series, fmt: str) -> pd.Series:
+    if fmt == YYYYMMDD:
+        return pd.to_datetime(values, format="%Y%m%d", errors="coerce")
+    if fmt == ISO8601:
+        return pd.to_datetime(values, format="ISO8601", errors="coerce", utc=True).dt.tz_localize(None)
+    if fmt == RFC822:
+        cleaned = values.str.replace(r"^[A-Za-z]{3},\s*", "", regex=True)
+        cleaned = cleaned.str.replace(r"\s+(GMT|UTC|UT|Z)$", " +0000", regex=True)
+        return pd.to_datetime(cleaned, format="%d %b %Y %H:%M:%S %z", errors="coerce", utc=True).dt.tz_localize(None)
+    return pd.to_datetime(values, format="mixed", errors="coerce", utc=True).dt.tz_localize(None)
+
+
+def _source_formats(sources: pd.Series) -> pd.Series:
+    formats = pd.Series(MIXED, index=sources.index, dtype=object)
+    for prefix, fmt in SOURCE_DATE_FORMATS.items():
+        formats[sources.str.startswith(prefix)] = fmt
+    return formats
+
+
+def normalize_dates(df: pd.DataFrame, date_col: str = "Date", source_col: str = "Source") -> pd.DataFrame:
+    """
+    Parses `date_col` to datetime64 in place, one vectorized pass per source
+    format. Values that fail their native format get one `mixed` retry; any
+    still unparsed are logged and counted in df.attrs["date_parse_failures"].
+    """
+    if date_col not in df.columns:
+        df[date_col] = pd.NaT
+        return df
+    if pd.api.types.is_datetime64_any_dtype(df[date_col]):
+        return df
+
+    raw = df[date_col].astype("string").str.strip()
+    missing = raw.isna() | raw.isin(MISSING_MARKERS)
+    sources = df[source_col].astype("string").fillna("") if source_col in df.columns else pd.Series("", index=df.index, dtype="string")
+    formats = _source_formats(sources)
+
+    parsed = pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+    for fmt in formats[~missing].unique():
+        mask = (formats == fmt) & ~missing
+        parsed[mask] = _parse_format(raw[mask], fmt)
+
+    retry = parsed.isna() & ~missing
+    if retry.any():
+        parsed[retry] = _parse_format(raw[retry], MIXED)
+
+    failed = parsed.isna() & ~missing
+    failures: Dict[str, int] = {}
+    if failed.any():
+        failures = {str(k): int(v) for k, v in sources[failed].value_counts().items()}
+        logger.warning("Unparseable dates by source: %s (e.g. %r)", failures, raw[failed].iloc[0])
+    df.attrs["date_parse_failures"] = failures
+    df[date_col] = parsed
+    return df
+
+
+def apply_date_window(
+    df: pd.DataFrame,
+    start: date,
+    end: date,
+    sources: Sequence[str] = POST_FETCH_WINDOW_SOURCES,
+    date_col: str = "Date",
+    source_col: str = "Source",
+) -> pd.DataFrame:
+    """Drops dated rows from `sources` that fall outside [start, end]. Undated rows are kept."""
+    if df.empty or source_col not in df.columns:
+        return df
+    source = df[source_col].astype("string").fillna("")
+    in_scope = pd.Series(False, index=df.index)
+    for prefix in sources:
+        in_scope |= source.str.startswith(prefix)
+    dates = df[date_col]
+    outside = dates.notna() & ((dates < pd.Timestamp(start)) | (dates >= pd.Timestamp(end) + pd.Timedelta(days=1)))
+    return df.loc[~(in_scope & outside).to_numpy()]
+
+
+def coerce_date(value: Any) -> Optional[str]:
+    """Single-value ISO date for per-record code paths; bulk paths use normalize_dates."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (int, float)):
+        try:
+            return datetime.fromtimestamp(value).date().isoformat()
+        except (OverflowError, OSError, ValueError):
+            return None
+    txt = str(value).strip()
+    if len(txt) == 8 and txt.isdigit():
+        try:
+            return datetime.strptime(txt, "%Y%m%d").date().isoformat()
+        except ValueError:
+            return None
+    try:
+        return datetime.fromisoformat(txt.replace("Z", "+00:00")).date().isoformat()
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(txt).date().isoformat()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return (datetime.strptime(txt, "%d %b %Y")).date().isoformat()
+    except ValueError:
+        return None
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+"""
+Streaming reads of uploaded CSV/XLSX files: fixed-size row chunks, only the
+requested columns, so memory is bounded by the chunk rather than the file.
+"""
+
+import hashlib
+from contextlib import closing
+from typing import Iterator, List, Optional, Sequence, Union
+
+import pandas as pd
+
+CHUNK_ROWS = 50_000
+READ_BLOCK = 1 << 20
+
+Columns = Optional[Sequence[Union[str, int]]]
+
+
+def upload_name(file_obj) -> str:
+    return str(getattr(file_obj, "name", "")).lower()
+
+
+def is_xlsx(file_obj) -> bool:
+    return upload_name(file_obj).endswith((".xlsx", ".xlsm"))
+
+
+def upload_digest(file_obj) -> str:
+    """sha256 of the upload, read in blocks; the file is rewound afterwards."""
+    digest = hashlib.sha256()
+    file_obj.seek(0)
+    while True:
+        block = file_obj.read(READ_BLOCK)
+        if not block:
+            break
+        digest.update(block.encode("utf-8") if isinstance(block, str) else block)
+    file_obj.seek(0)
+    return digest.hexdigest()
+
+
+def _project(header: Sequence, columns: Columns) -> tuple[List[int], List[str]]:
+    """
+    Positions and output names of the wanted columns. Names match the header
+    after stripping, case-insensitively, and come back spelled as requested;
+    positions keep the header's own (stripped) name.
+    """
+    names = [str(c).strip() for c in header]
+    if columns is None:
+        return list(range(len(names))), names
+    folded = {name.casefold(): i for i, name in reversed(list(enumerate(names)))}
+    positions, out = [], []
+    for column in columns:
+        if isinstance(column, int):
+            if column < len(names):
+                positions.append(column)
+                out.append(names[column])
+        elif column.strip().casefold() in folded:
+            positions.append(folded[column.strip().casefold()])
+            out.append(column)
+    return positions, out
+
+
+def _csv_chunks(file_obj, columns: Columns, chunk_rows: int, header_row: int) -> Iterator[pd.DataFrame]:
+    file_obj.seek(0)
+    header = pd.read_csv(file_obj, skiprows=header_row, nrows=0).columns
+    positions, names = _project(header, columns)
+    if not positions:
+        return
+    # usecols returns columns in file order; put them back in the requested order.
+    order = sorted(set(positions))
+    take = [order.index(p) for p in positions]
+    file_obj.seek(0)
+    # Closed explicitly: a reader left to the garbage collector closes the caller's file too.
+    with pd.read_csv(file_obj, skiprows=header_row, usecols=order, dtype=str, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield chunk.iloc[:, take].set_axis(names, axis=1)
+
+
+def _xlsx_rows(file_obj, min_row: int = 1) -> Iterator[tuple]:
+    """Cell values of the first sheet, row by row, from a read-only workbook."""
+    from openpyxl import load_workbook
+
+    file_obj.seek(0)
+    workbook = load_workbook(file_obj, read_only=True, data_only=True)
+    try:
+        yield from workbook.worksheets[0].iter_rows(min_row=min_row, values_only=True)
+    finally:
+        workbook.close()
+
+
+def _xlsx_chunks(file_obj, columns: Columns, chunk_rows: int, header_row: int) -> Iterator[pd.DataFrame]:
+    with closing(_xlsx_rows(file_obj, min_row=header_row + 1)) as rows:
+        header = next(rows, None)
+        if header is None:
+            return
+        positions, names = _project([("" if c is None else c) for c in header], columns)
+        if not positions:
+            return
+        buffer, emitted = [], False
+        for row in rows:
+            buffer.append([None if p >= len(row) or row[p] is None else str(row[p]) for p in positions])
+            if len(buffer) >= chunk_rows:
+                yield pd.DataFrame(buffer, columns=names, dtype=object)
+                buffer, emitted = [], True
+        if buffer or not emitted:
+            # A header-only sheet still yields one (empty) chunk, as the CSV reader does.
+            yield pd.DataFrame(buffer, columns=names, dtype=object)
+
+
+def iter_chunks(file_obj, columns: Columns = None, chunk_rows: int = CHUNK_ROWS, header_row: int = 0) -> Iterator[pd.DataFrame]:
+    """
+    The upload as text-valued frames of at most chunk_rows rows. columns picks
+    names and/or positions (None keeps all); header_row is the 0-based line
+    holding the headers. CSV is read with pandas' chunked reader and XLSX
+    streamed row by row from a read-only workbook; legacy .xls is read whole.
+    """
+    if upload_name(file_obj).endswith(".xls"):
+        file_obj.seek(0)
+        frame = pd.read_excel(file_obj, header=header_row, dtype=str)
+        positions, names = _project(frame.columns, columns)
+        frame = frame.iloc[:, positions].set_axis(names, axis=1)
+        for start in range(0, max(len(frame), 1), chunk_rows):
+            yield frame.iloc[start:start + chunk_rows]
+        return
+    chunks = _xlsx_chunks if is_xlsx(file_obj) else _csv_chunks
+    yield from chunks(file_obj, columns, chunk_rows, header_row)
+
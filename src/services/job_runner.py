@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+"""
+Background jobs for long work (bulk scans, agent missions, AI screening).
+
+Jobs run on process-wide thread pools, outside the Streamlit script thread,
+so reruns and closed browser tabs do not stop them. Status, progress, partial
+and final results live in a SQLite job table that any session can poll.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from src.services.result_store import frame_from_bytes, frame_to_bytes
+
+JOB_DB_PATH = os.path.join("data", "jobs.sqlite")
+# Workers for kinds without a pool of their own (missions, screening); JOB_WORKERS overrides.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Kinds with their own pool, so long bulk scans never queue the other jobs behind them.
+KIND_WORKERS: Dict[str, int] = {
+    "bulk_scan": int(os.getenv("BULK_SCAN_JOB_WORKERS", "2")),
+    "product_codes": 1,
+}
+# Progress updates closer together than this are not written (the last one always is).
+PROGRESS_INTERVAL_S = 0.5
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETE = "complete"
+FAILED = "failed"
+# The process that ran the job exited before it finished.
+INTERRUPTED = "interrupted"
+ACTIVE = (QUEUED, RUNNING)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT,
+    label TEXT,
+    status TEXT,
+    progress REAL,
+    message TEXT,
+    pid INTEGER,
+    partial BLOB,
+    result BLOB,
+    log TEXT,
+    payload TEXT,
+    error TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+"""
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@dataclass
+class JobResult:
+    frame: pd.DataFrame = field(default_factory=pd.DataFrame)
+    log: List[str] = field(default_factory=list)
+    # Anything else the UI needs back; must be JSON-serializable.
+    payload: Any = None
+
+
+class JobStore:
+    """The job table. Connections are opened per call, so any thread may use it."""
+
+    def __init__(self, path: str = JOB_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, job_id: str, kind: str, label: str) -> None:
+        now = _now()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, kind, label, status, progress, message, pid, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 0, 'Queued', ?, ?, ?)",
+                (job_id, kind, label, QUEUED, os.getpid(), now, now),
+            )
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        fields["updated_at"] = _now()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE job_id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The job's status fields (not its stored frames), or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT job_id, kind, label, status, progress, message, error, created_at, updated_at, "
+                "partial IS NOT NULL AS has_partial FROM jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def load_partial(self, job_id: str) -> pd.DataFrame:
+        with self._connect() as conn:
+            row = conn.execute("SELECT partial FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return frame_from_bytes(row["partial"] if row else None)
+
+    def load_result(self, job_id: str) -> Optional[JobResult]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT result, log, payload FROM jobs WHERE job_id = ? AND status = ?", (job_id, COMPLETE)).fetchone()
+        if row is None:
+            return None
+        return JobResult(frame_from_bytes(row["result"]), json.loads(row["log"] or "[]"), json.loads(row["payload"] or "null"))
+
+    def list_jobs(self, kind: Optional[str] = None, limit: int = 50) -> pd.DataFrame:
+        query = "SELECT job_id, kind, label, status, progress, message, created_at, updated_at FROM jobs"
+        args: tuple = ()
+        if kind:
+            query += " WHERE kind = ?"
+            args = (kind,)
+        with self._connect() as conn:
+            return pd.read_sql_query(query + " ORDER BY created_at DESC LIMIT ?", conn, params=(*args, limit))
+
+    def mark_interrupted(self) -> int:
+        """Active jobs whose process has exited can never finish; returns how many were marked."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT job_id, pid FROM jobs WHERE status IN ({', '.join('?' * len(ACTIVE))})", ACTIVE
+            ).fetchall()
+        orphans = [row["job_id"] for row in rows if row["pid"] != os.getpid() and not _pid_alive(row["pid"])]
+        for job_id in orphans:
+            self.update(job_id, status=INTERRUPTED, message="Stopped when the app restarted")
+        return len(orphans)
+
+
+class JobContext:
+    """Handed to a running job so it can report progress and publish partial results."""
+
+    def __init__(self, store: JobStore, job_id: str):
+        self.store = store
+        self.job_id = job_id
+        self._last_write = 0.0
+
+    def progress(self, pct: float, message: str = "") -> None:
+        now = time.monotonic()
+        if pct < 1.0 and now - self._last_write < PROGRESS_INTERVAL_S:
+            return
+        self._last_write = now
+        self.store.update(self.job_id, progress=float(min(max(pct, 0.0), 1.0)), message=message)
+
+    def partial(self, frame: pd.DataFrame) -> None:
+        """Replaces the job's partial results; shown while it is still running."""
+        self.store.update(self.job_id, partial=frame_to_bytes(frame) if not frame.empty else None)
+
+
+JobFn = Callable[..., JobResult]
+
+
+class JobRunner:
+    """
+    Runs submitted jobs on thread pools and records them in the job table.
+    A job is fn(context, *args, **kwargs) returning a JobResult. Kinds in
+    kind_workers run on a pool of their own; the rest share one.
+    """
+
+    def __init__(
+        self, store: Optional[JobStore] = None, max_workers: int = JOB_WORKERS, kind_workers: Optional[Dict[str, int]] = None
+    ):
+        self.store = store or JobStore()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="job")
+        self._kind_pools = {
+            kind: ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=f"job-{kind}")
+            for kind, workers in (KIND_WORKERS if kind_workers is None else kind_workers).items()
+        }
+        interrupted = self.store.mark_interrupted()
+        if interrupted:
+            print(f"Job Runner: marked {interrupted} unfinished jobs from a previous run as interrupted")
+
+    def submit(self, kind: str, label: str, fn: JobFn, *args: Any, **kwargs: Any) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        self.store.create(job_id, kind, label)
+        self._kind_pools.get(kind, self._pool).submit(self._run, job_id, fn, args, kwargs)
+        return job_id
+
+    def _run(self, job_id: str, fn: JobFn, args: tuple, kwargs: dict) -> None:
+        self.store.update(job_id, status=RUNNING, message="Started")
+        try:
+            result = fn(JobContext(self.store, job_id), *args, **kwargs)
+            self.store.update(
+                job_id,
+                status=COMPLETE,
+                progress=1.0,
+                message="Complete",
+                result=frame_to_bytes(result.frame) if not result.frame.empty else None,
+                log=json.dumps(result.log, default=str),
+                payload=json.dumps(result.payload, default=str),
+            )
+        except Exception as e:
+            print(f"Job Error ({job_id}): {e}")
+            self.store.update(job_id, status=FAILED, message=str(e), error=traceback.format_exc())
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def result(self, job_id: str) -> Optional[JobResult]:
+        return self.store.load_result(job_id)
+
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """The process-wide runner: it outlives script reruns and browser sessions."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+"""
+Batched LLM keyword extraction for bulk scans: many product names per prompt,
+answered as one JSON mapping of product id -> keywords.
+"""
+
+import json
+import math
+from typing import Any, Dict, List, Sequence
+
+KEYWORD_INSTRUCTIONS = (
+    "Extract 3-6 short, generic product keywords for regulatory recall searching. "
+    "Exclude brand names and vendors. Ignore the word 'Vive' entirely."
+)
+# Bump when the instructions or reply parsing change: cached keywords from older prompts are then not reused.
+KEYWORD_PROMPT_VERSION = 1
+KEYWORD_SYSTEM = "You extract regulatory search keywords from product names. Respond strictly in JSON format."
+
+# Token budget per batch call, counting the names sent and the keywords expected back.
+KEYWORD_BATCH_TOKENS = 2500
+KEYWORD_BATCH_MAX_ITEMS = 50
+# Prompt instructions and JSON framing, and the reply size, per batch and per product.
+PROMPT_OVERHEAD_TOKENS = 120
+ITEM_OVERHEAD_TOKENS = 6
+REPLY_TOKENS_PER_ITEM = 30
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token for English product text)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def item_tokens(name: str) -> int:
+    return estimate_tokens(name) + ITEM_OVERHEAD_TOKENS + REPLY_TOKENS_PER_ITEM
+
+
+def keyword_batches(
+    names: Sequence[str], max_tokens: int = KEYWORD_BATCH_TOKENS, max_items: int = KEYWORD_BATCH_MAX_ITEMS
+) -> List[List[str]]:
+    """Names packed in order into batches within the token and item limits (an oversized name gets its own batch)."""
+    batches: List[List[str]] = []
+    current: List[str] = []
+    used = PROMPT_OVERHEAD_TOKENS
+    for name in names:
+        cost = item_tokens(name)
+        if current and (used + cost > max_tokens or len(current) >= max_items):
+            batches.append(current)
+            current, used = [], PROMPT_OVERHEAD_TOKENS
+        current.append(name)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def batch_prompt(names: Sequence[str]) -> str:
+    products = {str(i): name for i, name in enumerate(names, start=1)}
+    return (
+        f"{KEYWORD_INSTRUCTIONS}\n"
+        "Do this for every product below. Return a JSON object that maps each product id "
+        'to its list of keywords, e.g. {"1": ["keyword", "keyword"], "2": [...]}.\n\n'
+        f"Products:\n{json.dumps(products, ensure_ascii=False)}"
+    )
+
+
+def parse_batch_reply(reply: Any, count: int) -> Dict[int, List[str]]:
+    """
+    Keywords by position for the ids the reply answered properly; missing,
+    malformed or empty entries are left out so the caller can retry them.
+    """
+    if isinstance(reply, dict) and isinstance(reply.get("keywords"), dict):
+        reply = reply["keywords"]
+    if not isinstance(reply, dict) or "error" in reply:
+        return {}
+    parsed: Dict[int, List[str]] = {}
+    for key, value in reply.items():
+        try:
+            pos = int(str(key).strip()) - 1
+        except ValueError:
+            continue
+        if not 0 <= pos < count:
+            continue
+        if isinstance(value, str):
+            value = value.split(",")
+        if not isinstance(value, list):
+            continue
+        keywords = [str(k).strip() for k in value if isinstance(k, (str, int, float)) and str(k).strip()]
+        if keywords:
+            parsed[pos] = keywords
+    return parsed
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+"""
+Persistent cache of LLM search keywords per product name, so repeat bulk
+scans of the same catalogue make no keyword calls.
+
+Entries are keyed by the normalized product name and a version string naming
+the model and the keyword prompt; changing either starts a fresh set of entries.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from src.services.keyword_batching import KEYWORD_PROMPT_VERSION
+from src.services.scan_planner import term_key
+
+KEYWORD_CACHE_PATH = os.path.join("data", "keyword_cache.sqlite")
+# Keys per IN (...) statement, under SQLite's bound-parameter limit.
+KEY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS keywords (
+    name_key TEXT,
+    version TEXT,
+    keywords TEXT,
+    created_at TEXT,
+    PRIMARY KEY (name_key, version)
+);
+"""
+
+
+def clean_product_name(name: str) -> str:
+    """The product name keywords are generated for: the house brand is dropped and whitespace collapsed."""
+    if not name:
+        return ""
+    cleaned = re.sub(r"\bvive\b", "", name, flags=re.IGNORECASE)
+    return re.sub(r"\s+", " ", cleaned).strip()
+
+
+def keyword_key(name: str) -> str:
+    """Case- and whitespace-insensitive identity of a cleaned product name."""
+    return term_key(name)
+
+
+def keyword_version(model: Optional[str]) -> str:
+    return f"{model or 'no-model'}|prompt-v{KEYWORD_PROMPT_VERSION}"
+
+
+class KeywordCache:
+    """SQLite-backed; connections are opened per call so any thread may use it."""
+
+    def __init__(self, path: str = KEYWORD_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, keys: Iterable[str], version: str) -> Dict[str, List[str]]:
+        """Cached keywords for the keys that have an entry under this version."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, List[str]] = {}
+        with self._connect() as conn:
+            for start in range(0, len(keys), KEY_CHUNK):
+                chunk = keys[start:start + KEY_CHUNK]
+                rows = conn.execute(
+                    f"SELECT name_key, keywords FROM keywords WHERE version = ? AND name_key IN ({', '.join('?' * len(chunk))})",
+                    (version, *chunk),
+                ).fetchall()
+                found.update((key, json.loads(keywords)) for key, keywords in rows)
+        return found
+
+    def put_many(self, entries: Dict[str, List[str]], version: str) -> None:
+        """Stores non-empty keyword lists; an empty list is a failed call and is not cached."""
+        now = datetime.now().isoformat(timespec="seconds")
+        rows = [(key, version, json.dumps(keywords), now) for key, keywords in entries.items() if keywords]
+        if not rows:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO keywords VALUES (?, ?, ?, ?)", rows)
+
+    def invalidate(self, names: Optional[Iterable[str]] = None, version: Optional[str] = None) -> int:
+        """
+        Drops entries and returns how many: those of the given product names,
+        of one version, of both filters combined, or everything when neither is given.
+        Names are cleaned as the scan cleans them before keying their entries.
+        """
+        version_clause, version_args = ("version = ?", [version]) if version is not None else (None, [])
+        if names is None:
+            where = f" WHERE {version_clause}" if version_clause else ""
+            with self._lock, self._connect() as conn:
+                return conn.execute(f"DELETE FROM keywords{where}", version_args).rowcount
+
+        keys = list(dict.fromkeys(keyword_key(clean_product_name(name)) for name in names))
+        removed = 0
+        with self._lock, self._connect() as conn:
+            for start in range(0, len(keys), KEY_CHUNK):
+                chunk = keys[start:start + KEY_CHUNK]
+                clauses = [f"name_key IN ({', '.join('?' * len(chunk))})", *([version_clause] if version_clause else [])]
+                removed += conn.execute(f"DELETE FROM keywords WHERE {' AND '.join(clauses)}", [*chunk, *version_args]).rowcount
+        return removed
+
+    def stats(self) -> pd.DataFrame:
+        """Entry counts per version, newest first."""
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                "SELECT version, COUNT(*) AS entries, MAX(created_at) AS last_added FROM keywords "
+                "GROUP BY version ORDER BY last_added DESC",
+                conn,
+            )
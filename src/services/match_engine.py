@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+"""Batched many-to-many fuzzy matching on rapidfuzz's multi-threaded process.cdist."""
+
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process, utils
+
+SCORERS: Dict[str, Callable] = {
+    "ratio": fuzz.ratio,
+    "partial_ratio": fuzz.partial_ratio,
+    "token_sort_ratio": fuzz.token_sort_ratio,
+    "token_set_ratio": fuzz.token_set_ratio,
+    "WRatio": fuzz.WRatio,
+    "QRatio": fuzz.QRatio,
+}
+# Indel-normalized ratio: the rapidfuzz counterpart of difflib.SequenceMatcher.ratio.
+DEFAULT_SCORER = "ratio"
+
+# Upper bound on score-matrix cells held at once (uint8, so ~64 MB); queries are processed in row blocks.
+MAX_MATRIX_CELLS = 64_000_000
+
+PAIR_COLUMNS = ["query_index", "choice_index", "score"]
+
+# Candidate blocks smaller than this are scored on the calling thread; a worker pool costs more than it saves.
+MIN_PARALLEL_CHOICES = 2_000
+
+
+def _resolve_scorer(scorer: str | Callable) -> Callable:
+    if callable(scorer):
+        return scorer
+    if scorer not in SCORERS:
+        raise ValueError(f"Unknown scorer '{scorer}'. Choose from: {', '.join(SCORERS)}")
+    return SCORERS[scorer]
+
+
+def match_pairs(
+    queries: Sequence[str],
+    choices: Sequence[str],
+    threshold: float = 0.6,
+    scorer: str | Callable = DEFAULT_SCORER,
+    processor: Optional[Callable] = utils.default_process,
+    workers: int = -1,
+) -> pd.DataFrame:
+    """
+    Scores every query against every choice and returns only the pairs
+    scoring at least `threshold` (0-1), as a sparse frame of
+    (query_index, choice_index, score). Scores are 0-1.
+    """
+    if not len(queries) or not len(choices):
+        return pd.DataFrame({c: pd.Series(dtype=t) for c, t in zip(PAIR_COLUMNS, ("int64", "int64", "float64"))})
+
+    scorer_fn = _resolve_scorer(scorer)
+    # Preprocess once; cdist would otherwise re-run the processor per block.
+    if processor is not None:
+        queries = [processor(str(q)) for q in queries]
+        choices = [processor(str(c)) for c in choices]
+    else:
+        queries = [str(q) for q in queries]
+        choices = [str(c) for c in choices]
+
+    cutoff = int(np.ceil(threshold * 100))
+    block = max(1, MAX_MATRIX_CELLS // len(choices))
+    rows, cols, scores = [], [], []
+    for start in range(0, len(queries), block):
+        matrix = process.cdist(
+            queries[start:start + block],
+            choices,
+            scorer=scorer_fn,
+            score_cutoff=cutoff,
+            dtype=np.uint8,
+            workers=workers,
+        )
+        # Scores below the cutoff come back as 0.
+        r, c = np.nonzero(matrix >= max(cutoff, 1))
+        rows.append(r + start)
+        cols.append(c)
+        scores.append(matrix[r, c])
+
+    return pd.DataFrame(
+        {
+            "query_index": np.concatenate(rows).astype(np.int64),
+            "choice_index": np.concatenate(cols).astype(np.int64),
+            "score": np.concatenate(scores).astype(np.float64) / 100.0,
+        }
+    )
+
+
+def score_pairs(
+    left: Sequence[str],
+    right: Sequence[str],
+    scorer: str | Callable = DEFAULT_SCORER,
+    processor: Optional[Callable] = utils.default_process,
+    workers: int = -1,
+) -> np.ndarray:
+    """
+    Scores aligned pairs (left[i], right[i]) as 0-1 floats. Repeated pairs
+    are scored once, and each distinct left string is scored against its
+    whole candidate block in one process.cdist call.
+    """
+    if len(left) != len(right):
+        raise ValueError("left and right must be the same length")
+    if not len(left):
+        return np.empty(0)
+    scorer_fn = _resolve_scorer(scorer)
+    left_codes, left_uniques = pd.factorize(pd.Series(left, dtype=object).fillna("").astype(str))
+    right_codes, right_uniques = pd.factorize(pd.Series(right, dtype=object).fillna("").astype(str))
+    if processor is not None:
+        left_uniques = [processor(s) for s in left_uniques]
+        right_uniques = [processor(s) for s in right_uniques]
+
+    # Distinct (left, right) pairs, sorted by left so each left string's candidates are contiguous.
+    keys = left_codes.astype(np.int64) * len(right_uniques) + right_codes
+    pair_keys, inverse = np.unique(keys, return_inverse=True)
+    pair_left, pair_right = np.divmod(pair_keys, len(right_uniques))
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(pair_left)) + 1, [len(pair_keys)]))
+    scores = np.empty(len(pair_keys))
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if stop - start == 1:
+            scores[start] = scorer_fn(left_uniques[pair_left[start]], right_uniques[pair_right[start]])
+            continue
+        scores[start:stop] = process.cdist(
+            [left_uniques[pair_left[start]]],
+            [right_uniques[j] for j in pair_right[start:stop]],
+            scorer=scorer_fn,
+            dtype=np.float64,
+            workers=workers if stop - start >= MIN_PARALLEL_CHOICES else 1,
+        )[0]
+    return scores[inverse.ravel()] / 100.0
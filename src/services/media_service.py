@@ -1,7 +1,6 @@
 import requests
 import xml.etree.ElementTree as ET
 from urllib.parse import quote
-from datetime import datetime
 
 class MediaMonitoringService:
     """
@@ -13,9 +12,10 @@ class MediaMonitoringService:
     # gl = Country (Geo Location), hl = Host Language, ceid = Country:Language
     RSS_URL = "https://news.google.com/rss/search?q={query}&hl={lang}&gl={geo}&ceid={geo}:{lang}"
 
-    def search_media(self, query_term: str, limit: int = 20, region: str = "US") -> list:
+    def search_media(self, query_term: str, limit: int = 20, region: str = "US", raise_errors: bool = False) -> list:
         """
         Searches media with region-specific targeting.
+        raise_errors: a failed request raises instead of counting as no coverage.
         """
         if not query_term:
             return []
@@ -50,6 +50,8 @@ class MediaMonitoringService:
         out = []
         try:
             res = requests.get(target_url, headers=headers, timeout=8)
+            if raise_errors:
+                res.raise_for_status()
             if res.status_code == 200:
                 # Check if content is actually XML
                 if not res.content.strip().startswith(b'<'):
@@ -63,7 +65,8 @@ class MediaMonitoringService:
                     
                     title = item.find('title').text if item.find('title') is not None else "No Title"
                     link = item.find('link').text if item.find('link') is not None else "N/A"
-                    pub_date = item.find('pubDate').text if item.find('pubDate') is not None else "N/A"
+                    # RFC-822 pubDate; parsed column-wise by src.services.date_normalization
+                    pub_date = item.find('pubDate').text if item.find('pubDate') is not None else ""
                     source_elem = item.find('source')
                     source_name = source_elem.text if source_elem is not None else "News"
                     
@@ -77,18 +80,9 @@ class MediaMonitoringService:
                     
                     is_risk = any(k in full_text for k in risk_keywords)
                     
-                    # Date Formatting
-                    fmt_date = pub_date
-                    try:
-                        # Common RSS date format: "Mon, 06 Jan 2025 14:30:00 GMT"
-                        dt_obj = datetime.strptime(pub_date, "%a, %d %b %Y %H:%M:%S %Z")
-                        fmt_date = dt_obj.strftime("%Y-%m-%d")
-                    except:
-                        pass
-
                     out.append({
                         "Source": f"Media ({region})",
-                        "Date": fmt_date,
+                        "Date": pub_date,
                         "Product": query_term,
                         "Description": title,
                         "Reason": "Media Report" if not is_risk else f"Safety Keywords Found: {', '.join([k for k in risk_keywords if k in full_text])}",
@@ -102,5 +96,7 @@ class MediaMonitoringService:
                     count += 1
         except Exception as e:
             print(f"Media Search Error ({region}): {e}")
+            if raise_errors:
+                raise
             
         return out
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+"""Character n-gram inverted index over model numbers, for finding model collisions without brute force."""
+
+import math
+import re
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz
+
+from src.match_and_classify import MODEL_MATCH_FLOOR
+
+NGRAM = 2
+
+# Columns of a results frame that carry model numbers; missing ones are skipped.
+MODEL_COLUMNS = ("Model Info", "code_info", "Product", "Description")
+
+CANDIDATE_COLUMNS = ["query_index", "hit_index", "query_token", "hit_token", "score"]
+
+_STRIP_RE = re.compile(r"[^A-Z0-9]")
+# As match_and_classify's model tokens, but a letter prefix may be hyphenated ("AB-1234" stays whole).
+_MODEL_RE = re.compile(r"(?<![A-Za-z])[A-Za-z]*-?\d[A-Za-z0-9\-]{2,}")
+# Sizes, volumes and counts ("18in", "10ml", "2pk") share digits and letters with model numbers but identify nothing.
+_MEASURE_RE = re.compile(
+    r"\d+(?:IN|INCH|INCHES|FT|MM|CM|M|ML|L|CC|OZ|LB|LBS|KG|G|MG|MCG|GA|FR|V|W|MAH|HZ|PK|PC|PCS|CT|X)"
+)
+_YEAR_RE = re.compile(r"(?:19|20)\d{2}S?")
+
+
+def is_model_token(token: str) -> bool:
+    """A normalized token that mixes letters and digits and is not a measurement or a year."""
+    return (
+        any(c.isalpha() for c in token)
+        and any(c.isdigit() for c in token)
+        and not _MEASURE_RE.fullmatch(token)
+        and not _YEAR_RE.fullmatch(token)
+    )
+
+
+def extract_models(text: str) -> List[str]:
+    return [raw for raw in _MODEL_RE.findall(text or "") if is_model_token(normalize_model(raw))]
+
+
+def normalize_model(token: str) -> str:
+    """'ab-1234' and 'AB 1234' both become 'AB1234'."""
+    return _STRIP_RE.sub("", (token or "").upper())
+
+
+def model_ngrams(token: str, n: int = NGRAM) -> List[str]:
+    if len(token) <= n:
+        return [token] if token else []
+    return [token[i:i + n] for i in range(len(token) - n + 1)]
+
+
+class ModelNumberIndex:
+    """
+    Maps character n-grams to the distinct model tokens containing them, and
+    tokens to the hits they came from. A lookup touches only the postings of
+    the query's own n-grams, then verifies the survivors with fuzz.ratio.
+    """
+
+    def __init__(self, n: int = NGRAM):
+        self.n = n
+        self._token_ids: Dict[str, int] = {}
+        self._tokens: List[str] = []
+        self._token_hits: List[List[int]] = []
+        self._postings: Dict[str, List[int]] = {}
+        self._frozen: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def add(self, hit_index: int, text: str) -> None:
+        for raw in extract_models(text):
+            token = normalize_model(raw)
+            if not token:
+                continue
+            token_id = self._token_ids.get(token)
+            if token_id is None:
+                token_id = len(self._tokens)
+                self._token_ids[token] = token_id
+                self._tokens.append(token)
+                self._token_hits.append([])
+                for gram in set(model_ngrams(token, self.n)):
+                    self._postings.setdefault(gram, []).append(token_id)
+            hits = self._token_hits[token_id]
+            if not hits or hits[-1] != hit_index:
+                hits.append(hit_index)
+        self._frozen = {}
+
+    @classmethod
+    def from_hits(cls, hits: pd.DataFrame, columns: Sequence[str] = MODEL_COLUMNS, n: int = NGRAM) -> "ModelNumberIndex":
+        index = cls(n)
+        present = [c for c in columns if c in hits.columns]
+        if not present:
+            return index
+        text = hits[present[0]].fillna("").astype(str)
+        for col in present[1:]:
+            text = text + " " + hits[col].fillna("").astype(str)
+        for hit_index, value in enumerate(text):
+            index.add(hit_index, value)
+        return index
+
+    def _posting(self, gram: str) -> np.ndarray:
+        if gram not in self._frozen:
+            self._frozen[gram] = np.asarray(self._postings.get(gram, ()), dtype=np.int64)
+        return self._frozen[gram]
+
+    def _min_shared(self, token: str, grams: int, min_score: float) -> int:
+        """
+        Count filter: fuzz.ratio >= min_score bounds the indel distance d, and
+        each indel destroys at most n of the query's n-grams, so any match
+        shares at least grams - d * n of them. Lossless for the fuzz.ratio check.
+        """
+        if min_score <= 0:
+            return 0
+        longest = math.floor(len(token) * (2 - min_score) / min_score + 1e-9)
+        max_indels = math.floor((1 - min_score) * (len(token) + longest) + 1e-9)
+        return grams - max_indels * self.n
+
+    def lookup(self, token: str, min_score: float = MODEL_MATCH_FLOOR) -> List[tuple]:
+        """(hit token, score) pairs for indexed tokens scoring >= min_score against `token` by fuzz.ratio."""
+        token = normalize_model(token)
+        grams = set(model_ngrams(token, self.n))
+        if not grams:
+            return []
+        needed = self._min_shared(token, len(grams), min_score)
+        if needed > 0:
+            postings = [p for p in (self._posting(g) for g in grams) if p.size]
+            if not postings:
+                return []
+            ids, shared = np.unique(np.concatenate(postings), return_counts=True)
+            ids = ids[shared >= needed].tolist()
+        else:
+            # Too short for the count filter to prune anything; verify every token.
+            ids = range(len(self._tokens))
+        exact = self._token_ids.get(token)
+        cutoff = min_score * 100
+        out = []
+        for token_id in ids:
+            candidate = self._tokens[token_id]
+            score = 100.0 if token_id == exact else fuzz.ratio(token, candidate, score_cutoff=cutoff)
+            if score and score >= cutoff:
+                out.append((candidate, score / 100.0))
+        return out
+
+    def candidates(self, queries: Iterable[str], min_score: float = MODEL_MATCH_FLOOR) -> pd.DataFrame:
+        """
+        Model tokens are extracted from each query text (e.g. a SKU's product
+        name). Returns one row per (query, hit) with the best model collision.
+        """
+        rows = []
+        for query_index, text in enumerate(queries):
+            for raw in dict.fromkeys(extract_models(text)):
+                for hit_token, score in self.lookup(raw, min_score=min_score):
+                    for hit_index in self._token_hits[self._token_ids[hit_token]]:
+                        rows.append((query_index, hit_index, normalize_model(raw), hit_token, score))
+        frame = pd.DataFrame(rows, columns=CANDIDATE_COLUMNS).astype(
+            {"query_index": "int64", "hit_index": "int64", "score": "float64"}
+        )
+        if frame.empty:
+            return frame
+        return (
+            frame.sort_values(["query_index", "hit_index", "score"], ascending=[True, True, False])
+            .drop_duplicates(["query_index", "hit_index"])
+            .reset_index(drop=True)
+        )
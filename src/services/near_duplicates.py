@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+"""Near-duplicate clustering of search results with MinHash signatures and LSH banding."""
+
+import re
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+NUM_PERM = 64
+BANDS = 16  # 4 rows per band -> candidate threshold ~ (1/16) ** (1/4) = 0.5
+JACCARD_THRESHOLD = 0.6
+MIN_TOKENS = 3
+CHUNK_SHINGLES = 250_000
+
+_PRIME = np.uint64((1 << 31) - 1)
+_TOKEN_RE = re.compile(r"[a-z0-9]{2,}")
+_NO_ID = {"", "N/A", "NA", "NAN", "NONE"}
+
+# Sources whose rows are distinct observations rather than re-publications of one event.
+EXCLUDED_SOURCES = ("FDA MAUDE", "OFAC Sanctions", "Sanctions")
+
+# Lower rank wins when choosing a cluster representative.
+SOURCE_PRIORITY = (
+    ("FDA Device Recall", 0),
+    ("FDA Enforcement", 1),
+    ("CPSC", 2),
+    ("MHRA", 3),
+    ("Health", 3),
+    ("EMA", 3),
+    ("ANVISA", 3),
+    ("Regulatory Web", 4),
+    ("Web Search", 5),
+    ("Media", 6),
+)
+
+_rng = np.random.default_rng(20240611)
+_PERM_A = _rng.integers(1, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, int(_PRIME), size=NUM_PERM, dtype=np.uint64)
+
+
+def _source_rank(source: str) -> int:
+    for marker, rank in SOURCE_PRIORITY:
+        if marker in source:
+            return rank
+    return 5
+
+
+def _record_ids(df: pd.DataFrame, source: pd.Series) -> List[Tuple[str, str]]:
+    """(source, record ID) per row; the ID is empty when the row has none."""
+    ids = df["ID"].fillna("").astype(str).str.strip() if "ID" in df.columns else pd.Series("", index=df.index)
+    return [(s, "" if i.upper() in _NO_ID else i) for s, i in zip(source, ids)]
+
+
+def _shingles(text: str) -> List[int]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < MIN_TOKENS:
+        return []
+    grams = set(tokens)
+    grams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return [zlib.crc32(g.encode("utf-8")) for g in grams]
+
+
+def minhash_signatures(texts: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns (row indices with usable text, signature matrix of shape (n, NUM_PERM)).
+    All shingles are hashed in one flat array and reduced per record with
+    np.minimum.reduceat, processed in bounded chunks of records.
+    """
+    per_record = [_shingles(t) for t in texts]
+    rows = np.array([i for i, s in enumerate(per_record) if s], dtype=np.int64)
+    if rows.size == 0:
+        return rows, np.empty((0, NUM_PERM), dtype=np.uint64)
+
+    signatures = np.empty((rows.size, NUM_PERM), dtype=np.uint64)
+    start = 0
+    while start < rows.size:
+        stop, total = start, 0
+        while stop < rows.size and (total == 0 or total + len(per_record[rows[stop]]) <= CHUNK_SHINGLES):
+            total += len(per_record[rows[stop]])
+            stop += 1
+        chunk = [per_record[i] for i in rows[start:stop]]
+        lengths = np.fromiter((len(s) for s in chunk), dtype=np.int64, count=len(chunk))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        flat = np.fromiter((h for s in chunk for h in s), dtype=np.uint64, count=int(lengths.sum())) % _PRIME
+        hashed = (flat[:, None] * _PERM_A[None, :] + _PERM_B[None, :]) % _PRIME
+        signatures[start:stop] = np.minimum.reduceat(hashed, offsets, axis=0)
+        start = stop
+    return rows, signatures
+
+
+def lsh_clusters(
+    signatures: np.ndarray,
+    bands: int = BANDS,
+    threshold: float = JACCARD_THRESHOLD,
+    identities: Optional[Sequence[Tuple[str, str]]] = None,
+) -> np.ndarray:
+    """
+    Buckets signatures per band, verifies candidate edges by estimated
+    Jaccard similarity and returns a cluster label per signature row.
+    identities: (source, record ID) per row. Two clusters holding different
+    IDs from the same source are never joined: those are distinct records
+    that happen to share text (e.g. one recall reason across several models).
+    """
+    n = signatures.shape[0]
+    parent = np.arange(n)
+    # Cluster root -> the one record ID each source contributes to it.
+    ids_of: Dict[int, Dict[str, str]] = {}
+    if identities is not None:
+        ids_of = {i: {source: rid} for i, (source, rid) in enumerate(identities) if rid}
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(a: int, b: int) -> None:
+        ra, rb = find(a), find(b)
+        if ra == rb:
+            return
+        ids_a, ids_b = ids_of.get(ra, {}), ids_of.get(rb, {})
+        if any(ids_a[source] != rid for source, rid in ids_b.items() if source in ids_a):
+            return
+        root, child = min(ra, rb), max(ra, rb)
+        parent[child] = root
+        if ids_a or ids_b:
+            ids_of[root] = {**ids_a, **ids_b}
+            ids_of.pop(child, None)
+
+    if n < 2:
+        return parent
+
+    rows_per_band = signatures.shape[1] // bands
+    mix = np.arange(1, rows_per_band + 1, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+    for band in range(bands):
+        block = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        keys = (block * mix).sum(axis=1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        same = sorted_keys[1:] == sorted_keys[:-1]
+        if not same.any():
+            continue
+        # Link each bucket member to the bucket head, then keep verified edges only.
+        starts = np.concatenate(([True], ~same))
+        head_of = order[np.flatnonzero(starts)][np.cumsum(starts) - 1]
+        members = order[1:][same]
+        member_heads = head_of[1:][same]
+        agreement = (signatures[members] == signatures[member_heads]).mean(axis=1)
+        for a, b in zip(members[agreement >= threshold], member_heads[agreement >= threshold]):
+            union(int(a), int(b))
+
+    return np.array([find(i) for i in range(n)])
+
+
+def collapse_near_duplicates(df: pd.DataFrame, threshold: float = JACCARD_THRESHOLD) -> pd.DataFrame:
+    """
+    Collapses near-duplicate rows to one representative per cluster. Rows
+    from one source with different record IDs are never collapsed together.
+    The representative gains `Linked_Sources`/`Linked_Links`/`Linked_IDs`/
+    `Linked_Products` (lists over the cluster) and `Duplicate_Count`.
+    """
+    if df.empty:
+        return df
+
+    source = df["Source"].fillna("").astype(str) if "Source" in df.columns else pd.Series("", index=df.index)
+    title = df["Description"] if "Description" in df.columns else df.get("Product", pd.Series("", index=df.index))
+    reason = df["Reason"] if "Reason" in df.columns else pd.Series("", index=df.index)
+    text = title.fillna("").astype(str) + " " + reason.fillna("").astype(str)
+
+    eligible = ~source.str.contains("|".join(re.escape(s) for s in EXCLUDED_SOURCES), regex=True)
+    positions = np.flatnonzero(eligible.to_numpy())
+    rows, signatures = minhash_signatures(text.iloc[positions].tolist())
+    identities = _record_ids(df, source)
+    links = df["Link"].fillna("").astype(str).tolist() if "Link" in df.columns else [""] * len(df)
+    products = df["Product"].fillna("").astype(str).tolist() if "Product" in df.columns else [""] * len(df)
+
+    cluster = np.arange(len(df))
+    if rows.size > 1:
+        labels = lsh_clusters(signatures, threshold=threshold, identities=[identities[p] for p in positions[rows]])
+        cluster[positions[rows]] = positions[rows][labels]
+
+    if (cluster == np.arange(len(df))).all():
+        return df.assign(
+            Linked_Sources=[[s] for s in source],
+            Linked_Links=[[l] if l else [] for l in links],
+            Linked_IDs=[[rid] if rid else [] for _, rid in identities],
+            Linked_Products=[[p] if p else [] for p in products],
+            Duplicate_Count=1,
+        )
+
+    ranks = source.map(_source_rank).to_numpy()
+    order = np.lexsort((np.arange(len(df)), ranks, cluster))
+    grouped: Dict[int, List[int]] = {}
+    for pos in order:
+        grouped.setdefault(int(cluster[pos]), []).append(int(pos))
+
+    sources = source.tolist()
+    keep: List[int] = []
+    linked_sources: List[List[str]] = []
+    linked_links: List[List[str]] = []
+    linked_ids: List[List[str]] = []
+    linked_products: List[List[str]] = []
+    counts: List[int] = []
+    for members in sorted(grouped.values(), key=lambda m: min(m)):
+        keep.append(members[0])
+        linked_sources.append(list(dict.fromkeys(sources[m] for m in members)))
+        linked_links.append([links[m] for m in members if links[m]])
+        linked_ids.append(list(dict.fromkeys(identities[m][1] for m in members if identities[m][1])))
+        linked_products.append(list(dict.fromkeys(products[m] for m in members if products[m])))
+        counts.append(len(members))
+
+    out = df.iloc[keep]
+    return out.assign(
+        Linked_Sources=linked_sources,
+        Linked_Links=linked_links,
+        Linked_IDs=linked_ids,
+        Linked_Products=linked_products,
+        Duplicate_Count=counts,
+    )
+
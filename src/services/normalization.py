@@ -1,34 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from datetime import datetime
 from typing import Any, Dict, Iterable, Optional
 
-
-def _coerce_date(value: Any) -> Optional[str]:
-    """Best-effort date normalization to ISO format string."""
-    if not value:
-        return None
-    if isinstance(value, (datetime,)):
-        return value.date().isoformat()
-    if isinstance(value, str):
-        txt = value.strip()
-        # Common formats: YYYY-MM-DD, YYYYMMDD, DD Mon YYYY, RFC822 snippets
-        for fmt in ("%Y-%m-%d", "%Y%m%d", "%d %b %Y", "%a, %d %b %Y %H:%M:%S %Z"):
-            try:
-                return datetime.strptime(txt, fmt).date().isoformat()
-            except Exception:
-                continue
-        # Try partial ISO (first 10 chars)
-        if len(txt) >= 10 and txt[4] == "-":
-            return txt[:10]
-    try:
-        # numeric timestamp
-        if isinstance(value, (int, float)):
-            return datetime.fromtimestamp(value).date().isoformat()
-    except Exception:
-        return None
-    return None
+from src.services.date_normalization import coerce_date
 
 
 def _stringify_model_numbers(model_numbers: Any) -> str:
@@ -63,7 +38,7 @@ class NormalizedRecord:
 
     def to_dict(self) -> Dict[str, Any]:
         model_str = _stringify_model_numbers(self.model_numbers)
-        normalized_date = _coerce_date(self.date)
+        normalized_date = coerce_date(self.date)
         provenance_payload = self.provenance or {}
 
         record = {
@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+"""Local index of the FDA device classification file, for mapping terms and SKUs to product codes."""
+
+import io
+import math
+import os
+import re
+import threading
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import Dict, IO, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import requests
+
+from src.services.synonyms import expand_synonyms, tokenize
+
+CLASSIFICATION_URL = "https://www.accessdata.fda.gov/premarket/ftparea/foiclass.zip"
+CLASSIFICATION_PATH = os.path.join("data", "fda_classification.parquet")
+
+# foiclass.txt header -> local column name; the remaining columns are not needed for lookup.
+CLASSIFICATION_COLUMNS = {
+    "PRODUCTCODE": "product_code",
+    "DEVICENAME": "device_name",
+    "DEVICECLASS": "device_class",
+    "REGULATIONNUMBER": "regulation_number",
+    "REVIEW_PANEL": "review_panel",
+}
+
+# After a failed load or download, automatic retries wait this long, doubling per failure up to the cap.
+RETRY_BACKOFF_S = 60
+MAX_BACKOFF_S = 3600
+
+MATCH_THRESHOLD = 0.5
+NEAR_BEST = 0.75
+MAX_CODES = 5
+
+_CODE_RE = re.compile(r"^[A-Z]{3}$")
+
+
+@dataclass
+class ProductCodeMatch:
+    product_code: str
+    device_name: str
+    device_class: str
+    regulation_number: str
+    score: float
+
+
+def parse_classification(handle: Union[str, IO]) -> pd.DataFrame:
+    """Reads the pipe-delimited foiclass.txt (a path, a file object, or the downloaded zip)."""
+    if isinstance(handle, str) and handle.lower().endswith(".zip"):
+        with zipfile.ZipFile(handle) as archive:
+            return parse_classification(io.BytesIO(archive.read(_text_member(archive))))
+    frame = pd.read_csv(
+        handle,
+        sep="|",
+        dtype=str,
+        encoding="latin-1",
+        usecols=lambda c: c.strip().upper() in CLASSIFICATION_COLUMNS,
+        keep_default_na=False,
+        quoting=3,
+    )
+    frame.columns = [CLASSIFICATION_COLUMNS[c.strip().upper()] for c in frame.columns]
+    frame["product_code"] = frame["product_code"].str.strip().str.upper()
+    return frame[frame["product_code"] != ""].drop_duplicates("product_code").reset_index(drop=True)
+
+
+def _text_member(archive: zipfile.ZipFile) -> str:
+    names = [n for n in archive.namelist() if n.lower().endswith(".txt")]
+    if not names:
+        raise ValueError("Classification archive has no .txt member")
+    return names[0]
+
+
+def download_classification(url: str = CLASSIFICATION_URL, path: str = CLASSIFICATION_PATH) -> pd.DataFrame:
+    res = requests.get(url, timeout=60)
+    res.raise_for_status()
+    with zipfile.ZipFile(io.BytesIO(res.content)) as archive:
+        frame = parse_classification(io.BytesIO(archive.read(_text_member(archive))))
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Written aside and swapped in, so a concurrent load never reads half a file.
+    frame.to_parquet(f"{path}.tmp", index=False)
+    os.replace(f"{path}.tmp", path)
+    return frame
+
+
+class ProductCodeIndex:
+    """
+    Inverted token index over classification device names. A term is scored
+    against each candidate name by IDF-weighted cosine over shared tokens;
+    tokens the classification never uses (brands, SKUs) carry no weight.
+    """
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame.reset_index(drop=True)
+        self._codes = {code: i for i, code in enumerate(self.frame.get("product_code", pd.Series(dtype=str)))}
+        postings: Dict[str, List[int]] = {}
+        self._name_tokens: List[List[str]] = []
+        for row, name in enumerate(self.frame.get("device_name", pd.Series(dtype=str)).fillna("")):
+            tokens = list(dict.fromkeys(tokenize(name)))
+            self._name_tokens.append(tokens)
+            for token in tokens:
+                postings.setdefault(token, []).append(row)
+        total = max(len(self.frame), 1)
+        self._postings = {t: np.array(rows, dtype=np.int64) for t, rows in postings.items()}
+        self._idf = {t: math.log(1 + total / len(rows)) for t, rows in postings.items()}
+        self._name_norm = np.array(
+            [math.sqrt(sum(self._idf[t] ** 2 for t in tokens)) or 1.0 for tokens in self._name_tokens]
+        )
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def _match(self, row: int, score: float) -> ProductCodeMatch:
+        rec = self.frame.iloc[row]
+        return ProductCodeMatch(
+            product_code=rec["product_code"],
+            device_name=rec.get("device_name", ""),
+            device_class=rec.get("device_class", ""),
+            regulation_number=rec.get("regulation_number", ""),
+            score=round(float(score), 3),
+        )
+
+    def _score_phrase(self, phrase: str) -> Dict[int, float]:
+        tokens = [t for t in dict.fromkeys(tokenize(phrase)) if t in self._idf]
+        if not tokens:
+            return {}
+        query_norm = math.sqrt(sum(self._idf[t] ** 2 for t in tokens))
+        shared = np.zeros(len(self.frame))
+        for token in tokens:
+            shared[self._postings[token]] += self._idf[token] ** 2
+        rows = np.flatnonzero(shared)
+        scores = shared[rows] / (query_norm * self._name_norm[rows])
+        return dict(zip(rows.tolist(), scores.tolist()))
+
+    def lookup(self, term: str, max_codes: int = MAX_CODES, threshold: float = MATCH_THRESHOLD) -> List[ProductCodeMatch]:
+        """Best product codes for a term or SKU description, strongest first. The term's synonyms are tried too."""
+        term = (term or "").strip()
+        if not term or not len(self):
+            return []
+        if _CODE_RE.match(term) and term in self._codes:
+            return [self._match(self._codes[term], 1.0)]
+
+        best: Dict[int, float] = {}
+        for phrase in (term, *expand_synonyms(term)):
+            for row, score in self._score_phrase(phrase).items():
+                if score > best.get(row, 0.0):
+                    best[row] = score
+        if not best:
+            return []
+        top = max(best.values())
+        if top < threshold:
+            return []
+        ranked = sorted((r for r, s in best.items() if s >= top * NEAR_BEST), key=lambda r: (-best[r], r))
+        return [self._match(r, best[r]) for r in ranked[:max_codes]]
+
+    def product_codes(self, term: str, max_codes: int = MAX_CODES) -> List[str]:
+        return [m.product_code for m in self.lookup(term, max_codes=max_codes)]
+
+
+_lock = threading.Lock()
+# path -> (file mtime, index built from it)
+_loaded: Dict[str, Tuple[float, ProductCodeIndex]] = {}
+_failures = 0
+_retry_at = 0.0
+_refreshing = False
+
+
+def _empty_index() -> ProductCodeIndex:
+    return ProductCodeIndex(pd.DataFrame(columns=list(CLASSIFICATION_COLUMNS.values())))
+
+
+def _record_failure() -> None:
+    global _failures, _retry_at
+    _failures += 1
+    _retry_at = time.monotonic() + min(RETRY_BACKOFF_S * 2 ** (_failures - 1), MAX_BACKOFF_S)
+
+
+def get_product_code_index(path: str = CLASSIFICATION_PATH) -> ProductCodeIndex:
+    """
+    The index over the stored classification file, rebuilt when the file changes.
+    Never downloads (see refresh_product_codes): without a stored file the index
+    is empty and callers fall back to text queries. A file that fails to load
+    is tried again after a backoff rather than for the rest of the process.
+    """
+    global _failures
+    with _lock:
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return _empty_index()
+        loaded = _loaded.get(path)
+        if loaded and loaded[0] == mtime:
+            return loaded[1]
+        if time.monotonic() < _retry_at:
+            return loaded[1] if loaded else _empty_index()
+        try:
+            index = ProductCodeIndex(pd.read_parquet(path))
+        except Exception as e:
+            print(f"Product Code Index Error: {e}")
+            _record_failure()
+            return loaded[1] if loaded else _empty_index()
+        _failures = 0
+        _loaded[path] = (mtime, index)
+        return index
+
+
+def refresh_due(path: str = CLASSIFICATION_PATH) -> bool:
+    """True when no classification file is stored, no download is running and the retry backoff has passed."""
+    return not os.path.exists(path) and not _refreshing and time.monotonic() >= _retry_at
+
+
+def refresh_product_codes(url: str = CLASSIFICATION_URL, path: str = CLASSIFICATION_PATH) -> int:
+    """
+    Downloads the classification file and stores it; the next index lookup
+    picks it up. Returns the number of product codes. A failure raises and
+    delays the next automatic attempt (see refresh_due).
+    """
+    global _failures, _retry_at, _refreshing
+    _refreshing = True
+    try:
+        frame = download_classification(url, path)
+    except Exception:
+        with _lock:
+            _record_failure()
+        raise
+    finally:
+        _refreshing = False
+    with _lock:
+        _failures, _retry_at = 0, 0.0
+    return len(frame)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+"""Yield-estimating query plans: which terms to send to which source, in what order, at what cost."""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+# Rough per-request latency by source, used only for the plan's cost estimate.
+SOURCE_LATENCY_S = {
+    "FDA Device Recalls": 0.8,
+    "FDA Enforcement": 0.8,
+    "FDA MAUDE": 1.0,
+    "CPSC Recalls": 1.5,
+    "Sanctions & Watchlists": 0.7,
+    "OFAC Sanctions": 3.0,
+    "Regulatory Web": 0.7,
+    "Global Health Agencies": 1.2,
+    "Media Signals": 1.5,
+}
+DEFAULT_LATENCY_S = 1.0
+COUNT_LATENCY_S = 0.4
+ESTIMATE_WORKERS = 8
+
+RUN = "run"
+SKIP = "skip (zero yield)"
+CAPPED = "skip (over term cap)"
+
+# Returns the hit count for the union of the given terms, or None when it cannot be estimated.
+Counter = Callable[[List[str]], Optional[int]]
+
+
+@dataclass
+class PlanEntry:
+    source: str
+    term: str
+    requests: int
+    estimated_hits: Optional[int] = None
+    marginal_hits: Optional[int] = None
+    action: str = RUN
+
+    @property
+    def latency_s(self) -> float:
+        return self.requests * SOURCE_LATENCY_S.get(self.source, DEFAULT_LATENCY_S)
+
+
+@dataclass
+class QueryPlan:
+    entries: List[PlanEntry] = field(default_factory=list)
+    planning_requests: int = 0
+    product_codes: List[str] = field(default_factory=list)
+
+    def add(self, source: str, terms: Sequence[str], requests_per_term: int = 1) -> None:
+        self.entries.extend(PlanEntry(source, term, requests_per_term) for term in terms)
+
+    def terms_for(self, source: str) -> List[str]:
+        return [e.term for e in self.entries if e.source == source and e.action == RUN]
+
+    @property
+    def estimated_requests(self) -> int:
+        return sum(e.requests for e in self.entries if e.action == RUN)
+
+    @property
+    def estimated_latency_s(self) -> float:
+        return sum(e.latency_s for e in self.entries if e.action == RUN) + self.planning_requests * COUNT_LATENCY_S
+
+    @property
+    def skipped_requests(self) -> int:
+        return sum(e.requests for e in self.entries if e.action != RUN)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [
+                {
+                    "Source": e.source,
+                    "Term": e.term,
+                    "Est. Hits": e.estimated_hits,
+                    "Est. New Hits": e.marginal_hits,
+                    "Requests": e.requests,
+                    "Est. Latency (s)": round(e.latency_s, 1),
+                    "Action": e.action,
+                }
+                for e in self.entries
+            ]
+        ).astype({"Est. Hits": "Int64", "Est. New Hits": "Int64"})
+
+
+def _safe_count(counter: Counter, terms: List[str]) -> Optional[int]:
+    try:
+        return counter(terms)
+    except Exception as e:
+        print(f"Query Planner Count Error: {e}")
+        return None
+
+
+def estimate_yields(
+    counter: Counter, terms: Sequence[str], limit: Optional[int] = None
+) -> tuple[Dict[str, Optional[int]], Dict[str, Optional[int]], int]:
+    """
+    Returns (hits per term, marginal new hits per term, requests spent).
+    Terms are ranked by their own hit count. Each term's marginal yield is
+    then the growth of the union count when it is OR'd onto the terms ranked
+    above it. Both rounds are independent count requests and run concurrently.
+
+    Each term is fetched with `limit` rows at most. Once a term above has more
+    hits than that, the union no longer says what was actually fetched, so
+    later terms are credited with their own capped count instead.
+    """
+    terms = list(dict.fromkeys(terms))
+    with ThreadPoolExecutor(max_workers=ESTIMATE_WORKERS) as pool:
+        totals = dict(zip(terms, pool.map(lambda t: _safe_count(counter, [t]), terms)))
+        ranked = sorted((t for t in terms if totals[t]), key=lambda t: -totals[t])
+        # The first prefix is a single term whose count is already known.
+        unions = [totals[ranked[0]]] if ranked else []
+        unions.extend(pool.map(lambda i: _safe_count(counter, ranked[: i + 1]), range(1, len(ranked))))
+
+    def capped(hits: int) -> int:
+        return hits if limit is None else min(hits, limit)
+
+    marginal: Dict[str, Optional[int]] = {t: (0 if totals[t] == 0 else None) for t in terms}
+    previous = 0
+    # Whether every term ranked above was fetched in full, so the union counts are what came back.
+    exact = True
+    for term, union in zip(ranked, unions):
+        if union is None or not exact:
+            marginal[term] = capped(totals[term])
+        else:
+            marginal[term] = capped(max(union - previous, 0))
+            previous = max(union, previous)
+        exact = exact and capped(totals[term]) == totals[term]
+    return totals, marginal, len(terms) + max(len(ranked) - 1, 0)
+
+
+def plan_source(
+    plan: QueryPlan, source: str, terms: Sequence[str], counter: Counter, max_terms: int, limit: Optional[int] = None
+) -> None:
+    """
+    Adds `source` to the plan with estimated yields: zero-yield terms are
+    skipped, the rest run in order of marginal yield, capped at `max_terms`.
+    Terms whose count failed keep their place after the estimated ones.
+    limit: rows each term's fetch returns at most (see estimate_yields). Terms
+    with more hits than that run after those fetched in full: one of them
+    alone fills the source's row cap, which ends its fetch loop.
+    """
+    totals, marginal, spent = estimate_yields(counter, terms, limit)
+    plan.planning_requests += spent
+    ordered = sorted(totals, key=lambda t: (marginal[t] is None, -(marginal[t] or 0)))
+    entries = []
+    kept = 0
+    for term in ordered:
+        entry = PlanEntry(source, term, 1, totals[term], marginal[term])
+        if totals[term] == 0 or marginal[term] == 0:
+            entry.action = SKIP
+        elif kept >= max_terms:
+            entry.action = CAPPED
+        else:
+            kept += 1
+        entries.append(entry)
+
+    def over_limit(entry: PlanEntry) -> bool:
+        return limit is not None and (entry.estimated_hits or 0) > limit
+
+    plan.entries.extend(sorted(entries, key=lambda e: (e.action != RUN, over_limit(e))))
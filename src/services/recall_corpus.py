@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+"""
+Corpus-first bulk scanning: the date window's FDA recall, enforcement and
+CPSC records are fetched once (or loaded from disk) and matched locally,
+instead of searching each SKU's terms against the APIs.
+"""
+
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import List, Optional
+
+import pandas as pd
+
+from src.search.cpsc import cpsc_window
+from src.search.openfda import DEVICE_ENF_ENDPOINT, DEVICE_RECALL_ENDPOINT, MAX_PAGE, count_window, fetch_window
+from src.services.concurrency import source_slot
+from src.services.date_normalization import apply_date_window
+from src.services.regulatory_service import RegulatoryService
+from src.services.result_schema import enforce_result_schema, failed_sources
+
+CORPUS_DIR = os.path.join("data", "corpus")
+# A stored corpus older than this is refetched; windows ending in the past never change.
+CORPUS_MAX_AGE_S = 24 * 3600
+
+PER_SKU = "per_sku"
+CORPUS = "corpus"
+AUTO = "auto"
+SCAN_MODES = (AUTO, PER_SKU, CORPUS)
+
+# Rough openFDA/CPSC requests one SKU costs in per-SKU mode after scan-wide term dedup,
+# and their latency; a full 1000-record page is slower than a 20-record search.
+EST_REQUESTS_PER_SKU = 12
+REQUEST_S = 0.9
+PAGE_S = 4.0
+# Small catalogues always search per SKU: it also covers MAUDE and uses the LLM keywords.
+MIN_CORPUS_SKUS = 25
+# Without window counts, catalogues at least this large go corpus-first.
+CORPUS_FIRST_MIN_SKUS = 100
+
+
+def corpus_path(start: date, end: date, directory: str = CORPUS_DIR) -> str:
+    return os.path.join(directory, f"recall_corpus_{start:%Y%m%d}_{end:%Y%m%d}.parquet")
+
+
+def fetch_corpus(start: date, end: date) -> pd.DataFrame:
+    """
+    Every FDA device recall, enforcement report and CPSC recall in the window,
+    in the search result schema. Sources that failed are listed in
+    attrs["failed_sources"] (see failed_sources); their records are missing.
+    """
+    failed: List[str] = []
+
+    def fetch(source: str, fn, *args):
+        with source_slot(source):
+            try:
+                return fn(*args)
+            except Exception as e:
+                print(f"Corpus Fetch Error ({source}): {e}")
+                failed.append(source)
+                return []
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        recalls = pool.submit(fetch, "FDA Device Recalls", fetch_window, DEVICE_RECALL_ENDPOINT, start, end)
+        enforcement = pool.submit(fetch, "FDA Enforcement", fetch_window, DEVICE_ENF_ENDPOINT, start, end)
+        cpsc = pool.submit(fetch, "CPSC Recalls", cpsc_window, start, end)
+
+    records = [RegulatoryService._openfda_record(hit, "FDA Device Recall", "recall", "") for hit in recalls.result()]
+    records += [RegulatoryService._openfda_record(hit, "FDA Enforcement", "enforcement", "") for hit in enforcement.result()]
+    records += [RegulatoryService._cpsc_record(hit, "") for hit in cpsc.result()]
+    df = pd.DataFrame(records)
+    if not df.empty:
+        df = RegulatoryService._dedupe(df).reset_index(drop=True)
+        df = RegulatoryService._normalize_columns(df)
+        df = enforce_result_schema(df)
+        df = apply_date_window(df, start, end).reset_index(drop=True)
+    df.attrs["failed_sources"] = failed
+    return df
+
+
+def load_corpus(start: date, end: date, refresh: bool = False, directory: str = CORPUS_DIR) -> pd.DataFrame:
+    """
+    The stored corpus for the window when fresh enough, otherwise a new fetch,
+    which is stored only when every source answered: a partial corpus is not reused.
+    """
+    path = corpus_path(start, end, directory)
+    if not refresh and os.path.exists(path):
+        closed = end < date.today()
+        if closed or time.time() - os.path.getmtime(path) < CORPUS_MAX_AGE_S:
+            try:
+                return pd.read_parquet(path)
+            except Exception as e:
+                print(f"Corpus Load Error: {e}")
+    df = fetch_corpus(start, end)
+    if not df.empty and not failed_sources(df):
+        try:
+            os.makedirs(directory, exist_ok=True)
+            df.to_parquet(path, index=False)
+        except Exception as e:
+            print(f"Corpus Save Error: {e}")
+    return df
+
+
+def estimate_corpus_requests(start: date, end: date) -> Optional[int]:
+    """Requests a corpus fetch costs (pages per openFDA endpoint, plus CPSC), or None if the counts fail."""
+    try:
+        totals = [count_window(endpoint, start, end) for endpoint in (DEVICE_RECALL_ENDPOINT, DEVICE_ENF_ENDPOINT)]
+    except Exception as e:
+        print(f"Corpus Count Error: {e}")
+        return None
+    return sum(1 + math.ceil(total / MAX_PAGE) for total in totals) + 1
+
+
+def choose_scan_mode(n_skus: int, start: date, end: date, mode: str = AUTO, directory: str = CORPUS_DIR) -> tuple[str, str]:
+    """
+    Returns (mode, reason). AUTO compares the estimated time of per-SKU
+    searching with a corpus fetch; a corpus already stored for the window is free.
+    """
+    if mode in (PER_SKU, CORPUS):
+        return mode, "selected"
+    if n_skus < MIN_CORPUS_SKUS:
+        return PER_SKU, f"{n_skus} SKUs"
+    if os.path.exists(corpus_path(start, end, directory)):
+        return CORPUS, "corpus for this window already stored"
+    pages = estimate_corpus_requests(start, end)
+    if pages is None:
+        chosen = CORPUS if n_skus >= CORPUS_FIRST_MIN_SKUS else PER_SKU
+        return chosen, f"{n_skus} SKUs (window counts unavailable)"
+    per_sku_s = n_skus * EST_REQUESTS_PER_SKU * REQUEST_S
+    corpus_s = pages * PAGE_S
+    chosen = CORPUS if corpus_s < per_sku_s else PER_SKU
+    return chosen, f"~{per_sku_s:.0f}s of per-SKU searches vs ~{corpus_s:.0f}s corpus fetch"
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 """Regulatory data aggregation and normalization."""
 
+import math
 from datetime import date, datetime
 from typing import Any, Dict, Iterable, List, Optional, Sequence
 
@@ -9,11 +10,27 @@ import pandas as pd
 import requests
 
 from src.search.cpsc import cpsc_search
-from src.search.health_agency_feeds import fetch_agency_alerts
+from src.search.health_agency_feeds import FEEDS, fetch_agency_alerts
 from src.search.google_cse import google_search
-from src.search.openfda import search_device_enforcement, search_device_recall
+from src.search.openfda import (
+    count_device_enforcement,
+    count_device_recall,
+    count_device_recall_by_code,
+    search_device_enforcement,
+    search_device_enforcement_by_recall_number,
+    search_device_recall,
+    search_device_recall_by_code,
+)
+from src.search.query_ast import CSE, OPENFDA, SearchQuery, collapse_variants, to_cse, to_rss
 from src.services.adverse_event_service import AdverseEventService
+from src.services.concurrency import limited, source_slot
+from src.services.date_normalization import apply_date_window
 from src.services.media_service import MediaMonitoringService
+from src.services.near_duplicates import collapse_near_duplicates
+from src.services.product_codes import get_product_code_index
+from src.services.query_planner import RUN, SKIP, PlanEntry, QueryPlan, plan_source
+from src.services.result_schema import enforce_result_schema
+from src.services.synonyms import expand_synonyms
 
 
 def _as_date(value: Any) -> Optional[date]:
@@ -28,7 +45,32 @@ def _safe_list(items: Optional[Iterable[str]]) -> List[str]:
     return [str(x).strip() for x in items or [] if str(x).strip()]
 
 
+def _search_window(start_date: Any, end_date: Any) -> tuple[date, date]:
+    start_dt = _as_date(start_date) or date.today().replace(year=date.today().year - DEFAULT_LOOKBACK_YEARS)
+    end_dt = _as_date(end_date) or date.today()
+    if start_dt > end_dt:
+        start_dt, end_dt = end_dt, start_dt
+    return start_dt, end_dt
+
+
+def _code_label(product_codes: Sequence[str]) -> str:
+    return "product_code:" + ",".join(product_codes)
+
+
+def _is_code_label(term: str) -> bool:
+    return term.startswith("product_code:")
+
+
+def _safe_total(counter: Any, *args: Any) -> Optional[int]:
+    try:
+        return counter(*args)
+    except Exception as e:
+        print(f"openFDA Count Error: {e}")
+        return None
+
+
 DEFAULT_LOOKBACK_YEARS = 3
+RECALL_NUMBER_BATCH = 50
 
 
 class RegulatoryService:
@@ -53,26 +95,6 @@ class RegulatoryService:
         "un.org/securitycouncil",
     ]
 
-    SYNONYM_MAP = {
-        "bpm": ["blood pressure monitor", "bp monitor", "sphygmomanometer"],
-        "blood pressure monitor": ["bpm", "bp monitor", "blood pressure machine"],
-        "scooter": ["mobility scooter", "powered scooter", "electric scooter"],
-        "pacemaker": ["cardiac pacemaker", "implantable pacemaker"],
-        "defibrillator": [
-            "aed",
-            "automated external defibrillator",
-            "icd",
-            "implantable cardioverter defibrillator",
-        ],
-        "infusion pump": ["iv pump", "syringe pump", "intravenous pump"],
-        "insulin pump": ["diabetes pump", "csii pump"],
-        "ventilator": ["respirator", "mechanical ventilator"],
-        "catheter": ["urinary catheter", "central line", "iv catheter"],
-        "syringe": ["syringe", "pre-filled syringe", "prefilled syringe"],
-        "glucometer": ["glucose meter", "blood glucose monitor"],
-        "sterilizer": ["autoclave", "steam sterilizer"],
-    }
-
     @classmethod
     def search_all_sources(
         cls,
@@ -87,13 +109,30 @@ class RegulatoryService:
         vendor_only: bool = False,
         include_sanctions: bool = True,
         extra_terms: Optional[Sequence[str]] = None,
+        query_plan: Optional[QueryPlan] = None,
+        hazard_keywords: Optional[Sequence[str]] = None,
     ) -> tuple[pd.DataFrame, dict]:
         """
         Main entry point.
         mode: 'fast' (APIs + Structured) or 'powerful' (adds web/media coverage)
+        query_plan: a plan from plan_search (e.g. shown as a dry run). When omitted, the
+        plan is built without count requests: every prepared term runs.
+        hazard_keywords: OR'd into web and news queries only; never part of a product phrase.
+        Sources that failed are listed in attrs["failed_sources"] (see
+        result_schema.failed_sources); their records are missing.
         """
         results: List[Dict[str, Any]] = []
         status_log: Dict[str, int] = {}
+        failed: List[str] = []
+
+        def fetch(source: str, fn, *args, **kwargs):
+            with source_slot(source):
+                try:
+                    return fn(*args, **kwargs)
+                except Exception as e:
+                    print(f"Regulatory Search Error ({source}): {e}")
+                    failed.append(source)
+                    return None
 
         regions = regions or ["US", "EU", "UK", "CA", "LATAM", "APAC"]
         query_term = (query_term or "").strip()
@@ -101,65 +140,179 @@ class RegulatoryService:
         if not query_term and not manufacturer:
             return pd.DataFrame(), {"Error": 0}
 
-        start_dt = _as_date(start_date) or date.today().replace(year=date.today().year - DEFAULT_LOOKBACK_YEARS)
-        end_dt = _as_date(end_date) or date.today()
-        if start_dt > end_dt:
-            start_dt, end_dt = end_dt, start_dt
+        start_dt, end_dt = _search_window(start_date, end_date)
         is_powerful = mode == "powerful"
         max_terms = 12 if is_powerful else 10
 
         terms = cls.prepare_terms(query_term, manufacturer, max_terms=max_terms, extra_terms=extra_terms)
 
+        plan = query_plan or cls.plan_search(
+            query_term,
+            manufacturer=manufacturer,
+            regions=regions,
+            start_date=start_dt,
+            end_date=end_dt,
+            mode=mode,
+            vendor_only=vendor_only,
+            include_sanctions=include_sanctions,
+            extra_terms=extra_terms,
+            limit=limit,
+            hazard_keywords=hazard_keywords,
+            estimate=False,
+        )
+        product_codes = plan.product_codes
+        hazard_keywords = _safe_list(hazard_keywords)
+
         if not vendor_only:
-            fda_recalls = cls._fetch_openfda_device_recalls(terms, limit, start_dt, end_dt)
+            recall_terms = plan.terms_for("FDA Device Recalls")
+            enf_terms = plan.terms_for("FDA Enforcement")
+            fda_recalls: List[Dict[str, Any]] = []
+            fda_enf: List[Dict[str, Any]] = []
+            if product_codes and _code_label(product_codes) in recall_terms:
+                by_code = fetch("FDA Device Recalls", cls._fetch_openfda_by_product_code, product_codes, query_term, limit, start_dt, end_dt)
+                fda_recalls, fda_enf = by_code or ([], [])
+            text_recall_terms = [t for t in recall_terms if not _is_code_label(t)]
+            fda_recalls.extend(fetch("FDA Device Recalls", cls._fetch_openfda_device_recalls, text_recall_terms, limit, start_dt, end_dt) or [])
+            text_enf_terms = [t for t in enf_terms if not _is_code_label(t)]
+            fda_enf.extend(fetch("FDA Enforcement", cls._fetch_openfda_enforcement, text_enf_terms, limit, start_dt, end_dt) or [])
             results.extend(fda_recalls)
             status_log["FDA Device Recalls"] = len(fda_recalls)
-
-            fda_enf = cls._fetch_openfda_enforcement(terms, limit, start_dt, end_dt)
             results.extend(fda_enf)
             status_log["FDA Enforcement"] = len(fda_enf)
 
             maude_service = AdverseEventService()
-            maude_hits = maude_service.search_events(query_term or manufacturer, start_dt, end_dt, limit=30)
+            maude_hits = fetch(
+                "FDA MAUDE",
+                maude_service.search_events,
+                query_term or manufacturer,
+                start_dt,
+                end_dt,
+                limit=30,
+                product_codes=product_codes,
+                raise_errors=True,
+            ) or []
             for item in maude_hits:
                 item["Matched_Term"] = query_term or manufacturer
             results.extend(maude_hits)
             status_log["FDA MAUDE"] = len(maude_hits)
 
-            cpsc_hits = cls._fetch_cpsc(terms, start_dt, end_dt, limit=limit)
+            cpsc_hits = fetch("CPSC Recalls", cls._fetch_cpsc, terms, start_dt, end_dt, limit=limit) or []
             results.extend(cpsc_hits)
             status_log["CPSC Recalls"] = len(cpsc_hits)
 
         if include_sanctions and manufacturer:
-            sanctions_hits = cls._search_sanctions(manufacturer, limit=limit)
+            sanctions_hits = fetch("Sanctions & Watchlists", cls._search_sanctions, manufacturer, limit=limit) or []
             results.extend(sanctions_hits)
             status_log["Sanctions & Watchlists"] = len(sanctions_hits)
-            ofac_hits = cls._search_ofac(manufacturer, limit=limit)
+            ofac_hits = fetch("OFAC Sanctions", cls._search_ofac, manufacturer, limit=limit) or []
             results.extend(ofac_hits)
             status_log["OFAC Sanctions"] = len(ofac_hits)
 
         if is_powerful:
-            web_hits = cls._safe_regulatory_web_search(terms, regions, limit=limit)
+            web_hits = fetch(
+                "Regulatory Web", cls._safe_regulatory_web_search, terms, regions, limit=limit, hazard_keywords=hazard_keywords
+            ) or []
             results.extend(web_hits)
             status_log["Regulatory Web"] = len(web_hits)
 
-            agency_hits = cls._search_global_agencies(terms, regions, limit=limit)
+            agency_hits = fetch("Global Health Agencies", cls._search_global_agencies, terms, regions, limit=limit) or []
             results.extend(agency_hits)
             status_log["Global Health Agencies"] = len(agency_hits)
 
-            media_hits = cls._search_media(query_term or manufacturer, regions)
+            media_hits = fetch("Media Signals", cls._search_media, query_term or manufacturer, regions, hazard_keywords) or []
             results.extend(media_hits)
             status_log["Media Signals"] = len(media_hits)
 
         df = pd.DataFrame(results)
         if df.empty:
+            df.attrs["failed_sources"] = failed
             return df, status_log
 
         df = cls._dedupe(df)
+        df = collapse_near_duplicates(df)
         df = cls._normalize_columns(df)
+        df = enforce_result_schema(df)
+        df = apply_date_window(df, start_dt, end_dt)
         df.sort_values(by="Date", ascending=False, inplace=True, ignore_index=True)
+        df.attrs["product_codes"] = product_codes
+        df.attrs["failed_sources"] = failed
         return df, status_log
 
+    @classmethod
+    def plan_search(
+        cls,
+        query_term: str,
+        manufacturer: Optional[str] = None,
+        regions: Optional[List[str]] = None,
+        start_date: Any = None,
+        end_date: Any = None,
+        mode: str = "fast",
+        vendor_only: bool = False,
+        include_sanctions: bool = True,
+        extra_terms: Optional[Sequence[str]] = None,
+        limit: int = 300,
+        hazard_keywords: Optional[Sequence[str]] = None,
+        estimate: bool = True,
+    ) -> QueryPlan:
+        """
+        Dry run of search_all_sources. openFDA terms are estimated with count
+        requests, zero-yield terms are skipped and the rest ordered by marginal
+        yield. Sources without a cheap count get their request cost only.
+        estimate=False spends no count requests and runs every prepared term.
+        """
+        plan = QueryPlan()
+        regions = regions or ["US", "EU", "UK", "CA", "LATAM", "APAC"]
+        query_term = (query_term or "").strip()
+        manufacturer = (manufacturer or "").strip()
+        if not query_term and not manufacturer:
+            return plan
+
+        start_dt, end_dt = _search_window(start_date, end_date)
+        is_powerful = mode == "powerful"
+        max_terms = 12 if is_powerful else 10
+        # Estimate a wider candidate pool than will run, so the cap keeps the best terms.
+        candidates = cls.prepare_terms(query_term, manufacturer, max_terms=max_terms * 2, extra_terms=extra_terms)
+        terms = candidates[:max_terms]
+
+        if not vendor_only:
+            plan.product_codes = get_product_code_index().product_codes(query_term) if query_term else []
+            if plan.product_codes:
+                # The code clause covers the product; only the manufacturer still needs a text query.
+                label = _code_label(plan.product_codes)
+                recalls = (
+                    _safe_total(limited("FDA Device Recalls", count_device_recall_by_code), plan.product_codes, start_dt, end_dt)
+                    if estimate
+                    else None
+                )
+                plan.entries.append(PlanEntry("FDA Device Recalls", label, 1, recalls, recalls, RUN if recalls != 0 else SKIP))
+                batches = max(1, math.ceil(min(recalls or limit, limit) / RECALL_NUMBER_BATCH))
+                plan.entries.append(PlanEntry("FDA Enforcement", label, batches, action=RUN if recalls != 0 else SKIP))
+            # Text queries run next to the code query: recalls filed under another or no product code
+            # are found by name only.
+            text_terms = collapse_variants(candidates if estimate else terms, OPENFDA)
+            if text_terms and not estimate:
+                plan.add("FDA Device Recalls", text_terms[:max_terms])
+                plan.add("FDA Enforcement", text_terms[:max_terms])
+            elif text_terms:
+                count_recalls = limited("FDA Device Recalls", count_device_recall)
+                count_enforcement = limited("FDA Enforcement", count_device_enforcement)
+                plan_source(plan, "FDA Device Recalls", text_terms, lambda ts: count_recalls(ts, start_dt, end_dt), max_terms, limit)
+                plan_source(plan, "FDA Enforcement", text_terms, lambda ts: count_enforcement(ts, start_dt, end_dt), max_terms, limit)
+            plan.add("FDA MAUDE", [_code_label(plan.product_codes) if plan.product_codes else query_term or manufacturer])
+            plan.add("CPSC Recalls", terms)
+
+        if include_sanctions and manufacturer:
+            plan.add("Sanctions & Watchlists", [manufacturer], len(cls.SANCTIONS_DOMAINS))
+            plan.add("OFAC Sanctions", [manufacturer])
+
+        if is_powerful:
+            domains = sum(len(cls.REGIONAL_DOMAINS.get(region, [])) for region in regions)
+            plan.add("Regulatory Web", collapse_variants(terms, CSE), domains)
+            feeds = sum(1 for feed in FEEDS if feed.region.upper() in {r.upper() for r in regions})
+            plan.add("Global Health Agencies", ["all terms"], feeds)
+            plan.add("Media Signals", [query_term or manufacturer], len(regions))
+        return plan
+
     @classmethod
     def search_all_sources_safe(cls, **kwargs: Any) -> tuple[pd.DataFrame, dict]:
         try:
@@ -203,19 +356,15 @@ class RegulatoryService:
             return []
         normalized = term.strip()
         lower_term = normalized.lower()
-        expanded = {normalized}
-
-        if lower_term in cls.SYNONYM_MAP:
-            expanded.update(cls.SYNONYM_MAP[lower_term])
-
-        for key, synonyms in cls.SYNONYM_MAP.items():
-            if key in lower_term:
-                expanded.update(synonyms)
+        # Ordered so the user's own term survives the max_terms cut.
+        expanded = dict.fromkeys([normalized])
 
         if "-" in normalized:
-            expanded.add(normalized.replace("-", " "))
+            expanded[normalized.replace("-", " ")] = None
         if " " in normalized:
-            expanded.add(normalized.replace(" ", "-"))
+            expanded[normalized.replace(" ", "-")] = None
+
+        expanded.update(dict.fromkeys(expand_synonyms(lower_term)))
 
         return [t for t in expanded if t]
 
@@ -236,25 +385,7 @@ class RegulatoryService:
         results: List[Dict[str, Any]] = []
         for term in terms:
             hits = search_device_recall(term, start, end, limit=limit)
-            for hit in hits:
-                recall_number = hit.get("recall_number", "")
-                reason = hit.get("reason_for_recall", "")
-                classification = hit.get("classification", "")
-                record = {
-                    "Source": "FDA Device Recall",
-                    "Date": hit.get("report_date", ""),
-                    "Product": hit.get("product_description", ""),
-                    "Description": hit.get("product_description", ""),
-                    "Reason": reason,
-                    "Firm": hit.get("recalling_firm", ""),
-                    "Model Info": hit.get("model_number", "") or hit.get("code_info", ""),
-                    "ID": recall_number,
-                    "Link": cls._openfda_link("recall", recall_number),
-                    "Status": hit.get("status", ""),
-                    "Risk_Level": cls._risk_from_classification(classification),
-                    "Matched_Term": term,
-                }
-                results.append(record)
+            results.extend(cls._openfda_record(hit, "FDA Device Recall", "recall", term) for hit in hits)
             if len(results) >= limit:
                 break
         return results
@@ -264,71 +395,86 @@ class RegulatoryService:
         results: List[Dict[str, Any]] = []
         for term in terms:
             hits = search_device_enforcement(term, start, end, limit=limit)
-            for hit in hits:
-                recall_number = hit.get("recall_number", "")
-                reason = hit.get("reason_for_recall", "")
-                classification = hit.get("classification", "")
-                record = {
-                    "Source": "FDA Enforcement",
-                    "Date": hit.get("report_date", ""),
-                    "Product": hit.get("product_description", ""),
-                    "Description": hit.get("product_description", ""),
-                    "Reason": reason,
-                    "Firm": hit.get("recalling_firm", ""),
-                    "Model Info": hit.get("model_number", "") or hit.get("code_info", ""),
-                    "ID": recall_number,
-                    "Link": cls._openfda_link("enforcement", recall_number),
-                    "Status": hit.get("status", ""),
-                    "Risk_Level": cls._risk_from_classification(classification),
-                    "Matched_Term": term,
-                }
-                results.append(record)
+            results.extend(cls._openfda_record(hit, "FDA Enforcement", "enforcement", term) for hit in hits)
             if len(results) >= limit:
                 break
         return results
 
+    @classmethod
+    def _openfda_record(cls, hit: Dict[str, Any], source: str, category: str, term: str) -> Dict[str, Any]:
+        recall_number = hit.get("recall_number", "") or hit.get("product_res_number", "")
+        return {
+            "Source": source,
+            "Date": hit.get("report_date", ""),
+            "Product": hit.get("product_description", ""),
+            "Description": hit.get("product_description", ""),
+            "Reason": hit.get("reason_for_recall", ""),
+            "Firm": hit.get("recalling_firm", ""),
+            "Model Info": hit.get("model_number", "") or hit.get("code_info", ""),
+            "ID": recall_number,
+            "Link": cls._openfda_link(category, recall_number),
+            "Status": hit.get("status", ""),
+            "Risk_Level": cls._risk_from_classification(hit.get("classification", "")),
+            "Matched_Term": term,
+        }
+
+    @classmethod
+    def _fetch_openfda_by_product_code(
+        cls, product_codes: Sequence[str], term: str, limit: int, start: date, end: date
+    ) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Recalls by exact product code, then the enforcement reports for those recalls."""
+        hits = search_device_recall_by_code(list(product_codes), start, end, limit=limit)
+        recalls = [cls._openfda_record(hit, "FDA Device Recall", "recall", term) for hit in hits]
+
+        recall_numbers = list(dict.fromkeys(r["ID"] for r in recalls if r["ID"]))
+        enforcement: List[Dict[str, Any]] = []
+        for i in range(0, len(recall_numbers), RECALL_NUMBER_BATCH):
+            batch = recall_numbers[i:i + RECALL_NUMBER_BATCH]
+            hits = search_device_enforcement_by_recall_number(batch, start, end, limit=len(batch))
+            enforcement.extend(cls._openfda_record(hit, "FDA Enforcement", "enforcement", term) for hit in hits)
+        return recalls, enforcement
+
     @classmethod
     def _fetch_cpsc(cls, terms: Sequence[str], start: date, end: date, limit: int = 100) -> List[Dict[str, Any]]:
         results: List[Dict[str, Any]] = []
         for term in terms:
-            hits = cpsc_search(term, start, end, limit=limit)
-            for hit in hits:
-                record = {
-                    "Source": "CPSC Recall",
-                    "Date": hit.get("RecallDate", ""),
-                    "Product": hit.get("Title", ""),
-                    "Description": hit.get("Title", ""),
-                    "Reason": hit.get("Description", ""),
-                    "Firm": hit.get("Manufacturer", ""),
-                    "Model Info": hit.get("ProductID", ""),
-                    "ID": hit.get("RecallID", ""),
-                    "Link": hit.get("URL", ""),
-                    "Status": hit.get("Status", ""),
-                    "Risk_Level": "Medium",
-                    "Matched_Term": term,
-                }
-                results.append(record)
+            hits = cpsc_search(term, start, end, limit=limit, raise_errors=True)
+            results.extend(cls._cpsc_record(hit, term) for hit in hits)
             if len(results) >= limit:
                 break
         return results
 
+    @staticmethod
+    def _cpsc_record(hit: Dict[str, Any], term: str) -> Dict[str, Any]:
+        return {
+            "Source": "CPSC Recall",
+            "Date": hit.get("RecallDate", ""),
+            "Product": hit.get("Title", ""),
+            "Description": hit.get("Title", ""),
+            "Reason": hit.get("Description", ""),
+            "Firm": hit.get("Manufacturer", ""),
+            "Model Info": hit.get("ProductID", ""),
+            "ID": hit.get("RecallID", ""),
+            "Link": hit.get("URL", ""),
+            "Status": hit.get("Status", ""),
+            "Risk_Level": "Medium",
+            "Matched_Term": term,
+        }
+
     @classmethod
     def _search_sanctions(cls, manufacturer: str, limit: int = 50) -> List[Dict[str, Any]]:
         results: List[Dict[str, Any]] = []
         for domain in cls.SANCTIONS_DOMAINS:
-            results.extend(cls._google_search(f'"{manufacturer}" site:{domain}', category="Sanctions", num=limit))
+            results.extend(cls._google_search(f'"{manufacturer}" site:{domain}', category="Sanctions", num=limit, raise_errors=True))
         return results[:limit]
 
     @classmethod
     def _search_ofac(cls, manufacturer: str, limit: int = 50) -> List[Dict[str, Any]]:
         results: List[Dict[str, Any]] = []
         url = "https://www.treasury.gov/ofac/downloads/sdn.csv"
-        try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            lines = response.text.splitlines()
-        except Exception:
-            return results
+        response = requests.get(url, timeout=30)
+        response.raise_for_status()
+        lines = response.text.splitlines()
 
         for line in lines[1:]:
             fields = line.split(",")
@@ -356,13 +502,19 @@ class RegulatoryService:
         return results
 
     @classmethod
-    def _search_media(cls, query_term: str, regions: Sequence[str]) -> List[Dict[str, Any]]:
+    def _search_media(
+        cls, query_term: str, regions: Sequence[str], hazard_keywords: Sequence[str] = ()
+    ) -> List[Dict[str, Any]]:
         if not query_term:
             return []
         media_svc = MediaMonitoringService()
+        rss_query = to_rss(SearchQuery.build([query_term], hazard_keywords=hazard_keywords))[0]
         results: List[Dict[str, Any]] = []
         for region in regions:
-            results.extend(media_svc.search_media(query_term, limit=10, region=region))
+            for item in media_svc.search_media(rss_query, limit=10, region=region, raise_errors=True):
+                item["Product"] = query_term
+                item["Matched_Term"] = query_term
+                results.append(item)
         return results
 
     @classmethod
@@ -371,12 +523,13 @@ class RegulatoryService:
         terms: Sequence[str],
         regions: Sequence[str],
         limit: int = 50,
+        hazard_keywords: Sequence[str] = (),
     ) -> List[Dict[str, Any]]:
         search_fn = getattr(cls, "_search_regulatory_web", None)
         if not callable(search_fn):
             return []
         try:
-            return search_fn(terms, regions, limit=limit)
+            return search_fn(terms, regions, limit=limit, hazard_keywords=hazard_keywords)
         except AttributeError:
             return []
 
@@ -386,15 +539,17 @@ class RegulatoryService:
         terms: Sequence[str],
         regions: Sequence[str],
         limit: int = 50,
+        hazard_keywords: Sequence[str] = (),
     ) -> List[Dict[str, Any]]:
         if not terms:
             return []
         results: List[Dict[str, Any]] = []
         query_specs: List[tuple[str, str]] = []
-        for term in terms:
+        for term in collapse_variants(terms, CSE):
+            term_query = SearchQuery.build([term], hazard_keywords=hazard_keywords)
             for region in regions:
                 for domain in cls.REGIONAL_DOMAINS.get(region, []):
-                    query_specs.append((f"\"{term}\" site:{domain}", region))
+                    query_specs.append((to_cse(term_query, site=domain)[0], region))
 
         for query, region in query_specs:
             remaining = limit - len(results)
@@ -406,6 +561,7 @@ class RegulatoryService:
                     query,
                     category=f"Regulatory Web ({region})",
                     num=per_query_limit,
+                    raise_errors=True,
                 )
             )
         return results[:limit]
@@ -419,11 +575,11 @@ class RegulatoryService:
     ) -> List[Dict[str, Any]]:
         if not terms:
             return []
-        return fetch_agency_alerts(terms, regions, limit=limit)
+        return fetch_agency_alerts(terms, regions, limit=limit, raise_errors=True)
 
     @staticmethod
-    def _google_search(query: str, category: str = "Web Search", num: int = 10) -> List[Dict[str, Any]]:
-        hits = google_search(query, num=min(max(num, 1), 10), pages=2)
+    def _google_search(query: str, category: str = "Web Search", num: int = 10, raise_errors: bool = False) -> List[Dict[str, Any]]:
+        hits = google_search(query, num=min(max(num, 1), 10), pages=2, raise_errors=raise_errors)
         return RegulatoryService._google_hits_to_records(hits, category, query)
 
     @staticmethod
@@ -495,20 +651,17 @@ class RegulatoryService:
 
     @staticmethod
     def _dedupe(df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-        id_series = df["ID"].fillna("").astype(str) if "ID" in df.columns else pd.Series("", index=df.index)
-        link_series = df["Link"].fillna("").astype(str) if "Link" in df.columns else pd.Series("", index=df.index)
-        product_series = df["Product"].fillna("").astype(str) if "Product" in df.columns else pd.Series("", index=df.index)
+        empty = pd.Series("", index=df.index)
+        id_series = df["ID"].fillna("").astype(str) if "ID" in df.columns else empty
+        link_series = df["Link"].fillna("").astype(str) if "Link" in df.columns else empty
+        product_series = df["Product"].fillna("").astype(str) if "Product" in df.columns else empty
 
         dedupe_key = id_series.where(id_series != "", link_series.where(link_series != "", product_series))
-        df["__dedupe_key"] = dedupe_key
-        df = df.drop_duplicates(subset=["__dedupe_key"])
-        df.drop(columns="__dedupe_key", inplace=True)
-        return df
+        return df.loc[~dedupe_key.duplicated().to_numpy()]
 
     @staticmethod
     def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
+        """Fills expected columns in place; `df` must be owned by the caller."""
         if "Manufacturer" not in df.columns and "Firm" in df.columns:
             df["Manufacturer"] = df["Firm"]
         if "Model Info" not in df.columns and "Model_Numbers" in df.columns:
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+"""Canonical, compact dtypes for regulatory search results."""
+
+from typing import List
+
+import pandas as pd
+import pyarrow as pa
+
+from src.services.date_normalization import normalize_dates
+
+RISK_LEVELS = ["High", "Medium", "Low", "TBD"]
+
+# Repeated labels: stored once per category instead of once per row.
+CATEGORICAL_COLUMNS = ["Source", "Status", "Matched_Term", "Firm", "Manufacturer", "Recall_Class"]
+
+# Free text: Arrow-backed strings are far smaller than Python object strings.
+TEXT_COLUMNS = ["Product", "Description", "Reason", "Model Info", "ID", "Link"]
+
+LIST_COLUMNS = ["Linked_Sources", "Linked_Links", "Linked_IDs", "Linked_Products"]
+
+INT_COLUMNS = {"Duplicate_Count": "Int32"}
+
+REQUIRED_COLUMNS = ["Source", "Date", "Product", "Description", "Reason", "Firm", "Model Info", "ID", "Link", "Status", "Risk_Level", "Matched_Term"]
+
+TEXT_DTYPE = "string[pyarrow]"
+LIST_DTYPE = pd.ArrowDtype(pa.list_(pa.string()))
+RISK_DTYPE = pd.CategoricalDtype(RISK_LEVELS, ordered=True)
+
+
+def enforce_result_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts a results frame to the canonical schema, column by column and
+    in place. Call once, at the end of the search pipeline.
+    """
+    for col in REQUIRED_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+
+    normalize_dates(df)
+    df["Risk_Level"] = df["Risk_Level"].astype(object).where(df["Risk_Level"].isin(RISK_LEVELS), "TBD").astype(RISK_DTYPE)
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].fillna("").astype(str).astype("category")
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].fillna("").astype(str).astype(TEXT_DTYPE)
+    for col in LIST_COLUMNS:
+        if col in df.columns and df[col].dtype == object:
+            df[col] = pd.Series(pa.array(df[col].tolist(), type=pa.list_(pa.string())), index=df.index, dtype=LIST_DTYPE)
+    for col, dtype in INT_COLUMNS.items():
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+    return df
+
+
+def failed_sources(df: pd.DataFrame) -> List[str]:
+    """Sources whose fetch failed, so `df` is missing their records for its window."""
+    return list(df.attrs.get("failed_sources", []))
+
+
+def format_date(value) -> str:
+    """Display helper for the parsed Date column."""
+    if value is None or pd.isna(value):
+        return "N/A"
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+"""Arrow interchange for search results: pandas handoff, exports and saved searches."""
+
+import io
+import os
+import re
+from datetime import datetime
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+SAVED_SEARCH_DIR = os.path.join("data", "saved_searches")
+
+
+def _types_mapper(arrow_type: pa.DataType) -> Optional[object]:
+    # Keep strings and lists Arrow-backed so to_frame() shares buffers with the table.
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype("pyarrow")
+    if pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def to_arrow(df: pd.DataFrame) -> pa.Table:
+    """Arrow-backed and categorical columns convert without re-encoding."""
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def to_frame(table: pa.Table) -> pd.DataFrame:
+    """Dictionary columns come back as categoricals, strings/lists stay Arrow-backed."""
+    return table.to_pandas(types_mapper=_types_mapper)
+
+
+def to_parquet_bytes(table: pa.Table) -> bytes:
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression="zstd")
+    return buffer.getvalue()
+
+
+def frame_to_bytes(df: pd.DataFrame) -> bytes:
+    """Parquet bytes for storing a frame in a database column."""
+    try:
+        return to_parquet_bytes(to_arrow(df))
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # Mixed-type object columns (e.g. lists next to strings) are stored as text.
+        objects = df.select_dtypes(include="object").columns
+        return to_parquet_bytes(to_arrow(df.astype({c: str for c in objects})))
+
+
+def frame_from_bytes(blob: Optional[bytes]) -> pd.DataFrame:
+    return pd.read_parquet(io.BytesIO(blob)) if blob else pd.DataFrame()
+
+
+def to_feather_bytes(table: pa.Table) -> bytes:
+    buffer = io.BytesIO()
+    feather.write_feather(table, buffer, compression="zstd")
+    return buffer.getvalue()
+
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", name.strip()).strip("_") or "search"
+
+
+def save_search(table: pa.Table, name: str, directory: str = SAVED_SEARCH_DIR) -> str:
+    """
+    Writes an uncompressed Arrow IPC (Feather v2) file so load_search can
+    memory-map it instead of reading it into memory.
+    """
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(directory, f"{_safe_name(name)}_{stamp}.arrow")
+    feather.write_feather(table, path, compression="uncompressed")
+    return path
+
+
+def list_saved_searches(directory: str = SAVED_SEARCH_DIR) -> List[str]:
+    if not os.path.isdir(directory):
+        return []
+    return sorted((f for f in os.listdir(directory) if f.endswith(".arrow")), reverse=True)
+
+
+def load_search(filename: str, directory: str = SAVED_SEARCH_DIR) -> pa.Table:
+    source = pa.memory_map(os.path.join(directory, os.path.basename(filename)), "r")
+    return pa.ipc.open_file(source).read_all()
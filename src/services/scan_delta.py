@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+"""
+Delta bulk scans: each SKU's watermark (the window end it was last scanned
+through) narrows the next search window, and the records already reported
+for the SKU are suppressed unless they changed.
+
+Watermarks are per SKU rather than per source: one term search queries every
+source over the same window. Each reported record keeps its source and date,
+so the newest record per SKU and source is read from that ledger.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from src.services.scan_store import ScanStore
+
+# Days re-searched before a watermark, for records published after their own date.
+DELTA_OVERLAP_DAYS = 14
+
+NEW = "New"
+UPDATED = "Updated"
+
+
+def _text(value: Any) -> str:
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return ""
+    return str(value).strip()
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha1("\x1f".join(_text(p) for p in parts).encode("utf-8")).hexdigest()[:16]
+
+
+def record_id(hit: pd.Series) -> str:
+    """The source's own record ID when it has one, else a hash of what identifies the record."""
+    source = _text(hit.get("Source"))
+    own_id = _text(hit.get("ID"))
+    if own_id and own_id.upper() != "N/A":
+        return f"{source}:{own_id}"
+    return f"{source}:{_digest(hit.get('Date'), hit.get('Product'), hit.get('Link'))}"
+
+
+def record_fingerprint(hit: pd.Series) -> str:
+    """Changes when a seen record is revised (status, reason, date or product text)."""
+    return _digest(hit.get("Date"), hit.get("Status"), hit.get("Reason"), hit.get("Product"))
+
+
+def _as_date(value: Any) -> Optional[date]:
+    try:
+        stamp = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        return None
+    return None if pd.isna(stamp) else stamp.date()
+
+
+def _like(value: date, template: Any) -> Any:
+    """`value` as the same type as the caller's window bound (date or datetime)."""
+    if isinstance(template, datetime):
+        return datetime.combine(value, datetime.min.time())
+    return value
+
+
+@dataclass
+class ScanDelta:
+    start: Any
+    end: Any
+    # SKU -> window end its last delta scan covered (ISO date).
+    scanned_through: Dict[str, str] = field(default_factory=dict)
+    # Changes whenever these SKUs' delta state is committed; part of the scan's checkpoint key.
+    revision: str = ""
+    # (SKU, record ID) -> fingerprint of every record already reported.
+    seen: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    overlap_days: int = DELTA_OVERLAP_DAYS
+    # (SKU, source, record ID, fingerprint, record date) of this run's matches, written on success.
+    ledger: List[tuple] = field(default_factory=list)
+    new: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @classmethod
+    def load(cls, store: ScanStore, skus: Iterable[str], start: Any, end: Any) -> "ScanDelta":
+        skus = list(dict.fromkeys(skus))
+        watermarks = store.load_watermarks(skus)
+        revision = _digest(*(f"{sku}={through}@{updated}" for sku, (through, updated) in sorted(watermarks.items())))
+        return cls(
+            start,
+            end,
+            scanned_through={sku: through for sku, (through, _) in watermarks.items()},
+            revision=revision if watermarks else "",
+            seen=store.load_seen(skus),
+        )
+
+    def since(self, sku: str) -> Any:
+        """
+        Start of the window this SKU still needs: its watermark less the overlap,
+        never before start nor after end. A SKU without a watermark needs all of it.
+        """
+        through = _as_date(self.scanned_through.get(sku))
+        start, end = _as_date(self.start), _as_date(self.end)
+        if through is None or start is None:
+            return self.start
+        since = through - timedelta(days=self.overlap_days)
+        if end is not None:
+            since = min(since, end)
+        if since <= start:
+            return self.start
+        return _like(since, self.start)
+
+    def window_start(self, skus: Iterable[str]) -> Any:
+        """The earliest start any of these SKUs needs (a shared term is searched once for all of them)."""
+        starts = [self.since(sku) for sku in skus]
+        if not starts or self.start is None:
+            return self.start
+        return min(starts, key=_as_date)
+
+    def narrowed(self) -> int:
+        return sum(1 for sku in self.scanned_through if self.since(sku) != self.start)
+
+    def filter(self, results: pd.DataFrame, matched_hits: pd.DataFrame) -> pd.DataFrame:
+        """
+        Keeps the result rows whose record is new for the SKU or changed since it
+        was reported, tagged in a Change column. matched_hits is row-aligned with results.
+        """
+        if results.empty:
+            return results
+        changes = []
+        for sku, (_, hit) in zip(results["My SKU"].astype(str), matched_hits.iterrows()):
+            rid, fingerprint = record_id(hit), record_fingerprint(hit)
+            previous = self.seen.get((sku, rid))
+            if previous is None:
+                changes.append(NEW)
+                self.new += 1
+            elif previous != fingerprint:
+                changes.append(UPDATED)
+                self.updated += 1
+            else:
+                changes.append(None)
+                self.unchanged += 1
+            self.seen[(sku, rid)] = fingerprint
+            record_date = _as_date(hit.get("Date"))
+            self.ledger.append((sku, _text(hit.get("Source")), rid, fingerprint, record_date.isoformat() if record_date else ""))
+        results = results.assign(Change=changes)
+        return results[results["Change"].notna()].reset_index(drop=True)
+
+    def summary(self) -> str:
+        return (
+            f"Delta: {self.new} new and {self.updated} updated matches, {self.unchanged} already reported; "
+            f"{self.narrowed()} SKUs searched from their watermark"
+        )
+
+    def commit(self, store: ScanStore, skus: Iterable[str]) -> None:
+        """Advances the SKUs' watermarks to this run's end and records its matches; call only when the scan succeeded."""
+        store.record_delta(list(dict.fromkeys(skus)), (_as_date(self.end) or date.today()).isoformat(), self.ledger)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+"""Scan-wide search term planning: each distinct term is searched once and its hits fanned out to every SKU."""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def term_key(term: str) -> str:
+    """Case- and whitespace-insensitive identity of a search term."""
+    return _SPACE_RE.sub(" ", (term or "").strip()).casefold()
+
+
+@dataclass
+class ScanTermPlan:
+    # Distinct term key -> the spelling that is searched (first seen).
+    terms: Dict[str, str] = field(default_factory=dict)
+    # SKU position -> distinct term keys it needs, in its own order.
+    keys_by_product: List[List[str]] = field(default_factory=list)
+    requested: int = 0
+
+    @classmethod
+    def build(cls, product_terms: Sequence[Sequence[str]]) -> "ScanTermPlan":
+        plan = cls()
+        for terms in product_terms:
+            keys: List[str] = []
+            for term in terms:
+                key = term_key(term)
+                if not key or key in keys:
+                    continue
+                plan.terms.setdefault(key, term.strip())
+                keys.append(key)
+            plan.requested += len(keys)
+            plan.keys_by_product.append(keys)
+        return plan
+
+    @property
+    def unique(self) -> int:
+        return len(self.terms)
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Term searches requested per search actually run (1.0 = nothing shared)."""
+        return self.requested / self.unique if self.unique else 1.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.unique} unique search terms for {self.requested} SKU term requests "
+            f"({self.dedup_ratio:.1f}x dedup, {self.requested - self.unique} searches saved)"
+        )
+
+    def hits_for(self, pos: int, hits_by_key: Dict[str, Optional[pd.DataFrame]]) -> List[pd.DataFrame]:
+        """The cached hit frames of every term SKU `pos` asked for."""
+        frames = (hits_by_key.get(key) for key in self.keys_by_product[pos])
+        return [f for f in frames if f is not None and not f.empty]
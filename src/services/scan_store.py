@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+"""
+SQLite checkpoints for bulk scans: per-SKU keywords, per-term hits and final
+results, keyed by scan. Delta scans also keep per-SKU watermarks and the
+records already reported for each SKU, across scans.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.services.result_store import frame_from_bytes, frame_to_bytes
+
+SCAN_DB_PATH = os.path.join("data", "scan_jobs.sqlite")
+
+RUNNING = "running"
+COMPLETE = "complete"
+FAILED = "failed"
+
+# SKUs per query, under SQLite's bound-parameter limit.
+_IN_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    scan_id TEXT PRIMARY KEY,
+    name TEXT,
+    params TEXT,
+    total INTEGER,
+    status TEXT,
+    created_at TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS scan_products (
+    scan_id TEXT,
+    pos INTEGER,
+    product TEXT,
+    PRIMARY KEY (scan_id, pos)
+);
+CREATE TABLE IF NOT EXISTS scan_terms (
+    scan_id TEXT,
+    term_key TEXT,
+    term TEXT,
+    hits BLOB,
+    PRIMARY KEY (scan_id, term_key)
+);
+CREATE TABLE IF NOT EXISTS scan_results (
+    scan_id TEXT PRIMARY KEY,
+    results BLOB,
+    log TEXT
+);
+CREATE TABLE IF NOT EXISTS sku_watermarks (
+    sku TEXT PRIMARY KEY,
+    scanned_through TEXT,
+    updated_at TEXT
+);
+CREATE TABLE IF NOT EXISTS scan_seen (
+    sku TEXT,
+    record_id TEXT,
+    source TEXT,
+    fingerprint TEXT,
+    record_date TEXT,
+    first_seen TEXT,
+    last_seen TEXT,
+    PRIMARY KEY (sku, record_id)
+);
+"""
+
+
+def scan_key(content_digest: str, **params: Any) -> str:
+    """Same upload (by content digest) + same scan settings -> same scan, so a rerun resumes it."""
+    digest = hashlib.sha256(content_digest.encode("utf-8"))
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ScanStore:
+    """
+    One SQLite file shared by every scan. Writes are serialized with a lock;
+    connections are opened per call so the store can be used from any thread.
+    """
+
+    def __init__(self, path: str = SCAN_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _write(self, sql: str, args: tuple) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(sql, args)
+
+    def open_scan(self, scan_id: str, name: str, params: Dict[str, Any], total: int) -> bool:
+        """Registers the scan if new; returns True when it already existed (a resume)."""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._connect() as conn:
+            exists = conn.execute("SELECT 1 FROM scans WHERE scan_id = ?", (scan_id,)).fetchone() is not None
+            if exists:
+                conn.execute("UPDATE scans SET status = ?, updated_at = ? WHERE scan_id = ?", (RUNNING, now, scan_id))
+            else:
+                conn.execute(
+                    "INSERT INTO scans VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (scan_id, name, json.dumps(params, default=str), total, RUNNING, now, now),
+                )
+        return exists
+
+    def clear_scan(self, scan_id: str) -> None:
+        """Drops every checkpoint of the scan, so the next run starts over."""
+        with self._lock, self._connect() as conn:
+            for table in ("scans", "scan_products", "scan_terms", "scan_results"):
+                conn.execute(f"DELETE FROM {table} WHERE scan_id = ?", (scan_id,))
+
+    def set_status(self, scan_id: str, status: str) -> None:
+        self._write(
+            "UPDATE scans SET status = ?, updated_at = ? WHERE scan_id = ?",
+            (status, datetime.now().isoformat(timespec="seconds"), scan_id),
+        )
+
+    def save_products(self, scan_id: str, products: Dict[int, Dict[str, Any]]) -> None:
+        if not products:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO scan_products VALUES (?, ?, ?)",
+                [(scan_id, pos, json.dumps(product)) for pos, product in products.items()],
+            )
+
+    def load_products(self, scan_id: str) -> Dict[int, Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT pos, product FROM scan_products WHERE scan_id = ?", (scan_id,)).fetchall()
+        return {pos: json.loads(product) for pos, product in rows}
+
+    def save_term_hits(self, scan_id: str, term_key: str, term: str, hits: Optional[pd.DataFrame]) -> None:
+        blob = frame_to_bytes(hits) if hits is not None and not hits.empty else None
+        self._write("INSERT OR REPLACE INTO scan_terms VALUES (?, ?, ?, ?)", (scan_id, term_key, term, blob))
+
+    def load_term_hits(self, scan_id: str) -> Dict[str, pd.DataFrame]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT term_key, hits FROM scan_terms WHERE scan_id = ?", (scan_id,)).fetchall()
+        return {key: frame_from_bytes(blob) for key, blob in rows}
+
+    def save_results(self, scan_id: str, results: pd.DataFrame, log: List[str]) -> None:
+        self._write(
+            "INSERT OR REPLACE INTO scan_results VALUES (?, ?, ?)",
+            (scan_id, frame_to_bytes(results) if not results.empty else None, json.dumps(log)),
+        )
+        self.set_status(scan_id, COMPLETE)
+
+    def load_results(self, scan_id: str) -> Optional[tuple[pd.DataFrame, List[str]]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT results, log FROM scan_results WHERE scan_id = ?", (scan_id,)).fetchone()
+        if row is None:
+            return None
+        return frame_from_bytes(row[0]), json.loads(row[1] or "[]")
+
+    def list_scans(self) -> pd.DataFrame:
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                """
+                SELECT s.scan_id, s.name, s.status, s.total,
+                       (SELECT COUNT(*) FROM scan_products p WHERE p.scan_id = s.scan_id) AS skus_done,
+                       (SELECT COUNT(*) FROM scan_terms t WHERE t.scan_id = s.scan_id) AS terms_done,
+                       s.created_at, s.updated_at
+                FROM scans s ORDER BY s.updated_at DESC
+                """,
+                conn,
+            )
+
+    def _by_sku(self, sql: str, skus: Iterable[str], *args: Any) -> list:
+        """Rows of a `sku IN (...)` query, run in chunks of SKUs; `{skus}` in sql marks the list."""
+        skus = list(dict.fromkeys(skus))
+        rows = []
+        with self._connect() as conn:
+            for start in range(0, len(skus), _IN_CHUNK):
+                chunk = skus[start:start + _IN_CHUNK]
+                rows.extend(conn.execute(sql.format(skus=", ".join("?" * len(chunk))), (*args, *chunk)).fetchall())
+        return rows
+
+    def load_watermarks(self, skus: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """SKU -> (window end its delta scans covered, when that was recorded), for SKUs that have one."""
+        rows = self._by_sku("SELECT sku, scanned_through, updated_at FROM sku_watermarks WHERE sku IN ({skus})", skus)
+        return {sku: (through, updated) for sku, through, updated in rows}
+
+    def load_seen(self, skus: Iterable[str]) -> Dict[Tuple[str, str], str]:
+        """(SKU, record ID) -> fingerprint of every record already reported for these SKUs."""
+        rows = self._by_sku("SELECT sku, record_id, fingerprint FROM scan_seen WHERE sku IN ({skus})", skus)
+        return {(sku, rid): fingerprint for sku, rid, fingerprint in rows}
+
+    def record_delta(self, skus: Sequence[str], scanned_through: str, ledger: Sequence[tuple]) -> None:
+        """
+        Advances the SKUs' watermarks to scanned_through (never backwards) and
+        records the run's matches, ledger rows being (sku, source, record ID,
+        fingerprint, record date).
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                """
+                INSERT INTO sku_watermarks VALUES (?, ?, ?)
+                ON CONFLICT (sku) DO UPDATE SET
+                    scanned_through = MAX(scanned_through, excluded.scanned_through), updated_at = excluded.updated_at
+                """,
+                [(sku, scanned_through, now) for sku in skus],
+            )
+            conn.executemany(
+                """
+                INSERT INTO scan_seen VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (sku, record_id) DO UPDATE SET
+                    fingerprint = excluded.fingerprint, record_date = excluded.record_date, last_seen = excluded.last_seen
+                """,
+                [(sku, rid, source, fingerprint, record_date, now, now) for sku, source, rid, fingerprint, record_date in ledger],
+            )
+
+    def list_watermarks(self) -> pd.DataFrame:
+        """Per SKU: how far delta scans have covered, how many records were reported, and the newest one per source."""
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                """
+                SELECT w.sku, w.scanned_through,
+                       (SELECT COUNT(*) FROM scan_seen s WHERE s.sku = w.sku) AS records_seen,
+                       (SELECT GROUP_CONCAT(source || ' ' || latest, ', ') FROM (
+                            SELECT source, MAX(record_date) AS latest FROM scan_seen s
+                            WHERE s.sku = w.sku AND record_date != '' GROUP BY source
+                        )) AS latest_by_source,
+                       w.updated_at
+                FROM sku_watermarks w ORDER BY w.updated_at DESC, w.sku
+                """,
+                conn,
+            )
+
+    def clear_watermarks(self, skus: Optional[Iterable[str]] = None) -> int:
+        """Forgets delta state for the given SKUs (all when None), so their next delta scan is a full one; returns SKUs cleared."""
+        with self._lock, self._connect() as conn:
+            if skus is None:
+                conn.execute("DELETE FROM scan_seen")
+                return conn.execute("DELETE FROM sku_watermarks").rowcount
+            skus = list(dict.fromkeys(skus))
+            cleared = 0
+            for start in range(0, len(skus), _IN_CHUNK):
+                chunk = skus[start:start + _IN_CHUNK]
+                marks = ", ".join("?" * len(chunk))
+                conn.execute(f"DELETE FROM scan_seen WHERE sku IN ({marks})", chunk)
+                cleared += conn.execute(f"DELETE FROM sku_watermarks WHERE sku IN ({marks})", chunk).rowcount
+            return cleared
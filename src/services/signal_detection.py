@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+"""MAUDE disproportionality (PRR/ROR) and rate-change signal detection."""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.services.adverse_event_service import AdverseEventService
+
+# Evans et al. screening criteria: PRR >= 2, chi-square >= 4, at least 3 cases.
+PRR_THRESHOLD = 2.0
+CHI2_THRESHOLD = 4.0
+MIN_CASES = 3
+
+# Device key -> (openFDA search field, local MAUDE column)
+DEVICE_FIELDS = {
+    "product_code": ("device.device_report_product_code", "product_code"),
+    "brand_name": ("device.brand_name", "brand_name"),
+}
+PROBLEM_COUNT_FIELD = "product_problems.exact"
+
+
+def _as_date(value: Any) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return None
+
+
+def score_contingency(a: Any, b: Any, c: Any, d: Any) -> dict[str, np.ndarray]:
+    """
+    Vectorized 2x2 disproportionality statistics.
+
+    a: reports with device and problem      b: device, other problems
+    c: other devices with problem           d: other devices, other problems
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    c = np.asarray(c, dtype=float)
+    d = np.asarray(d, dtype=float)
+    n = a + b + c + d
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prr = (a / (a + b)) / (c / (c + d))
+        se_ln_prr = np.sqrt(1 / a - 1 / (a + b) + 1 / c - 1 / (c + d))
+
+        # Haldane correction keeps ROR finite when any cell is empty.
+        zero = (a == 0) | (b == 0) | (c == 0) | (d == 0)
+        ha, hb, hc, hd = (np.where(zero, x + 0.5, x) for x in (a, b, c, d))
+        ror = (ha * hd) / (hb * hc)
+        se_ln_ror = np.sqrt(1 / ha + 1 / hb + 1 / hc + 1 / hd)
+
+        # Yates-corrected chi-square.
+        chi2 = n * np.square(np.maximum(np.abs(a * d - b * c) - n / 2, 0)) / ((a + b) * (c + d) * (a + c) * (b + d))
+
+    return {
+        "prr": prr,
+        "prr_lower": np.exp(np.log(prr) - 1.96 * se_ln_prr),
+        "ror": ror,
+        "ror_lower": np.exp(np.log(ror) - 1.96 * se_ln_ror),
+        "ror_upper": np.exp(np.log(ror) + 1.96 * se_ln_ror),
+        "chi2": np.nan_to_num(chi2, nan=0.0),
+    }
+
+
+def disproportionality(
+    counts: pd.DataFrame,
+    device_col: str = "device",
+    problem_col: str = "problem",
+    count_col: str = "count",
+    problem_totals: Optional[pd.Series] = None,
+    grand_total: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Scores every device/problem pair of a long count table in one pass.
+
+    Without `problem_totals`/`grand_total` the background is the table itself
+    (local MAUDE data). openFDA callers pass database-wide problem counts so
+    the comparator covers all devices, not only the ones requested.
+    """
+    if counts.empty:
+        return pd.DataFrame(
+            columns=[device_col, problem_col, "a", "b", "c", "d", "prr", "prr_lower", "ror", "ror_lower", "ror_upper", "chi2", "is_signal"]
+        )
+
+    out = counts[[device_col, problem_col, count_col]].rename(columns={count_col: "a"})
+    a = out["a"].to_numpy(dtype=float)
+    device_totals = out.groupby(device_col)["a"].transform("sum").to_numpy(dtype=float)
+    if problem_totals is None:
+        problem_all = out.groupby(problem_col)["a"].transform("sum").to_numpy(dtype=float)
+    else:
+        problem_all = out[problem_col].map(problem_totals).fillna(0).to_numpy(dtype=float)
+        problem_all = np.maximum(problem_all, a)
+    total = float(grand_total) if grand_total is not None else float(a.sum())
+
+    b = device_totals - a
+    c = problem_all - a
+    d = np.maximum(total - a - b - c, 0)
+    out = out.assign(b=b, c=c, d=d, **score_contingency(a, b, c, d))
+    out["is_signal"] = (out["prr"] >= PRR_THRESHOLD) & (out["chi2"] >= CHI2_THRESHOLD) & (out["a"] >= MIN_CASES)
+    return out.sort_values(["is_signal", "prr_lower", "a"], ascending=False, ignore_index=True)
+
+
+def rate_changes(
+    events: pd.DataFrame,
+    device_col: str = "device",
+    date_col: str = "date_received",
+    window_days: int = 90,
+    as_of: Any = None,
+) -> pd.DataFrame:
+    """
+    Compares report counts in the most recent window against the window
+    before it, per device. Uses a Poisson z-score on the log rate ratio.
+    """
+    columns = [device_col, "recent", "prior", "rate_ratio", "z_score"]
+    if events.empty:
+        return pd.DataFrame(columns=columns)
+
+    dates = pd.to_datetime(events[date_col], format="mixed", errors="coerce")
+    end = pd.Timestamp(_as_date(as_of) or dates.max())
+    window = pd.Timedelta(days=window_days)
+    bucket = np.select(
+        [(dates > end - window) & (dates <= end), (dates > end - 2 * window) & (dates <= end - window)],
+        ["recent", "prior"],
+        default="",
+    )
+    keep = bucket != ""
+    table = pd.crosstab(events.loc[keep, device_col], bucket[keep]).reindex(columns=["recent", "prior"], fill_value=0)
+
+    return _window_rates(table, device_col)
+
+
+def _window_rates(table: pd.DataFrame, device_col: str = "device") -> pd.DataFrame:
+    recent = table["recent"].to_numpy(dtype=float)
+    prior = table["prior"].to_numpy(dtype=float)
+    ratio = (recent + 0.5) / (prior + 0.5)
+    z_score = np.log(ratio) / np.sqrt(1 / (recent + 0.5) + 1 / (prior + 0.5))
+    out = pd.DataFrame(
+        {device_col: table.index, "recent": recent.astype(int), "prior": prior.astype(int), "rate_ratio": ratio, "z_score": z_score}
+    )
+    return out.sort_values("z_score", ascending=False, ignore_index=True)
+
+
+def explode_problems(events: pd.DataFrame, problems_col: str = "product_problems") -> pd.DataFrame:
+    """One row per (report, problem); accepts list columns or ';'-joined strings."""
+    problems = events[problems_col]
+    if problems.map(lambda v: isinstance(v, str)).any():
+        problems = problems.fillna("").astype(str).str.split(";")
+    exploded = events.assign(**{problems_col: problems}).explode(problems_col)
+    exploded[problems_col] = exploded[problems_col].astype("string").str.strip()
+    return exploded[exploded[problems_col].fillna("") != ""]
+
+
+class SignalDetectionService:
+    """
+    Scores emerging MAUDE signals for product codes or brand names, either
+    from locally stored MAUDE events or from openFDA count endpoints.
+    """
+
+    def __init__(self, adverse_events: Optional[AdverseEventService] = None):
+        self.adverse_events = adverse_events or AdverseEventService()
+
+    @staticmethod
+    def load_local_events(path: str) -> pd.DataFrame:
+        if str(path).endswith(".parquet"):
+            return pd.read_parquet(path)
+        return pd.read_csv(path)
+
+    def from_local(
+        self,
+        events: pd.DataFrame,
+        key: str = "product_code",
+        devices: Optional[Sequence[str]] = None,
+        window_days: int = 90,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Returns (disproportionality table, rate-change table) for local events."""
+        column = DEVICE_FIELDS[key][1]
+        events = events.dropna(subset=[column])
+        pairs = explode_problems(events)
+        counts = pairs.groupby([column, "product_problems"], observed=True).size().reset_index(name="count")
+        counts.columns = ["device", "problem", "count"]
+        scored = disproportionality(counts)
+        rates = rate_changes(events.rename(columns={column: "device"}), window_days=window_days)
+        if devices:
+            wanted = {d.strip() for d in devices if d and d.strip()}
+            scored = scored[scored["device"].isin(wanted)].reset_index(drop=True)
+            rates = rates[rates["device"].isin(wanted)].reset_index(drop=True)
+        return scored, rates
+
+    def from_openfda(
+        self,
+        devices: Iterable[str],
+        key: str = "product_code",
+        start_date: Any = None,
+        end_date: Any = None,
+        window_days: int = 90,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Builds the count table from openFDA count queries: one problem count
+        per device plus one database-wide background count.
+        """
+        search_field, _ = DEVICE_FIELDS[key]
+        end_dt = _as_date(end_date) or date.today()
+        start_dt = _as_date(start_date) or end_dt - timedelta(days=365)
+
+        frames = []
+        recent_rows = []
+        for device in [d.strip() for d in devices if d and d.strip()]:
+            device_search = f'{search_field}:"{device}"'
+            buckets = self.adverse_events.count_events(PROBLEM_COUNT_FIELD, device_search, start_dt, end_dt)
+            if buckets:
+                frame = pd.DataFrame(buckets).rename(columns={"term": "problem"})
+                frame["device"] = device
+                frames.append(frame)
+            for label, s, e in (
+                ("recent", end_dt - timedelta(days=window_days), end_dt),
+                ("prior", end_dt - timedelta(days=2 * window_days), end_dt - timedelta(days=window_days)),
+            ):
+                daily = self.adverse_events.count_events("date_received", device_search, s, e)
+                recent_rows.append({"device": device, "window": label, "count": sum(b.get("count", 0) for b in daily)})
+
+        if not frames:
+            return disproportionality(pd.DataFrame(columns=["device", "problem", "count"])), rate_changes(pd.DataFrame())
+
+        counts = pd.concat(frames, ignore_index=True)
+        background = pd.DataFrame(self.adverse_events.count_events(PROBLEM_COUNT_FIELD, "", start_dt, end_dt))
+        problem_totals = background.set_index("term")["count"] if not background.empty else None
+        grand_total = background["count"].sum() if not background.empty else None
+        scored = disproportionality(counts, problem_totals=problem_totals, grand_total=grand_total)
+
+        windows = pd.DataFrame(recent_rows).pivot_table(index="device", columns="window", values="count", aggfunc="sum", fill_value=0)
+        windows = windows.reindex(columns=["recent", "prior"], fill_value=0)
+        return scored, _window_rates(windows)
+
+    @staticmethod
+    def top_signals(scored: pd.DataFrame, n: int = 20, signals_only: bool = True) -> pd.DataFrame:
+        if scored.empty:
+            return scored
+        subset = scored[scored["is_signal"]] if signals_only else scored
+        return subset.head(n).reset_index(drop=True)
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+"""Device category synonyms, compiled into a token trie for linear-time expansion."""
+
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import yaml
+
+SYNONYM_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "synonyms.yaml")
+EXPANSION_CACHE_SIZE = 4096
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_GROUPS = "\0"  # trie key holding the group ids of a phrase ending at this node
+
+
+def tokenize(text: str) -> List[str]:
+    # Fold simple plurals so "pacemakers" reaches the "pacemaker" node.
+    return [t[:-1] if len(t) > 3 and t.endswith("s") and not t.endswith("ss") else t for t in _TOKEN_RE.findall(text.lower())]
+
+
+class SynonymIndex:
+    """
+    Token trie over every phrase of every synonym group. `expand` walks the
+    trie from each token of the term, so its cost depends on the term length
+    and the longest phrase, not on the number of categories.
+    """
+
+    def __init__(self, groups: Sequence[Tuple[str, ...]]):
+        self.groups = list(groups)
+        self._root: Dict[str, dict] = {}
+        for group_id, phrases in enumerate(self.groups):
+            for phrase in phrases:
+                node = self._root
+                for token in tokenize(phrase):
+                    node = node.setdefault(token, {})
+                if node is not self._root:
+                    node.setdefault(_GROUPS, set()).add(group_id)
+        self.expand = lru_cache(maxsize=EXPANSION_CACHE_SIZE)(self._expand)
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[str, Iterable[str]]) -> "SynonymIndex":
+        groups = []
+        for category, synonyms in mapping.items():
+            phrases = [str(category).strip().lower()]
+            phrases.extend(str(s).strip().lower() for s in synonyms or [])
+            groups.append(tuple(dict.fromkeys(p for p in phrases if p)))
+        return cls(groups)
+
+    @classmethod
+    def from_file(cls, path: str = SYNONYM_FILE) -> "SynonymIndex":
+        with open(path, "r", encoding="utf-8") as handle:
+            return cls.from_mapping(yaml.safe_load(handle) or {})
+
+    def group_ids(self, term: str) -> List[int]:
+        tokens = tokenize(term or "")
+        found: Dict[int, None] = {}
+        for start in range(len(tokens)):
+            node = self._root
+            for token in tokens[start:]:
+                node = node.get(token)
+                if node is None:
+                    break
+                for group_id in sorted(node.get(_GROUPS, ())):
+                    found[group_id] = None
+        return list(found)
+
+    def _expand(self, term: str) -> Tuple[str, ...]:
+        """Phrases of every group the term touches, in data-file order. Memoized per term."""
+        phrases: Dict[str, None] = {}
+        for group_id in self.group_ids(term):
+            phrases.update(dict.fromkeys(self.groups[group_id]))
+        return tuple(phrases)
+
+
+@lru_cache(maxsize=1)
+def get_synonym_index() -> SynonymIndex:
+    if not os.path.exists(SYNONYM_FILE):
+        return SynonymIndex([])
+    return SynonymIndex.from_file()
+
+
+def expand_synonyms(term: str) -> Tuple[str, ...]:
+    return get_synonym_index().expand(term)
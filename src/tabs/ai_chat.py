@@ -49,12 +49,12 @@ def display_chat_interface():
                     context_str += f"Target Product: {p_info.get('name', 'Unknown')}\n"
 
                 # 2. Search Findings
-                if 'recall_hits' in st.session_state and not st.session_state.recall_hits.empty:
-                    hits = st.session_state.recall_hits
+                hits = st.session_state.get('recall_table')
+                if hits is not None and hits.num_rows:
                     # Summarize top 5 findings for the LLM
-                    top_findings = hits.head(5).to_dict(orient='records')
+                    top_findings = hits.slice(0, 5).to_pylist()
                     context_str += f"\nTOP 5 SEARCH FINDINGS:\n{str(top_findings)}\n"
-                    context_str += f"\nTotal Records Found: {len(hits)}\n"
+                    context_str += f"\nTotal Records Found: {hits.num_rows}\n"
                 else:
                     context_str += "\nNo search results found in current session.\n"
 
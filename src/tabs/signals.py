@@ -0,0 +1,140 @@
+import os
+import streamlit as st
+import pandas as pd
+from datetime import date, timedelta
+from src.services.adverse_event_service import AdverseEventService
+from src.services.signal_detection import DEVICE_FIELDS, SignalDetectionService
+
+MAUDE_STORE_DIR = os.path.join("data", "maude")
+
+
+def render_bulk_pull():
+    with st.expander("📥 Bulk Pull MAUDE Events to Local Store", expanded=False):
+        st.caption("Streams events page by page to Parquet, keeping only projected fields. Narratives go to a compressed column.")
+        col1, col2 = st.columns([2, 1])
+        family = col1.text_input("Product code or brand name", key="bulk_pull_family", placeholder="e.g. DXN")
+        key_label = col2.radio("Match on", ["Product Code", "Brand Name"], horizontal=True, key="bulk_pull_key")
+        col3, col4, col5 = st.columns(3)
+        start_date = col3.date_input("From", value=date.today() - timedelta(days=730), key="bulk_pull_start")
+        end_date = col4.date_input("To", value=date.today(), key="bulk_pull_end")
+        max_events = col5.number_input("Max events", min_value=1000, max_value=200000, value=50000, step=1000)
+
+        if st.button("📥 Start Bulk Pull", disabled=not family):
+            key = "product_code" if key_label == "Product Code" else "brand_name"
+            search_field = DEVICE_FIELDS[key][0]
+            safe_name = "".join(ch if ch.isalnum() else "_" for ch in family.strip())
+            out_path = os.path.join(MAUDE_STORE_DIR, f"{key}_{safe_name}.parquet")
+            status = st.empty()
+
+            def progress_callback(count: int) -> None:
+                status.write(f"Written {count:,} events...")
+
+            count = AdverseEventService().bulk_pull(
+                f'{search_field}:"{family.strip()}"',
+                out_path,
+                start_date=start_date,
+                end_date=end_date,
+                max_events=int(max_events),
+                progress_callback=progress_callback,
+            )
+            status.success(f"✅ Stored {count:,} events in {out_path}")
+
+
+def _stored_extracts() -> list:
+    if not os.path.isdir(MAUDE_STORE_DIR):
+        return []
+    return sorted(f for f in os.listdir(MAUDE_STORE_DIR) if f.endswith(".parquet"))
+
+
+def display_signal_dashboard():
+    st.header("📈 MAUDE Signal Dashboard")
+    st.caption("Disproportionality (PRR/ROR) and rate-change screening across product codes and brand names.")
+
+    render_bulk_pull()
+    stored = _stored_extracts()
+
+    with st.container(border=True):
+        with st.form("signal_detection_form"):
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                devices_text = st.text_input(
+                    "Product codes or brand names (comma-separated)",
+                    placeholder="e.g. DXN, FRN, MEB",
+                )
+                local_file = st.file_uploader("Local MAUDE extract (optional, CSV or Parquet)", type=["csv", "parquet"])
+                stored_choice = st.selectbox("Or a stored bulk pull", ["—"] + stored)
+            with col2:
+                key_label = st.radio("Group by", ["Product Code", "Brand Name"], horizontal=True)
+                window_days = st.select_slider("Rate window (days)", options=[30, 60, 90, 180], value=90)
+            with col3:
+                start_date = st.date_input("Start", value=date.today() - timedelta(days=730))
+                end_date = st.date_input("End", value=date.today())
+            submit = st.form_submit_button("🔬 Score Signals", type="primary", use_container_width=True)
+
+    key = "product_code" if key_label == "Product Code" else "brand_name"
+    devices = [d.strip() for d in (devices_text or "").split(",") if d.strip()]
+
+    if submit:
+        if stored_choice != "—" and local_file is None:
+            local_file = os.path.join(MAUDE_STORE_DIR, stored_choice)
+        if not devices and local_file is None:
+            st.error("Enter at least one product code/brand name or upload a MAUDE extract.")
+            return
+
+        service = SignalDetectionService()
+        with st.spinner("Scoring device/problem pairs..."):
+            if local_file is not None:
+                if isinstance(local_file, str):
+                    events = SignalDetectionService.load_local_events(local_file)
+                elif local_file.name.endswith(".parquet"):
+                    events = pd.read_parquet(local_file)
+                else:
+                    events = pd.read_csv(local_file)
+                scored, rates = service.from_local(events, key=key, devices=devices, window_days=window_days)
+            else:
+                scored, rates = service.from_openfda(
+                    devices, key=key, start_date=start_date, end_date=end_date, window_days=window_days
+                )
+        st.session_state.signal_scores = scored
+        st.session_state.signal_rates = rates
+
+    if "signal_scores" not in st.session_state:
+        st.info("Run a scoring pass to surface emerging signals.")
+        return
+
+    scored = st.session_state.signal_scores
+    rates = st.session_state.signal_rates
+
+    top = SignalDetectionService.top_signals(scored, n=20)
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Pairs Scored", f"{len(scored):,}")
+    c2.metric("Signals (PRR≥2, χ²≥4, n≥3)", f"{int(scored['is_signal'].sum()) if not scored.empty else 0:,}")
+    c3.metric("Devices Rising", f"{int((rates['z_score'] >= 1.96).sum()) if not rates.empty else 0:,}")
+
+    st.subheader("🚨 Top Disproportionality Signals")
+    if top.empty:
+        st.info("No pair met the signal criteria.")
+    else:
+        st.dataframe(
+            top[["device", "problem", "a", "prr", "prr_lower", "ror", "ror_lower", "ror_upper", "chi2"]],
+            column_config={
+                "device": "Device",
+                "problem": "Problem",
+                "a": st.column_config.NumberColumn("Reports", format="%d"),
+                "prr": st.column_config.NumberColumn("PRR", format="%.2f"),
+                "prr_lower": st.column_config.NumberColumn("PRR 95% LCL", format="%.2f"),
+                "ror": st.column_config.NumberColumn("ROR", format="%.2f"),
+                "ror_lower": st.column_config.NumberColumn("ROR LCL", format="%.2f"),
+                "ror_upper": st.column_config.NumberColumn("ROR UCL", format="%.2f"),
+                "chi2": st.column_config.NumberColumn("χ²", format="%.1f"),
+            },
+            use_container_width=True,
+            hide_index=True,
+        )
+
+    st.subheader("📊 Reporting Rate Changes")
+    if rates.empty:
+        st.info("No dated reports in the comparison windows.")
+    else:
+        st.bar_chart(rates.set_index("device")["rate_ratio"], use_container_width=True)
+        st.dataframe(rates, use_container_width=True, hide_index=True)
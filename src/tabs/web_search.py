@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
+from src.services.date_normalization import normalize_dates
 from src.services.regulatory_service import RegulatoryService
+from src.services.result_schema import format_date
 
 def display_web_search():
     st.header("🌐 Global Web & Media Search")
@@ -47,7 +49,7 @@ def display_web_search():
 
                 if results:
                     df = pd.DataFrame(results)
-                    df = df.drop_duplicates(subset=["Link"])
+                    df = normalize_dates(df.drop_duplicates(subset=["Link"]))
 
                     st.subheader(f"Found {len(df)} Results")
                     left, right = st.columns([2, 1])
@@ -55,7 +57,7 @@ def display_web_search():
                         for _, row in df.iterrows():
                             with st.expander(f"📰 {row['Description']}"):
                                 st.write(f"**Source:** {row['Source']}")
-                                st.write(f"**Date:** {row['Date']}")
+                                st.write(f"**Date:** {format_date(row['Date'])}")
                                 st.info(row.get("Reason", "No snippet"))
                                 st.markdown(f"[Read Full Article]({row['Link']})")
                     with right:
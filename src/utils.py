@@ -1,9 +1,10 @@
 import time
 import random
-import difflib
 from functools import wraps
 import logging
 
+from rapidfuzz import fuzz
+
 # Setup basic logging
 logger = logging.getLogger(__name__)
 
@@ -32,7 +33,7 @@ def retry_with_backoff(retries=3, backoff_in_seconds=1):
 def calculate_fuzzy_similarity(s1: str, s2: str) -> float:
     """
     Calculates the fuzzy similarity score (0 to 100) between two strings
-    using SequenceMatcher.
+    using rapidfuzz's Indel ratio (same scale as SequenceMatcher.ratio).
     
     Args:
         s1 (str): First string (e.g., My Product Name)
@@ -48,6 +49,4 @@ def calculate_fuzzy_similarity(s1: str, s2: str) -> float:
     s1_clean = str(s1).lower().strip()
     s2_clean = str(s2).lower().strip()
     
-    # Use standard python difflib
-    ratio = difflib.SequenceMatcher(None, s1_clean, s2_clean).ratio()
-    return ratio * 100
+    return fuzz.ratio(s1_clean, s2_clean)